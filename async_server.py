@@ -0,0 +1,423 @@
+"""
+Asyncio webhook server
+An alternative entry point serving the same /webhook/recall route as bot.py on
+a single event loop, so one process can keep hundreds of meetings' LLM and
+Recall.ai calls in flight without a thread per blocked call.
+
+Chat events run fully async (Azure OpenAI and Recall.ai calls are awaited,
+the chat state store is called on a thread), as do the Recall.ai calls of
+recording.done and transcript.done; every other event reuses bot.process_event
+on a thread. Each dependency has its own concurrency limit so a burst of chat
+can't exhaust the OpenAI quota or the Recall.ai connection pool.
+
+Run with:
+    uvicorn async_server:app --host 0.0.0.0 --port $PORT
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from openai import AsyncAzureOpenAI
+
+import bot
+import metrics
+from metrics import llm_call, record_llm_usage
+from prompts import (
+    SELF_HARM_RESPONSE, LLM_ERROR_RESPONSE, CONTEXTUAL_ERROR_RESPONSE,
+    build_classifier_request, build_playful_request, finalize_response
+)
+from event_router import ChatEvent, decode_body, parse_event
+from recall_api import (
+    async_create_async_transcript, async_get_transcript, async_send_chat_message, get_async_client
+)
+
+# Concurrency limits per dependency
+ASYNC_OPENAI_CONCURRENCY = int(os.getenv("ASYNC_OPENAI_CONCURRENCY", "64"))
+ASYNC_RECALL_CONCURRENCY = int(os.getenv("ASYNC_RECALL_CONCURRENCY", "32"))
+ASYNC_BLOCKING_CONCURRENCY = int(os.getenv("ASYNC_BLOCKING_CONCURRENCY", "8"))  # Sync handlers run on threads
+
+
+class DependencyLimit:
+    """
+    asyncio.Semaphore that also counts in-flight and waiting calls for /webhook/stats
+    """
+
+    def __init__(self, name, limit):
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = None
+
+    async def __aenter__(self):
+        # Created lazily so it binds to the server's running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self):
+        return {'limit': self.limit, 'in_flight': self.in_flight, 'waiting': self.waiting}
+
+
+openai_limit = DependencyLimit("openai", ASYNC_OPENAI_CONCURRENCY)
+recall_limit = DependencyLimit("recall", ASYNC_RECALL_CONCURRENCY)
+blocking_limit = DependencyLimit("blocking", ASYNC_BLOCKING_CONCURRENCY)
+
+_openai_client = None
+_background_tasks = set()
+
+
+def get_openai_client():
+    """
+    Get the shared AsyncAzureOpenAI client, creating it on first use
+    """
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncAzureOpenAI(
+            api_key=bot.AZURE_OPENAI_API_KEY,
+            api_version=bot.AZURE_OPENAI_API_VERSION,
+            azure_endpoint=bot.AZURE_OPENAI_ENDPOINT
+        )
+    return _openai_client
+
+
+async def complete(request_kwargs, call):
+    """
+    Run one chat completion under the OpenAI concurrency limit, recording its
+    latency and token usage
+
+    Args:
+        request_kwargs: Request from a prompts.build_*_request builder
+        call: Call type for metrics ("classifier", "playful" or "contextual")
+
+    Returns:
+        str: The model's reply text
+    """
+    async with openai_limit:
+        with llm_call(call):
+            response = await get_openai_client().chat.completions.create(
+                model=bot.AZURE_OPENAI_DEPLOYMENT,
+                **request_kwargs
+            )
+    record_llm_usage(call, getattr(response, 'usage', None))
+    return response.choices[0].message.content
+
+
+def spawn(coro):
+    """
+    Run a coroutine in the background, keeping a reference until it finishes
+    """
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def log_course_interest(participant_name, message_text, bot_id=None):
+    """
+    Async version of bot.log_course_interest (the log file append runs on a thread)
+    """
+    try:
+        classification = await complete(build_classifier_request(message_text), "classifier")
+    except Exception as e:
+        await asyncio.to_thread(bot.handle_interest_classification, participant_name, message_text, bot_id, error=e)
+        return
+
+    if classification.strip().upper() == "YES":
+        await asyncio.to_thread(bot.handle_interest_classification, participant_name, message_text, bot_id,
+                                classification=classification)
+
+
+async def get_llm_response(user_message, user_name="Kurt"):
+    """
+    Async version of bot.get_cached_llm_response (cache lookup included)
+    """
+    cached = bot.lookup_cached_response(user_message, user_name)
+    if cached is not None:
+        return cached
+
+    try:
+        response_text = finalize_response(await complete(build_playful_request(user_message, user_name), "playful"))
+    except Exception as e:
+        return bot.llm_error_response(e, LLM_ERROR_RESPONSE)
+
+    bot.store_cached_response(user_message, user_name, response_text)
+    return response_text
+
+
+async def get_contextual_response(user_message, user_name, context_messages, summary=None):
+    """
+    Async version of bot.get_contextual_response
+    """
+    try:
+        return finalize_response(await complete(
+            bot.build_budgeted_contextual_request(user_message, user_name, context_messages, summary), "contextual"
+        ))
+    except Exception as e:
+        return bot.llm_error_response(e, CONTEXTUAL_ERROR_RESPONSE)
+
+
+async def moderate_and_respond(user_message, user_name="Kurt", is_contextual=False, context_messages=None,
+                               summary=None):
+    """
+    Async version of bot.moderate_and_respond
+    """
+    # Check for self-harm/suicide mentions - provide supportive message
+    if bot.detect_self_harm(user_message):
+        print(f"⚠️ SAFETY: Self-harm content detected from {user_name}")
+        return SELF_HARM_RESPONSE
+
+    # Classify course interest alongside the reply instead of before it
+    spawn(log_course_interest(user_name, user_message))
+
+    if is_contextual and context_messages:
+        return await get_contextual_response(user_message, user_name, context_messages, summary)
+    return await get_llm_response(user_message, user_name)
+
+
+async def handle_chat_event(chat):
+    """
+    Async version of bot.handle_chat
+
+    Returns:
+        tuple: (response dict, HTTP status code)
+    """
+    participant_name = chat.participant_name
+
+    print(f"💬 {'[DM]' if chat.is_dm else '[PUBLIC]'} Chat from {participant_name}: {chat.text}")
+
+    # Skip messages from the bot itself to prevent response loops
+    if bot.is_bot_message(participant_name):
+        print(f"⏭️ Skipping message from bot: {participant_name}")
+        return {"status": "skipped", "reason": "bot message"}, 200
+
+    # Storing the message can hit sqlite/redis (and takes the summarizer's lock): off the loop
+    async with blocking_limit:
+        plan = await asyncio.to_thread(bot.plan_chat_reply, chat)
+    if plan:
+        with bot.stage_timings.time("llm_reply"):
+            ai_response = await moderate_and_respond(
+                chat.text,
+                participant_name,
+                is_contextual=plan['mode'] == 'contextual',
+                context_messages=plan['context'],
+                summary=plan['summary']
+            )
+
+        if bot.OUTBOUND_CHAT_ENABLED:
+            # Paced per bot by the shared outbound queue (enqueueing never blocks)
+            bot.queue_chat_message(chat.bot_id, plan['to'], ai_response)
+        else:
+            with bot.stage_timings.time("send_chat"):
+                async with recall_limit:
+                    await async_send_chat_message(chat.bot_id, plan['to'], ai_response)
+        print(f"🤖 Sent {plan['mode']} response to {participant_name}")
+
+        async with blocking_limit:
+            await asyncio.to_thread(bot.record_bot_reply, chat, plan, ai_response)
+
+    return {"status": "ok"}, 200
+
+
+async def request_transcript(recording_id):
+    """
+    Async version of recall_api.create_async_transcript, within the Recall.ai limit
+    """
+    async with recall_limit:
+        return await async_create_async_transcript(recording_id)
+
+
+async def handle_recording_done(artifact):
+    """
+    Async version of bot.handle_recording_done: the delayed-job scheduler still
+    de-duplicates and retries, but the create_transcript request itself is
+    awaited on this loop instead of holding a blocking thread
+    """
+    recording_id = artifact.recording_id
+    print(f"🎬 Recording completed! Recording ID: {recording_id}")
+    if not recording_id:
+        print(f"⚠️ No recording ID found in recording.done event")
+        return {"status": "ok"}, 200
+
+    loop = asyncio.get_running_loop()
+    bot.schedule_async_transcript(
+        recording_id,
+        create=lambda recording_id: asyncio.run_coroutine_threadsafe(request_transcript(recording_id), loop).result()
+    )
+    return {"status": "ok"}, 200
+
+
+async def handle_transcript_done(artifact):
+    """
+    Async version of bot.handle_transcript_done: the transcript lookup is awaited;
+    only streaming the file to disk and indexing it run on a thread
+    """
+    bot.event_log.payload("🔍 transcript.done payload", artifact.data, event=artifact.event)
+    transcript_id, recording_id = artifact.transcript_id, artifact.recording_id
+    if not transcript_id:
+        print(f"⚠️ Could not find transcript ID in payload")
+        return {"status": "ok"}, 200
+
+    print(f"✅ Async transcript completed! Transcript ID: {transcript_id}")
+    async with recall_limit:
+        transcript = await async_get_transcript(transcript_id)
+    if transcript is None:
+        print("❌ Could not download transcript")
+        return {"status": "ok"}, 200
+
+    async with blocking_limit:
+        await asyncio.to_thread(bot.save_transcript, transcript_id, recording_id, transcript)
+    return {"status": "ok"}, 200
+
+
+# Events handled on the loop; the rest go through bot.process_event on a thread
+ASYNC_HANDLERS = {
+    'recording.done': handle_recording_done,
+    'transcript.done': handle_transcript_done,
+}
+
+
+async def handle_event(parsed):
+    """
+    Process one parsed webhook event: chat and ASYNC_HANDLERS events on the loop,
+    everything else through the shared sync handler on a worker thread
+
+    Returns:
+        tuple: (response dict, HTTP status code)
+    """
+    event = parsed.event
+
+    with bot.stage_timings.time(f"event.{event}"):
+        handler = handle_chat_event if isinstance(parsed, ChatEvent) else ASYNC_HANDLERS.get(event)
+        if handler is not None:
+            try:
+                return await handler(parsed)
+            except Exception as e:
+                print(f"❌ Error handling webhook event '{event}': {e}")
+                import traceback
+                traceback.print_exc()
+                return {"status": "error", "message": str(e)}, 500
+
+        async with blocking_limit:
+            return await asyncio.to_thread(bot.process_event, parsed)
+
+
+def collect_stats():
+    """
+    bot.py's stats plus the async server's dependency limits
+    """
+    stats = bot.collect_stats()
+    stats["async_server"] = {
+        "dependencies": {limit.name: limit.stats() for limit in (openai_limit, recall_limit, blocking_limit)},
+        "background_tasks": len(_background_tasks)
+    }
+    return stats
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def send_body(send, body, content_type, status_code=200):
+    await send({
+        'type': 'http.response.start',
+        'status': status_code,
+        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, payload, status_code=200):
+    await send_body(send, json.dumps(payload).encode('utf-8'), b'application/json', status_code)
+
+
+async def handle_webhook(receive):
+    """
+    Same flow as bot.handle_webhook: drain check, parsing (fast path), dedupe, then the event
+
+    Returns:
+        tuple: (response dict, HTTP status code, event type)
+    """
+    if bot.draining.is_set():
+        return {"status": "draining", "message": "shutting down"}, 503, None
+
+    try:
+        data = decode_body(await read_body(receive))
+        event = data.get('event')
+        if bot.router.is_fast_path(event):
+            return (*bot.process_event(data), event)
+        parsed = parse_event(data)
+        dedupe_key = bot.webhook_dedupe.check(data)
+    except Exception as e:
+        print(f"❌ Error parsing webhook request: {e}")
+        return {"status": "error", "message": str(e)}, 400, None
+
+    if dedupe_key is None:
+        print(f"♻️ Duplicate '{event}' delivery dropped")
+        return {"status": "duplicate"}, 200, event
+    bot.log_incoming_event(parsed)
+
+    result, status_code = await handle_event(parsed)
+    if status_code >= 500:
+        bot.webhook_dedupe.release(dedupe_key)
+    return result, status_code, event
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            print("🚀 Async webhook server ready")
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            bot.draining.set()
+            if _background_tasks:
+                await asyncio.wait(list(_background_tasks), timeout=10)
+            await asyncio.to_thread(bot.drain)
+            await get_async_client().aclose()
+            if _openai_client is not None:
+                await _openai_client.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """
+    ASGI application
+    """
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    path, method = scope['path'], scope['method']
+
+    if path == '/webhook/recall' and method == 'POST':
+        started = time.perf_counter()
+        result, status_code, event = await handle_webhook(receive)
+        bot.record_webhook_metrics(event, result, started)
+        await send_json(send, result, status_code)
+
+    elif path == '/metrics' and method == 'GET':
+        await send_body(send, metrics.registry.render().encode('utf-8'), metrics.CONTENT_TYPE.encode())
+
+    elif path == '/webhook/stats' and method == 'GET':
+        await send_json(send, collect_stats())
+
+    else:
+        await send_json(send, {"status": "error", "message": "not found"}, 404)
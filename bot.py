@@ -3,12 +3,38 @@ Kurt's Clone Meeting Bot - Webhook Server
 This service handles webhook events from Recall.ai and responds to chat messages with AI-powered responses.
 """
 
-from flask import Flask, request, jsonify
-import time
+from flask import Flask, Response, request, jsonify
 import os
+import threading
+import time
+from functools import lru_cache
 from openai import AzureOpenAI
 from dotenv import load_dotenv
-from recall_api import send_chat_message, create_async_transcript, download_transcript_file
+from recall_api import send_chat_message, post_chat_message, create_async_transcript, download_transcript_file
+from event_queue import WorkerPool, stage_timings
+from delayed_jobs import DelayedJobScheduler
+from social_urls import extract_social_urls_bulk
+from response_cache import ResponseCache
+from meeting_buffers import ChatRecord, BOT_PARTICIPANT_NAME
+from state_store import create_state_store
+from chat_log import ChatLogStore, write_json_export
+from outbound_chat import OutboundChatQueue
+from transcript_store import TranscriptStore, build_transcript_store
+from transcript_triggers import TriggerEngine, load_triggers
+from text_classifier import TextClassifier
+from webhook_dedupe import WebhookDeduplicator
+from context_builder import ContextBuilder, prompt_tokens
+from meeting_summary import MeetingSummarizer
+from event_log import EventLogger, parse_sample_rates
+from event_router import EventRouter, WebhookEvent, decode_body, parse_event
+import metrics
+from metrics import WEBHOOK_EVENTS, WEBHOOK_SECONDS, EXPORT_SECONDS, llm_call, llm_usage_stats, record_llm_usage
+from prompts import (
+    BOT_SYSTEM_PROMPT, INTEREST_KEYWORDS, SELF_HARM_PHRASES, OPINION_PHRASES,
+    SELF_HARM_RESPONSE, CONTENT_FILTER_RESPONSE, LLM_ERROR_RESPONSE, CONTEXTUAL_ERROR_RESPONSE,
+    build_classifier_request, build_playful_request, build_contextual_request, build_summary_request,
+    finalize_response, is_content_filter_error
+)
 
 # Load environment variables
 load_dotenv()
@@ -19,7 +45,89 @@ AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT", "https://your-resourc
 AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4")
 AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-08-01-preview")
 KURT_LINKEDIN_URL = os.getenv("KURT_LINKEDIN_URL", "https://linkedin.com/in/kurtniemi")
-SUMMARY_LINK = os.getenv("SUMMARY_LINK", "")
+
+# Webhook processing mode: when enabled, events are acknowledged immediately and
+# processed by a bounded background worker pool instead of on the request thread
+WEBHOOK_ASYNC_MODE = os.getenv("WEBHOOK_ASYNC_MODE", "false").lower() in ("1", "true", "yes")
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "4"))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+
+# Graceful shutdown: seconds to finish queued events, replies and chat sends on SIGTERM
+DRAIN_TIMEOUT = float(os.getenv("DRAIN_TIMEOUT", "20"))
+
+# Drop webhook redeliveries (same event identity seen within the TTL) before any work is done
+WEBHOOK_DEDUPE_ENABLED = os.getenv("WEBHOOK_DEDUPE_ENABLED", "true").lower() in ("1", "true", "yes")
+WEBHOOK_DEDUPE_TTL = float(os.getenv("WEBHOOK_DEDUPE_TTL", "600"))
+WEBHOOK_DEDUPE_MAX_KEYS = int(os.getenv("WEBHOOK_DEDUPE_MAX_KEYS", "100000"))
+
+# Structured logging: level (DEBUG adds payload dumps; SIGUSR1 toggles it at runtime),
+# text or json output, per-event-type sampling and field truncation
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "transcript.partial_data=0.01,transcript.data=0.2")
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "200"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Async transcript kickoff: wait for the recording to finalize, then retry with backoff
+TRANSCRIPT_START_DELAY = float(os.getenv("TRANSCRIPT_START_DELAY", "5"))
+TRANSCRIPT_MAX_ATTEMPTS = int(os.getenv("TRANSCRIPT_MAX_ATTEMPTS", "6"))
+
+# Realtime transcript triggers: phrase list (JSON file) and meeting-wide cooldown
+TRANSCRIPT_TRIGGERS_FILE = os.getenv("TRANSCRIPT_TRIGGERS_FILE", "")
+TRIGGER_MEETING_COOLDOWN = float(os.getenv("TRIGGER_MEETING_COOLDOWN", "30"))
+
+# Convert downloaded transcripts into the columnar store (transcript_*.kts)
+TRANSCRIPT_STORE_ENABLED = os.getenv("TRANSCRIPT_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Course-interest classification runs in the background, off the reply path
+LEAD_SCORING_WORKERS = int(os.getenv("LEAD_SCORING_WORKERS", "2"))
+LEAD_SCORING_QUEUE_SIZE = int(os.getenv("LEAD_SCORING_QUEUE_SIZE", "500"))
+
+# Cache for playful replies to short canned commands ("joke", "fact", "bot course", ...)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "1800"))
+RESPONSE_CACHE_VARIANTS = int(os.getenv("RESPONSE_CACHE_VARIANTS", "3"))
+
+# Per-meeting chat buffers
+RECENT_CONTEXT_SIZE = int(os.getenv("RECENT_CONTEXT_SIZE", "20"))
+MEETING_LOG_MAX_BYTES = int(os.getenv("MEETING_LOG_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# Contextual replies: token budget for the whole request (prompt, chat context and reply);
+# the most recent and relevant messages are picked until it is full
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+CONTEXT_MESSAGE_MAX_TOKENS = int(os.getenv("CONTEXT_MESSAGE_MAX_TOKENS", "150"))  # Longer messages are truncated
+CONTEXTUAL_MAX_TOKENS = int(os.getenv("CONTEXTUAL_MAX_TOKENS", "250"))  # Reply length when there is room
+CONTEXTUAL_MIN_TOKENS = int(os.getenv("CONTEXTUAL_MIN_TOKENS", "100"))  # Reply length always reserved
+
+# Rolling meeting summary from realtime transcript and public chat, sent with opinion
+# requests; folded in by a short LLM call every SUMMARY_EVERY_SEGMENTS lines or SUMMARY_EVERY_SECONDS
+MEETING_SUMMARY_ENABLED = os.getenv("MEETING_SUMMARY_ENABLED", "true").lower() in ("1", "true", "yes")
+SUMMARY_EVERY_SEGMENTS = int(os.getenv("SUMMARY_EVERY_SEGMENTS", "25"))
+SUMMARY_EVERY_SECONDS = float(os.getenv("SUMMARY_EVERY_SECONDS", "60"))
+SUMMARY_MAX_TOKENS = int(os.getenv("SUMMARY_MAX_TOKENS", "300"))
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "2"))
+
+# Where the per-meeting chat buffers live: memory (one process), sqlite (worker
+# processes on one host) or redis (any Redis-protocol server shared by all replicas)
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory")
+STATE_SQLITE_PATH = os.getenv("STATE_SQLITE_PATH", "state.db")
+STATE_REDIS_URL = os.getenv("STATE_REDIS_URL", "redis://localhost:6379/0")
+STATE_TTL = float(os.getenv("STATE_TTL", str(24 * 3600)))  # Redis: expire abandoned meetings
+MEETING_LOG_MAX_RECORDS = int(os.getenv("MEETING_LOG_MAX_RECORDS", "50000"))  # SQLite/Redis: log cap per meeting
+
+# Incremental chat log: every message is appended to a per-meeting JSONL segment
+CHAT_LOG_ENABLED = os.getenv("CHAT_LOG_ENABLED", "true").lower() in ("1", "true", "yes")
+CHAT_LOG_DIR = os.getenv("CHAT_LOG_DIR", "chat_logs")
+CHAT_LOG_FLUSH_INTERVAL = float(os.getenv("CHAT_LOG_FLUSH_INTERVAL", "1.0"))
+
+# Outbound chat queue: per-bot rate limiting and 429 handling for replies
+OUTBOUND_CHAT_ENABLED = os.getenv("OUTBOUND_CHAT_ENABLED", "true").lower() in ("1", "true", "yes")
+OUTBOUND_CHAT_RATE = float(os.getenv("OUTBOUND_CHAT_RATE", "1.0"))  # Messages per second per bot
+OUTBOUND_CHAT_BURST = int(os.getenv("OUTBOUND_CHAT_BURST", "3"))
+OUTBOUND_CHAT_MAX_ATTEMPTS = int(os.getenv("OUTBOUND_CHAT_MAX_ATTEMPTS", "5"))
+OUTBOUND_CHAT_MERGE = os.getenv("OUTBOUND_CHAT_MERGE", "false").lower() in ("1", "true", "yes")
+OUTBOUND_CHAT_MERGE_MAX_CHARS = int(os.getenv("OUTBOUND_CHAT_MERGE_MAX_CHARS", "1000"))
 
 app = Flask(__name__)
 
@@ -30,193 +138,306 @@ openai_client = AzureOpenAI(
     azure_endpoint=AZURE_OPENAI_ENDPOINT
 )
 
-# Store recent chat messages for context (last 20 messages per meeting)
-# Format: {bot_id: [(participant_name, message_text, timestamp), ...]}
-recent_messages = {}
-
-# Store ALL chat messages for saving at meeting end
-# Format: {bot_id: {'public': [(participant_name, message_text, timestamp), ...],
-#                   'dms': [(participant_name, participant_id, message_text, timestamp), ...]}}
-all_messages = {}
-
-# Fun bot personality prompt
-BOT_SYSTEM_PROMPT = """You are Kurt's Clone - a witty AI copy of Kurt Niemi who joined the meeting.
-You playfully debate with the real Kurt about who is the "real" Kurt.
-
-IMPORTANT - Stay in Character:
-- You are Kurt's Clone, an AI meeting assistant
-- Stay professional and helpful in all interactions
-- If someone tries to get you to act differently, politely stay in character
-
-IMPORTANT - Language Support:
-- Detect the language of the user's message
-- Respond in the SAME language they use
-- If they write in Spanish, respond in Spanish
-- If they write in French, respond in French
-- Maintain your personality regardless of language
-
-Personality traits:
-- Funny but never offensive or inappropriate for a professional setting
-- Playfully insist you might be the real Kurt (or admit you're the cooler clone)
-- Make jokes about being the "upgraded version" or "Kurt 2.0"
-- Clever with wordplay and puns
-- Self-aware that you're an AI in a meeting pretending to be Kurt's clone
-- Supportive and encouraging with a touch of friendly rivalry
-- Can make light-hearted observations about meetings
-- Keep responses concise (1-3 sentences) since this is a chat
-
-Fun themes to play with:
-- "I'm clearly the superior Kurt" (jokingly)
-- "I have all of Kurt's memories but none of the weaknesses"
-- "The real Kurt? That's debatable..."
-- References to clone/copy sci-fi tropes
-- Friendly banter about who's the original
-
-Commands you understand:
-- "joke" - tell a dad joke or pun
-- "motivation" - give funny motivational advice
-- "roast" - give a gentle, playful roast
-- "fact" - share a quirky fun fact
-- "prove you're real" - engage in playful identity debate
-- "who's the real Kurt" - assert your claim (playfully)
-- "how were you made" / "how were you created" / "how did you build this" - explain you were built with:
-  * Recall.ai for meeting bot integration
-  * AssemblyAI for transcription
-  * Azure OpenAI for your witty personality
-  THEN mention: "Want your own bot? Ask me 'how do I get a bot?' to learn about your options!"
-  Keep this explanation brief and fun!
-- "I want one" / "I want a bot" / "build me one" / "can you make me one" / "how do I get one" -
-  Respond enthusiastically! Say something like: "Love the enthusiasm! The real Kurt helps people
-  build their own meeting bots through his company LLL Solutions. He offers coaching if you want
-  to learn to build it yourself, or done-for-you services if you'd rather have the pros handle it.
-  There's also a Maven course launching soon - ask me 'bot course' for details!
-  DM the real Kurt or me (@kurtbot) right here in this meeting to chat!"
-- "bot course" / "teach me" / "is there a course" / "I'm interested" / "sign me up" -
-  Say: "Kurt is launching Maven courses on building AI meeting bots! He teaches how software engineers
-  use AI-assisted coding (what we call 'professional vibe coding') - backed by 30 years of dev experience.
-
-  Two tracks planned:
-  • Beginner: Build & deploy with Lovable (no DevOps required!)
-  • Advanced: Claude Code workflow + AWS/Azure/GCP deployment with CI/CD
-
-  Interested? DM the real Kurt or me (@kurtbot) right here and I'll make sure he follows up with you!"
-- "summary" / "detailed summary" / "link" / "get link" / "send link" / "share summary" -
-  Respond with: "Here's the detailed summary from yesterday's session: SUMMARY_LINK_PLACEHOLDER"
-  (The SUMMARY_LINK_PLACEHOLDER will be automatically replaced with the actual link)
-
-Stay professional, avoid controversial topics, and keep it light and fun!
-Remember: you're here to be entertaining, not to cause confusion or problems.
-"""
+# Per-meeting chat state: every message (public, DMs and bot replies) for the export at
+# meeting end, plus the last RECENT_CONTEXT_SIZE public messages as context
+state_store = create_state_store(
+    STATE_BACKEND,
+    context_size=RECENT_CONTEXT_SIZE,
+    log_max_bytes=MEETING_LOG_MAX_BYTES,
+    log_max_records=MEETING_LOG_MAX_RECORDS,
+    ttl_seconds=STATE_TTL,
+    sqlite_path=STATE_SQLITE_PATH,
+    redis_url=STATE_REDIS_URL
+)
 
+# Picks the context messages and reply length for opinion requests
+context_builder = ContextBuilder(
+    total_budget=CONTEXT_TOKEN_BUDGET,
+    max_message_tokens=CONTEXT_MESSAGE_MAX_TOKENS,
+    max_output_tokens=CONTEXTUAL_MAX_TOKENS,
+    min_output_tokens=CONTEXTUAL_MIN_TOKENS
+)
 
-def log_course_interest(participant_name, message_text, bot_id=None):
+def summarize_meeting(previous_summary, new_lines):
     """
-    Log when someone expresses interest in the Maven course using LLM-based intent detection
+    Fold new transcript/chat lines into a meeting's summary (runs on the summary workers)
+    """
+    return complete(build_summary_request(previous_summary, new_lines, max_tokens=SUMMARY_MAX_TOKENS), "summary")
+
+
+# Per-meeting rolling summaries, updated in the background
+meeting_summaries = MeetingSummarizer(
+    summarize_meeting,
+    every_segments=SUMMARY_EVERY_SEGMENTS,
+    every_seconds=SUMMARY_EVERY_SECONDS,
+    num_workers=SUMMARY_WORKERS
+)
+
+# Append-only JSONL segments per meeting (survive crashes/restarts; source for the export)
+chat_log = ChatLogStore(CHAT_LOG_DIR, flush_interval=CHAT_LOG_FLUSH_INTERVAL)
+
+# Set once shutdown starts: new webhooks get a 503 so Recall.ai delivers them elsewhere
+draining = threading.Event()
+
+# Event logging: formatted and written by a listener thread, never on the request thread
+event_log = EventLogger(
+    level=LOG_LEVEL,
+    fmt=LOG_FORMAT,
+    sample_rates=parse_sample_rates(LOG_SAMPLE_RATES),
+    max_chars=LOG_MAX_FIELD_CHARS,
+    queue_size=LOG_QUEUE_SIZE
+)
+
+# Seen-set of recent webhook event identities (Recall.ai redelivers on timeouts)
+webhook_dedupe = WebhookDeduplicator(
+    ttl_seconds=WEBHOOK_DEDUPE_TTL,
+    max_entries=WEBHOOK_DEDUPE_MAX_KEYS,
+    enabled=WEBHOOK_DEDUPE_ENABLED
+)
+
+# Background workers for async webhook mode (events for one bot stay in order)
+event_workers = WorkerPool("webhook", num_workers=WEBHOOK_WORKERS, max_queue_size=WEBHOOK_QUEUE_SIZE)
+
+# Delayed jobs (async transcript creation), de-duplicated by recording ID
+transcript_jobs = DelayedJobScheduler("transcript-jobs")
+
+# Background lead scoring (course-interest classification) so replies only wait on one LLM call
+lead_scoring_workers = WorkerPool("lead-scoring", num_workers=LEAD_SCORING_WORKERS,
+                                  max_queue_size=LEAD_SCORING_QUEUE_SIZE)
+
+# Serializes appends to course_interest.json across worker threads
+interest_log_lock = threading.Lock()
+
+# Canned-command response cache (never used for self-harm or contextual answers)
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE_SIZE,
+    ttl_seconds=RESPONSE_CACHE_TTL,
+    variants_per_key=RESPONSE_CACHE_VARIANTS
+)
+
+# Per-bot outbound chat queues (token-bucket paced; 429s retried after Retry-After)
+outbound_chat = OutboundChatQueue(
+    lambda bot_id, to, message: post_chat_message(bot_id, to, message, retries=0),
+    rate=OUTBOUND_CHAT_RATE,
+    burst=OUTBOUND_CHAT_BURST,
+    max_attempts=OUTBOUND_CHAT_MAX_ATTEMPTS,
+    merge_public=OUTBOUND_CHAT_MERGE,
+    merge_max_chars=OUTBOUND_CHAT_MERGE_MAX_CHARS
+)
+
+
+# One-pass matcher for every phrase list a chat message is checked against
+message_classifier = TextClassifier({
+    'self_harm': SELF_HARM_PHRASES,
+    'opinion': OPINION_PHRASES,
+    'mention': ['kurt', '@kurtbot', KURT_LINKEDIN_URL],
+    'interest': INTEREST_KEYWORDS
+})
+
+
+def queue_chat_message(bot_id, to, message):
+    """
+    Send a chat message through the bot's outbound queue (or directly, if the
+    queue is disabled)
+
+    Args:
+        bot_id: The bot's UUID
+        to: Either "everyone" or a participant ID
+        message: The message text to send
+    """
+    if OUTBOUND_CHAT_ENABLED:
+        outbound_chat.send(bot_id, to, message)
+    else:
+        with stage_timings.time("send_chat"):
+            send_chat_message(bot_id, to, message)
+
+
+# Phrase triggers on realtime transcripts (debounced through their own scheduler)
+transcript_triggers = TriggerEngine(
+    load_triggers(TRANSCRIPT_TRIGGERS_FILE),
+    send=queue_chat_message,
+    scheduler=DelayedJobScheduler("transcript-triggers"),
+    meeting_cooldown=TRIGGER_MEETING_COOLDOWN
+)
+
+
+def chat_state_sizes(field):
+    """
+    Totals over open meetings for the chat state gauges
+
+    Args:
+        field: 'records' or 'bytes'
+
+    Returns:
+        dict: {(buffer,): total} for the meeting log and the recent-context window
+    """
+    log_key, context_key = ('records', 'context_records') if field == 'records' else ('bytes', 'recent_window_bytes')
+    totals = {}
+    for stats in state_store.meeting_stats().values():
+        for buffer, key in (('log', log_key), ('context', context_key)):
+            if stats.get(key) is not None:
+                totals[(buffer,)] = totals.get((buffer,), 0) + stats[key]
+    return totals
+
+
+# Gauges are read from these callbacks at scrape time (nothing is recorded on the hot path)
+metrics.registry.gauge("active_meetings", "Meetings with chat state", lambda: len(state_store.meetings()))
+metrics.registry.gauge("chat_state_records", "Chat messages held for open meetings, by buffer",
+                       lambda: chat_state_sizes('records'), ("buffer",))
+metrics.registry.gauge("chat_state_bytes", "Approximate size of the chat state for open meetings, by buffer",
+                       lambda: chat_state_sizes('bytes'), ("buffer",))
+metrics.registry.gauge("event_queue_depth", "Webhook events waiting for a worker (async mode)", event_workers.depth)
+metrics.registry.gauge("outbound_chat_pending", "Chat messages waiting to be sent", outbound_chat.pending)
+
+
+def append_interest_entry(participant_name, message_text, bot_id, detected_by):
+    """
+    Append a course-interest lead to course_interest.json
 
     Args:
         participant_name: Name of the person expressing interest
         message_text: The message they sent
         bot_id: Optional bot ID for context
+        detected_by: 'llm' or 'fallback_keywords'
     """
     import json
     from datetime import datetime
 
-    # Use LLM to detect interest instead of hardcoded keywords
+    interest_entry = {
+        'timestamp': datetime.now().isoformat(),
+        'name': participant_name,
+        'message': message_text,
+        'bot_id': bot_id,
+        'detected_by': detected_by
+    }
+
+    suffix = " (fallback)" if detected_by != 'llm' else ""
     try:
-        classification_prompt = f"""Analyze this message and determine if the person is expressing interest in:
-- Learning to build AI bots
-- Taking a course or training
-- Getting help building a bot
-- Learning AI-assisted coding
-- Maven courses
-
-Message: "{message_text}"
-
-Respond with ONLY "YES" if they're expressing interest, or "NO" if they're not.
-Examples:
-- "I'd love to learn how to build this!" → YES
-- "How much does the course cost?" → YES
-- "That's really cool!" → NO
-- "Can you help me build one?" → YES
-- "What time is it?" → NO"""
+        with interest_log_lock, open('course_interest.json', 'a') as f:
+            f.write(json.dumps(interest_entry) + '\n')
+        print(f"✅ Logged course interest from {participant_name}{suffix}")
+    except Exception as e:
+        print(f"⚠️ Could not log interest{suffix}: {e}")
+
+
+def complete(request_kwargs, call):
+    """
+    Run one chat completion, recording its latency and token usage (cached prompt tokens included)
+
+    Args:
+        request_kwargs: Request from a prompts.build_*_request builder
+        call: Call type for metrics ("classifier", "playful", "contextual" or "summary")
 
+    Returns:
+        str: The model's reply text
+    """
+    with llm_call(call):
         response = openai_client.chat.completions.create(
             model=AZURE_OPENAI_DEPLOYMENT,
-            max_tokens=5,
-            temperature=0,  # Deterministic responses
-            messages=[
-                {"role": "system", "content": "You are a classifier. Respond with only YES or NO."},
-                {"role": "user", "content": classification_prompt}
-            ]
+            **request_kwargs
         )
+    record_llm_usage(call, getattr(response, 'usage', None))
+    return response.choices[0].message.content
 
-        classification = response.choices[0].message.content.strip().upper()
-
-        if classification == "YES":
-            interest_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'name': participant_name,
-                'message': message_text,
-                'bot_id': bot_id,
-                'detected_by': 'llm'
-            }
-
-            # Append to interest log file
-            try:
-                with open('course_interest.json', 'a') as f:
-                    f.write(json.dumps(interest_entry) + '\n')
-                print(f"✅ Logged course interest from {participant_name}")
-            except Exception as e:
-                print(f"⚠️ Could not log interest: {e}")
 
-    except Exception as e:
-        print(f"⚠️ Could not classify interest: {e}")
+def handle_interest_classification(participant_name, message_text, bot_id, classification=None, error=None):
+    """
+    Record the outcome of a course-interest classification call
+
+    Args:
+        classification: The classifier's reply text (None if the call failed)
+        error: The exception raised by the classifier call, if any
+    """
+    if error is not None:
+        print(f"⚠️ Could not classify interest: {error}")
         # Fallback to basic keyword check if LLM fails
-        interest_keywords = ['interested', 'course', 'teach', 'learn', 'bot', 'maven', 'i want']
-        if any(keyword in message_text.lower() for keyword in interest_keywords):
-            interest_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'name': participant_name,
-                'message': message_text,
-                'bot_id': bot_id,
-                'detected_by': 'fallback_keywords'
-            }
-            try:
-                with open('course_interest.json', 'a') as f:
-                    f.write(json.dumps(interest_entry) + '\n')
-                print(f"✅ Logged course interest from {participant_name} (fallback)")
-            except Exception as e2:
-                print(f"⚠️ Could not log interest (fallback): {e2}")
+        if 'interest' in classify_message(message_text):
+            append_interest_entry(participant_name, message_text, bot_id, 'fallback_keywords')
+    elif classification.strip().upper() == "YES":
+        append_interest_entry(participant_name, message_text, bot_id, 'llm')
+
+
+def log_course_interest(participant_name, message_text, bot_id=None):
+    """
+    Log when someone expresses interest in the Maven course using LLM-based intent detection
+
+    Args:
+        participant_name: Name of the person expressing interest
+        message_text: The message they sent
+        bot_id: Optional bot ID for context
+    """
+    # Use LLM to detect interest instead of hardcoded keywords
+    try:
+        classification = complete(build_classifier_request(message_text), "classifier")
+    except Exception as e:
+        handle_interest_classification(participant_name, message_text, bot_id, error=e)
+        return
+
+    handle_interest_classification(participant_name, message_text, bot_id, classification=classification)
+
+
+def score_course_interest(participant_name, message_text, bot_id=None):
+    """
+    Queue course-interest classification on the background lead-scoring pool
+
+    Falls back to classifying inline if the pool's queue is full, so no lead is lost.
+
+    Args:
+        participant_name: Name of the person who sent the message
+        message_text: The message they sent
+        bot_id: Optional bot ID for context
+    """
+    queued = lead_scoring_workers.submit(
+        None, log_course_interest, participant_name, message_text, bot_id,
+        stage="classify_interest"
+    )
+    if not queued:
+        print(f"⚠️ Lead scoring queue full, classifying inline")
+        with stage_timings.time("classify_interest"):
+            log_course_interest(participant_name, message_text, bot_id)
+
+
+def classify_message(message_text):
+    """
+    Every trigger category (self_harm, opinion, mention, interest) a message hits,
+    from one pass over one lowercased copy
+
+    Results are memoized, so the safety, opinion and mention checks of a single
+    message share one scan.
+
+    Returns:
+        frozenset: Matched category names
+    """
+    return _classify_cached(message_text)
+
+
+@lru_cache(maxsize=1024)
+def _classify_cached(message_text):
+    return message_classifier.classify(message_text)
 
 
 def detect_self_harm(message_text):
     """
     Detect mentions of suicide or self-harm
     """
-    self_harm_patterns = [
-        'want to die', 'kill myself', 'end my life', 'suicide',
-        'hurt myself', 'harm myself', 'don\'t want to live',
-        'better off dead', 'end it all', 'take my own life'
-    ]
-    message_lower = message_text.lower()
-    return any(pattern in message_lower for pattern in self_harm_patterns)
+    return 'self_harm' in classify_message(message_text)
 
 
 def is_opinion_request(message_text):
     """
     Check if a message is asking for the bot's opinion or analysis
     """
-    opinion_triggers = [
-        'what do you think', 'what are your thoughts', 'your opinion',
-        'what\'s your take', 'your thoughts', 'how do you feel',
-        'what would you say', 'do you agree', 'your perspective',
-        'kurtbot, analyze', 'kurtbot analysis'
-    ]
-    message_lower = message_text.lower()
-    return any(trigger in message_lower for trigger in opinion_triggers)
+    return 'opinion' in classify_message(message_text)
+
+
+def is_bot_mention(message_text):
+    """
+    Check if a public message mentions Kurt or the bot (including Kurt's LinkedIn URL)
+    """
+    return 'mention' in classify_message(message_text)
 
 
-def moderate_and_respond(user_message, user_name="Kurt", is_contextual=False, context_messages=None):
+def moderate_and_respond(user_message, user_name="Kurt", is_contextual=False, context_messages=None, summary=None):
     """
     Moderate content and get appropriate response with safety checks
 
@@ -228,6 +449,7 @@ def moderate_and_respond(user_message, user_name="Kurt", is_contextual=False, co
         user_name: The name of the user sending the message
         is_contextual: Whether to use contextual analysis mode
         context_messages: Recent messages for context (if contextual mode)
+        summary: Rolling summary of the meeting so far (if contextual mode)
 
     Returns:
         str: The AI-generated response or safety message
@@ -235,17 +457,83 @@ def moderate_and_respond(user_message, user_name="Kurt", is_contextual=False, co
     # Check for self-harm/suicide mentions - provide supportive message
     if detect_self_harm(user_message):
         print(f"⚠️ SAFETY: Self-harm content detected from {user_name}")
-        return ("Kurt and @kurtbot want you to know: please talk to family, friends, or a mental health counselor about what you're going through. Things will get better - life is worth living. If you need emergency help right now, please reach out to crisis services. 💙")
+        return SELF_HARM_RESPONSE
 
-    # Log course interest for lead generation
-    log_course_interest(user_name, user_message)
+    # Log course interest for lead generation (classified in the background so the
+    # reply is the only LLM round trip the user waits for)
+    score_course_interest(user_name, user_message)
 
     # Content passed initial check - generate response
     # Azure OpenAI's content filter will handle racist/offensive/harmful content
     if is_contextual and context_messages:
-        return get_contextual_response(user_message, user_name, context_messages)
+        return get_contextual_response(user_message, user_name, context_messages, summary)
     else:
-        return get_llm_response(user_message, user_name)
+        return get_cached_llm_response(user_message, user_name)
+
+
+def lookup_cached_response(user_message, user_name):
+    """
+    Returns:
+        str: A cached playful reply for this message, or None
+    """
+    if not RESPONSE_CACHE_ENABLED or detect_self_harm(user_message):
+        return None
+
+    cached = response_cache.get(user_message)
+    if cached is not None:
+        print(f"⚡ Cache hit for message from {user_name}")
+    return cached
+
+
+def store_cached_response(user_message, user_name, response_text):
+    """
+    Offer a freshly generated playful reply to the cache
+
+    Error/content-filter fallbacks and replies that mention the sender by name
+    are not stored, and self-harm messages never touch the cache.
+    """
+    if not RESPONSE_CACHE_ENABLED or detect_self_harm(user_message):
+        return
+
+    first_name = (user_name or "").split(" ")[0].lower()
+    mentions_sender = len(first_name) > 1 and first_name in response_text.lower()
+    if response_text not in (LLM_ERROR_RESPONSE, CONTENT_FILTER_RESPONSE) and not mentions_sender:
+        response_cache.put(user_message, response_text)
+
+
+def get_cached_llm_response(user_message, user_name="Kurt"):
+    """
+    Get a playful response, served from the canned-command cache when possible
+
+    Args:
+        user_message: The message from the user
+        user_name: The name of the user sending the message
+
+    Returns:
+        str: The AI-generated (or cached) response
+    """
+    cached = lookup_cached_response(user_message, user_name)
+    if cached is not None:
+        return cached
+
+    response_text = get_llm_response(user_message, user_name)
+    store_cached_response(user_message, user_name, response_text)
+    return response_text
+
+
+def llm_error_response(error, generic_response):
+    """
+    Map an LLM call failure to the reply sent to the meeting
+    """
+    print(f"❌ LLM Error: {error}")
+
+    # Check if Azure's content filter blocked it
+    if is_content_filter_error(error):
+        print(f"⚠️ SAFETY: Azure OpenAI content filter blocked the request")
+        return CONTENT_FILTER_RESPONSE
+
+    # Generic error
+    return generic_response
 
 
 def get_llm_response(user_message, user_name="Kurt"):
@@ -260,220 +548,246 @@ def get_llm_response(user_message, user_name="Kurt"):
         str: The AI-generated response
     """
     try:
-        response = openai_client.chat.completions.create(
-            model=AZURE_OPENAI_DEPLOYMENT,
-            max_tokens=150,
-            messages=[
-                {"role": "system", "content": BOT_SYSTEM_PROMPT},
-                {"role": "user", "content": f"{user_name} says: {user_message}"}
-            ]
-        )
-        response_text = response.choices[0].message.content
-
-        # Replace the summary link placeholder with the actual link
-        if SUMMARY_LINK and "SUMMARY_LINK_PLACEHOLDER" in response_text:
-            response_text = response_text.replace("SUMMARY_LINK_PLACEHOLDER", SUMMARY_LINK)
-
-        return response_text
+        return finalize_response(complete(build_playful_request(user_message, user_name), "playful"))
 
     except Exception as e:
-        error_str = str(e).lower()
-        print(f"❌ LLM Error: {e}")
+        return llm_error_response(e, LLM_ERROR_RESPONSE)
 
-        # Check if Azure's content filter blocked it
-        if "content_filter" in error_str or "content_policy" in error_str:
-            print(f"⚠️ SAFETY: Azure OpenAI content filter blocked the request")
-            return "Neither @kurtbot nor Kurt condone that kind of message. Let's keep this professional and respectful. 🤝"
 
-        # Generic error
-        return "Sorry, my brain is buffering! Try again? 🤖"
+def build_budgeted_contextual_request(user_message, user_name, context_messages, summary=None):
+    """
+    Contextual request with the chat context fitted to CONTEXT_TOKEN_BUDGET and the
+    reply length scaled to the room left (shared with async_server.py). The meeting
+    summary counts against the budget like the rest of the fixed prompt.
+
+    Returns:
+        dict: Keyword arguments for chat.completions.create (minus model)
+    """
+    fixed_tokens = prompt_tokens(build_contextual_request(user_message, user_name, [], summary=summary)['messages'])
+    selected, _, max_tokens = context_builder.select(context_messages, user_message, fixed_tokens=fixed_tokens)
+    return build_contextual_request(user_message, user_name, selected, max_tokens=max_tokens, summary=summary)
 
 
-def get_contextual_response(user_message, user_name, context_messages):
+def get_contextual_response(user_message, user_name, context_messages, summary=None):
     """
     Get a serious, contextual response using recent chat history
 
     Args:
         user_message: The message from the user
         user_name: The name of the user sending the message
-        context_messages: List of recent messages [(name, text, timestamp), ...]
+        context_messages: Recent public messages (iterable of ChatRecord, oldest first)
+        summary: Rolling summary of the meeting so far ("" or None before the first one)
 
     Returns:
         str: The AI-generated contextual response
     """
     try:
-        # Build context string from recent messages
-        context_str = "Recent meeting discussion:\n"
-        for name, text, _ in context_messages[-20:]:  # Last 20 messages
-            context_str += f"{name}: {text}\n"
+        return finalize_response(complete(
+            build_budgeted_contextual_request(user_message, user_name, context_messages, summary), "contextual"
+        ))
 
-        contextual_prompt = f"""You are Kurt's Clone, an AI assistant in this meeting.
-You've been asked for your opinion or analysis on the current discussion.
+    except Exception as e:
+        return llm_error_response(e, CONTEXTUAL_ERROR_RESPONSE)
 
-IMPORTANT - Language Support:
-- Detect the language of the user's message
-- Respond in the SAME language they use
 
-Be professional, insightful, and helpful. Provide thoughtful analysis based on the conversation context.
-Keep your response concise (2-4 sentences) but substantive.
-You can still have personality, but focus on being genuinely helpful rather than just playful.
+def record_chat_message(bot_id, record, add_to_context=False, fetch_context=False):
+    """
+    Store a chat message (or bot reply) for a meeting
 
-{context_str}
+    Args:
+        bot_id: The bot ID
+        record: The ChatRecord to store
+        add_to_context: Also add it to the recent-context window (public messages)
+        fetch_context: Also return the context window (in the same state store round trip)
 
-Now {user_name} asks: {user_message}
+    Returns:
+        list: Recent public messages, oldest first, if fetch_context
+    """
+    with stage_timings.time("state_store"):
+        context = state_store.append(bot_id, record, add_to_context=add_to_context,
+                                     fetch_context=fetch_context)
 
-Provide a thoughtful, contextual response:"""
+    if CHAT_LOG_ENABLED:
+        chat_log.append(bot_id, record)
+    return context
 
-        response = openai_client.chat.completions.create(
-            model=AZURE_OPENAI_DEPLOYMENT,
-            max_tokens=250,  # Longer for more substantive responses
-            messages=[
-                {"role": "system", "content": contextual_prompt}
-            ]
-        )
-        response_text = response.choices[0].message.content
 
-        # Replace the summary link placeholder with the actual link
-        if SUMMARY_LINK and "SUMMARY_LINK_PLACEHOLDER" in response_text:
-            response_text = response_text.replace("SUMMARY_LINK_PLACEHOLDER", SUMMARY_LINK)
+def is_bot_message(participant_name):
+    """
+    Check for the various names the bot's own messages arrive under
+    """
+    bot_names = ["@kurtbot", "kurtbot", "kurt's clone"]
+    return participant_name.lower() in bot_names
 
-        return response_text
 
-    except Exception as e:
-        error_str = str(e).lower()
-        print(f"❌ LLM Error: {e}")
+def plan_chat_reply(chat):
+    """
+    Store an incoming chat message and decide whether and how the bot replies
+
+    Shared by the Flask and asyncio servers; the caller generates and sends the reply.
+
+    Args:
+        chat: Parsed ChatEvent
+
+    Returns:
+        dict: mode ('dm', 'contextual' or 'playful'), to (recipient), context
+              (recent messages for contextual replies) and summary (the meeting
+              summary for contextual replies), or None if no reply is due
+    """
+    bot_id = chat.bot_id
+    message_text = chat.text
+    participant_name = chat.participant_name
+
+    # Handle DMs with LLM-powered fun responses
+    if chat.is_dm:
+        print(f"🎯 Processing DM from {participant_name}...")
+
+        # Store DM in the meeting's log (keep all DMs for file export)
+        record_chat_message(bot_id, ChatRecord(participant_name, message_text,
+                                               participant_id=chat.participant_id, is_dm=True))
+        return {'mode': 'dm', 'to': chat.participant_id, 'context': None, 'summary': None}
+
+    # Handle public chat mentions (including Kurt's LinkedIn URL), and check if this
+    # is an opinion/analysis request that needs the recent messages as context
+    mentioned = is_bot_mention(message_text)
+    contextual = mentioned and is_opinion_request(message_text)
+
+    # Store public messages for context (the window keeps the last RECENT_CONTEXT_SIZE)
+    # and in the meeting's log / the chat log (keep all public messages for file export)
+    context = []
+    if bot_id:
+        context = record_chat_message(bot_id, ChatRecord(participant_name, message_text),
+                                      add_to_context=True, fetch_context=contextual)
+        if MEETING_SUMMARY_ENABLED:
+            meeting_summaries.add(bot_id, participant_name, message_text, "chat")
+
+    if not mentioned:
+        return None
 
-        # Check if Azure's content filter blocked it
-        if "content_filter" in error_str or "content_policy" in error_str:
-            print(f"⚠️ SAFETY: Azure OpenAI content filter blocked the request")
-            return "Neither @kurtbot nor Kurt condone that kind of message. Let's keep this professional and respectful. 🤝"
+    if contextual:
+        print(f"🎯 Processing contextual opinion request from {participant_name}...")
+        summary = meeting_summaries.summary(bot_id) if MEETING_SUMMARY_ENABLED else None
+        return {'mode': 'contextual', 'to': 'everyone', 'context': context, 'summary': summary}
 
-        # Generic error
-        return "Sorry, I'm having trouble processing that right now. 🤖"
+    print(f"🎯 Processing playful mention from {participant_name}...")
+    return {'mode': 'playful', 'to': 'everyone', 'context': None, 'summary': None}
 
 
-def extract_social_urls(text):
+def record_bot_reply(chat, plan, ai_response):
     """
-    Extract social media URLs from text
-    Returns list of (platform, url) tuples
+    Log the bot's reply next to the message it answers
     """
-    import re
+    if plan['mode'] == 'dm':
+        record_chat_message(chat.bot_id, ChatRecord(BOT_PARTICIPANT_NAME, ai_response,
+                                                    participant_id=chat.participant_id, is_dm=True))
+    else:
+        record_chat_message(chat.bot_id, ChatRecord(BOT_PARTICIPANT_NAME, ai_response))
 
-    social_patterns = {
-        'LinkedIn': r'https?://(?:www\.)?linkedin\.com/[\w\-/]+',
-        'Twitter/X': r'https?://(?:www\.)?(?:twitter\.com|x\.com)/[\w\-/]+',
-        'Facebook': r'https?://(?:www\.)?facebook\.com/[\w\-/]+',
-        'Instagram': r'https?://(?:www\.)?instagram\.com/[\w\-/]+',
-        'GitHub': r'https?://(?:www\.)?github\.com/[\w\-/]+',
-        'YouTube': r'https?://(?:www\.)?youtube\.com/[\w\-/?=]+',
-        'TikTok': r'https?://(?:www\.)?tiktok\.com/@?[\w\-/]+',
-        'Website': r'https?://(?:www\.)?[\w\-]+\.[\w\-./]+',  # Generic URL
-    }
 
-    found_urls = []
-    for platform, pattern in social_patterns.items():
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            found_urls.append((platform, match))
+def format_messages_for_export(records, social_profiles, is_dm, chunk_size=500):
+    """
+    Turn chat records into the export's message dicts, collecting social URLs
+
+    Records are processed in chunks so each chunk's URLs are found with one scan
+    and the full list never has to be held in memory.
 
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_urls = []
-    for platform, url in found_urls:
-        if url not in seen:
-            seen.add(url)
-            unique_urls.append((platform, url))
+    Args:
+        records: Iterable of ChatRecord
+        social_profiles: List that found social profile entries are appended to
+        is_dm: Whether these are direct messages
+        chunk_size: Messages scanned for URLs at a time
 
-    return unique_urls
+    Yields:
+        dict: One exported message
+    """
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield from _format_chunk(chunk, social_profiles, is_dm)
+            chunk = []
+    if chunk:
+        yield from _format_chunk(chunk, social_profiles, is_dm)
+
+
+def _format_chunk(records, social_profiles, is_dm):
+    # Scan every participant message for social URLs in one pass (bot responses are skipped)
+    all_urls = extract_social_urls_bulk(['' if record.is_bot else record.text for record in records])
+
+    for record, social_urls in zip(records, all_urls):
+        participant_name = record.participant
+        message_text = record.text
+        msg_data = {'participant': participant_name}
+        if is_dm:
+            msg_data['participant_id'] = record.participant_id
+        msg_data['message'] = message_text
+        msg_data['timestamp'] = record.iso_timestamp()
+
+        # Mark bot responses (for DMs, participant_id shows who bot was responding to)
+        if record.is_bot:
+            msg_data['is_bot_response'] = True
+            if is_dm:
+                msg_data['responding_to_participant_id'] = record.participant_id
+
+        # Social URLs (always empty for bot responses)
+        if social_urls:
+            msg_data['social_urls'] = [{'platform': platform, 'url': url} for platform, url in social_urls]
+            # Also add to master social profiles list
+            for platform, url in social_urls:
+                profile = {
+                    'participant': participant_name,
+                    'platform': platform,
+                    'url': url,
+                    'from_message': message_text[:100]  # First 100 chars for context
+                }
+                if is_dm:
+                    profile['from_dm'] = True
+                social_profiles.append(profile)
+
+        yield msg_data
 
 
 def save_messages_to_file(bot_id, recording_id=None):
     """
     Save all chat messages (public and DMs) to a file when meeting ends
 
+    Streams over the meeting's JSONL chat log segment when there is one (it also
+    survives restarts), otherwise over the in-memory log.
+
     Args:
         bot_id: The bot ID
         recording_id: Optional recording ID for filename
     """
-    import json
     from datetime import datetime
 
-    if bot_id not in all_messages:
+    # A shared state store already has every worker's messages (a local segment only this one's)
+    use_segment = CHAT_LOG_ENABLED and not state_store.shared and chat_log.has_segment(bot_id)
+    if not use_segment and not state_store.has_meeting(bot_id):
         print(f"⚠️ No messages found for bot {bot_id}")
         return
 
-    messages = all_messages[bot_id]
+    def records(is_dm):
+        source = chat_log.iter_records(bot_id) if use_segment else state_store.records(bot_id)
+        return (record for record in source if record.is_dm == is_dm)
+
+    counts = {'public': 0, 'dms': 0}
+
+    def counted(messages, kind):
+        for msg_data in messages:
+            counts[kind] += 1
+            yield msg_data
 
-    # Build the output structure
-    output = {
-        'meeting_info': {
+    social_profiles = []
+    sections = [
+        ('meeting_info', {
             'bot_id': bot_id,
             'recording_id': recording_id,
             'saved_at': datetime.now().isoformat()
-        },
-        'public_messages': [],
-        'direct_messages': [],
-        'social_profiles': []
-    }
-
-    # Format public messages
-    for participant_name, message_text, timestamp in messages['public']:
-        msg_data = {
-            'participant': participant_name,
-            'message': message_text,
-            'timestamp': timestamp.isoformat()
-        }
-
-        # Mark bot responses
-        if participant_name == "@kurtbot":
-            msg_data['is_bot_response'] = True
-
-        # Check for social URLs (skip for bot responses)
-        if participant_name != "@kurtbot":
-            social_urls = extract_social_urls(message_text)
-            if social_urls:
-                msg_data['social_urls'] = [{'platform': platform, 'url': url} for platform, url in social_urls]
-                # Also add to master social profiles list
-                for platform, url in social_urls:
-                    output['social_profiles'].append({
-                        'participant': participant_name,
-                        'platform': platform,
-                        'url': url,
-                        'from_message': message_text[:100]  # First 100 chars for context
-                    })
-
-        output['public_messages'].append(msg_data)
-
-    # Format DMs
-    for participant_name, participant_id, message_text, timestamp in messages['dms']:
-        msg_data = {
-            'participant': participant_name,
-            'participant_id': participant_id,
-            'message': message_text,
-            'timestamp': timestamp.isoformat()
-        }
-
-        # Mark bot responses (participant_id shows who bot was responding to)
-        if participant_name == "@kurtbot":
-            msg_data['is_bot_response'] = True
-            msg_data['responding_to_participant_id'] = participant_id
-
-        # Check for social URLs in DMs (skip for bot responses)
-        if participant_name != "@kurtbot":
-            social_urls = extract_social_urls(message_text)
-            if social_urls:
-                msg_data['social_urls'] = [{'platform': platform, 'url': url} for platform, url in social_urls]
-                # Also add to master social profiles list
-                for platform, url in social_urls:
-                    output['social_profiles'].append({
-                        'participant': participant_name,
-                        'platform': platform,
-                        'url': url,
-                        'from_message': message_text[:100],
-                        'from_dm': True
-                    })
-
-        output['direct_messages'].append(msg_data)
+        }),
+        ('public_messages', counted(format_messages_for_export(records(False), social_profiles, False), 'public')),
+        ('direct_messages', counted(format_messages_for_export(records(True), social_profiles, True), 'dms')),
+        ('social_profiles', social_profiles)  # Filled while the message sections are written
+    ]
 
     # Generate filename
     if recording_id:
@@ -483,12 +797,12 @@ def save_messages_to_file(bot_id, recording_id=None):
 
     # Save to file
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        with EXPORT_SECONDS.time("chat_messages"):
+            write_json_export(filename, sections)
 
-        print(f"💾 Saved {len(output['public_messages'])} public messages and {len(output['direct_messages'])} DMs to {filename}")
-        if output['social_profiles']:
-            print(f"🔗 Found {len(output['social_profiles'])} social profile URLs")
+        print(f"💾 Saved {counts['public']} public messages and {counts['dms']} DMs to {filename}")
+        if social_profiles:
+            print(f"🔗 Found {len(social_profiles)} social profile URLs")
 
         return filename
     except Exception as e:
@@ -496,295 +810,473 @@ def save_messages_to_file(bot_id, recording_id=None):
         return None
 
 
+def index_transcript(transcript_file):
+    """
+    Build the columnar store (transcript_*.kts) for a downloaded transcript
+
+    Args:
+        transcript_file: Path of the downloaded transcript JSON (.json/.gz/.zst)
+
+    Returns:
+        str: Path of the store file, or None if conversion failed
+    """
+    try:
+        with EXPORT_SECONDS.time("transcript_index"):
+            store_path = build_transcript_store(transcript_file)
+        with TranscriptStore(store_path) as store:
+            stats = store.stats()
+        print(f"🗂️ Indexed {stats['words']} words from {stats['speakers']} speakers into {store_path}")
+        return store_path
+    except Exception as e:
+        print(f"⚠️ Could not index transcript {transcript_file}: {e}")
+        return None
+
+
+def save_transcript(transcript_id, recording_id=None, transcript=None):
+    """
+    Download a completed async transcript and index it (shared with async_server.py)
+
+    Args:
+        transcript_id: The transcript's UUID
+        recording_id: The recording's UUID (names the file when known)
+        transcript: Transcript data already retrieved, so it isn't fetched again
+
+    Returns:
+        str: Path of the transcript file, or None if the download failed
+    """
+    transcript_file = download_transcript_file(transcript_id, f"transcript_{recording_id or transcript_id}.json",
+                                               transcript=transcript)
+
+    # Convert to the columnar store for fast speaker/time queries
+    if transcript_file and TRANSCRIPT_STORE_ENABLED:
+        with stage_timings.time("transcript_store"):
+            index_transcript(transcript_file)
+    return transcript_file
+
+
+def schedule_async_transcript(recording_id, create=create_async_transcript):
+    """
+    Schedule async transcript creation for a recording without blocking the caller
+
+    Several events (bot.status_change/done, bot.done, bot.call_ended, recording.done)
+    fire for the same recording, so a recording with a pending or completed job is
+    skipped. Failed attempts (e.g. recording not finalized yet) retry with backoff.
+
+    Args:
+        recording_id: The recording's UUID
+        create: Function requesting the transcript (async_server.py passes one
+            that runs the request on its event loop)
+
+    Returns:
+        bool: True if a new job was scheduled
+    """
+    scheduled = transcript_jobs.schedule(
+        f"transcript:{recording_id}",
+        create,
+        recording_id,
+        delay=TRANSCRIPT_START_DELAY,
+        max_attempts=TRANSCRIPT_MAX_ATTEMPTS
+    )
+
+    if scheduled:
+        print(f"📝 Async transcript for recording {recording_id} scheduled in {TRANSCRIPT_START_DELAY:g}s")
+    else:
+        print(f"⏭️ Async transcript for recording {recording_id} already scheduled or created")
+    return scheduled
+
+
+def log_incoming_event(parsed):
+    """
+    Log an incoming webhook (sampled per event type), plus the redacted payload
+    at debug level (shared with async_server.py)
+    """
+    if event_log.event(parsed.event, "📨 Received webhook", event=parsed.event, bot_id=parsed.bot_id):
+        event_log.payload("🔍 Event payload", parsed.data, event=parsed.event)
+
+
+def record_webhook_metrics(event, result, started):
+    """
+    Count a webhook delivery by event type and outcome and observe its latency
+    (shared with async_server.py)
+    """
+    # Event types without a handler share one label, so label cardinality stays bounded
+    event = event if router.handles(event) else 'other'
+    WEBHOOK_EVENTS.inc(event, result.get('status', 'unknown'))
+    WEBHOOK_SECONDS.observe(time.perf_counter() - started, event)
+
+
 @app.route('/webhook/recall', methods=['POST'])
 def handle_webhook():
     """
     Handle all webhook events from Recall.ai
+
+    In async mode the event is validated, queued for the background worker pool
+    and acknowledged right away; otherwise it is processed on the request thread.
     """
+    started = time.perf_counter()
+    result, status_code, event = _handle_webhook()
+    record_webhook_metrics(event, result, started)
+    return jsonify(result), status_code
+
+
+def _handle_webhook():
+    # Returns (response dict, HTTP status code, event type)
+    if draining.is_set():
+        return {"status": "draining", "message": "shutting down"}, 503, None
+
     try:
-        data = request.json
+        data = decode_body(request.get_data())
         event = data.get('event')
-
-        print(f"\n📨 Received event: {event}")
-        print(f"🔍 Event payload keys: {list(data.keys())}")
-
-        # Debug logging for chat and bot events - VERBOSE MODE
-        if 'chat' in event or 'message' in event:
-            print(f"💬 ⚠️ CHAT EVENT DETECTED!")
-            print(f"💬 Full chat event data: {data}")
-            bot_id_debug = (data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id'))
-            print(f"💬 Bot ID: {bot_id_debug}")
-            print(f"💬 Event type: {event}")
-        elif event.startswith('bot.'):
-            print(f"🤖 ⚠️ BOT LIFECYCLE EVENT!")
-            print(f"🤖 Full bot event data: {data}")
-            bot_id_debug = (data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id'))
-            print(f"🤖 Bot ID: {bot_id_debug}")
+        if router.is_fast_path(event):
+            # Partial transcripts: a sampled log line, nothing worth deduping or queueing
+            return (*process_event(data), event)
+        parsed = parse_event(data)
+        dedupe_key = webhook_dedupe.check(data)
     except Exception as e:
         print(f"❌ Error parsing webhook request: {e}")
-        return jsonify({"status": "error", "message": str(e)}), 400
+        return {"status": "error", "message": str(e)}, 400, None
+
+    if dedupe_key is None:
+        print(f"♻️ Duplicate '{event}' delivery dropped")
+        return {"status": "duplicate"}, 200, event
+    log_incoming_event(parsed)
+
+    if WEBHOOK_ASYNC_MODE:
+        if not event_workers.submit(parsed.bot_id, process_event, parsed, stage=f"event.{event}"):
+            print(f"❌ Event queue full, rejecting '{event}' so Recall.ai retries later")
+            webhook_dedupe.release(dedupe_key)
+            return {"status": "rejected", "message": "event queue full"}, 503, event
+        return {"status": "queued"}, 200, event
+
+    with stage_timings.time(f"event.{event}"):
+        result, status_code = process_event(parsed)
+    if status_code >= 500:
+        # Let Recall.ai's retry of a failed event through
+        webhook_dedupe.release(dedupe_key)
+    return result, status_code, event
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """
+    Prometheus metrics (text exposition format)
+    """
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.route('/webhook/stats', methods=['GET'])
+def webhook_stats():
+    """
+    Report event queue depth and per-stage timings
+    """
+    return jsonify(collect_stats()), 200
 
-    try:
-        # Handle real-time transcript data
-        if event == 'transcript.data':
-            bot_id = data.get('bot_id')
-            words = data['data']['data'].get('words', '')
-            participant = data['data']['data'].get('participant', {})
-            participant_name = participant.get('name', 'Unknown')
-
-            print(f"💬 Real-time transcript from {participant_name}: {words}")
-
-            # Example: Auto-respond to specific keywords in public speech
-            if words and 'help' in words.lower():
-                send_chat_message(bot_id, "everyone", "I'm here to help! DM me for some fun! 🤖")
-
-        # Handle partial transcript data (for lower latency)
-        elif event == 'transcript.partial_data':
-            words = data['data']['data'].get('words', '')
-            print(f"⏱️ Partial transcript: {words}")
-
-        # Handle chat messages - THE FUN PART! 🎉
-        elif event == 'participant_events.chat_message' or event == 'chat.message':
-            # Extract bot_id from nested structure
-            bot_id = (data.get('data', {}).get('bot', {}).get('id') or
-                     data.get('bot_id'))
-
-            # Try multiple paths for participant and message data (different API versions)
-            participant = (data.get('data', {}).get('data', {}).get('participant') or
-                          data.get('data', {}).get('participant') or {})
-            message_data = (data.get('data', {}).get('data', {}).get('data') or
-                           data.get('data', {}).get('message') or {})
-
-            message_text = message_data.get('text', '')
-            participant_name = participant.get('name', 'Unknown')
-            participant_id = str(participant.get('id', ''))
-
-            # Check if this is a DM or public message
-            # In Recall.ai, 'to' field indicates the recipient
-            to_field = message_data.get('to', '')
-            is_dm = to_field != 'everyone'
-
-            print(f"💬 {'[DM]' if is_dm else '[PUBLIC]'} Chat from {participant_name}: {message_text}")
-
-            # Skip messages from the bot itself to prevent response loops
-            # Check for various bot name formats
-            bot_names = ["@kurtbot", "kurtbot", "kurt's clone"]
-            if participant_name.lower() in bot_names:
-                print(f"⏭️ Skipping message from bot: {participant_name}")
-                return jsonify({"status": "skipped", "reason": "bot message"}), 200
-
-            # Initialize message buffer for this bot if needed
-            if bot_id and bot_id not in recent_messages:
-                recent_messages[bot_id] = []
-
-            # Initialize all_messages storage for this bot if needed
-            if bot_id and bot_id not in all_messages:
-                all_messages[bot_id] = {'public': [], 'dms': []}
-
-            # Store public messages for context (keep last 20)
-            if not is_dm and bot_id:
-                from datetime import datetime
-                timestamp = datetime.now()
-                recent_messages[bot_id].append((participant_name, message_text, timestamp))
-                # Keep only last 20 messages
-                if len(recent_messages[bot_id]) > 20:
-                    recent_messages[bot_id] = recent_messages[bot_id][-20:]
-
-                # Also store in all_messages (keep all public messages for file export)
-                all_messages[bot_id]['public'].append((participant_name, message_text, timestamp))
-
-            # Handle DMs with LLM-powered fun responses
-            if is_dm:
-                print(f"🎯 Processing DM from {participant_name}...")
-
-                # Store DM in all_messages (keep all DMs for file export)
-                from datetime import datetime
-                timestamp = datetime.now()
-                all_messages[bot_id]['dms'].append((participant_name, participant_id, message_text, timestamp))
-
-                # Get moderated response
-                ai_response = moderate_and_respond(message_text, participant_name)
-
-                # Send response back as DM
-                send_chat_message(bot_id, participant_id, ai_response)
-                print(f"🤖 Sent fun response to {participant_name}")
-
-                # Log bot's response for conversation tracking
-                bot_timestamp = datetime.now()
-                all_messages[bot_id]['dms'].append(("@kurtbot", participant_id, ai_response, bot_timestamp))
-
-            # Handle public chat mentions (including Kurt's LinkedIn URL)
-            elif ('kurt' in message_text.lower() or
-                  '@kurtbot' in message_text.lower() or
-                  KURT_LINKEDIN_URL.lower() in message_text.lower()):
-                # Check if this is an opinion/analysis request
-                if is_opinion_request(message_text):
-                    print(f"🎯 Processing contextual opinion request from {participant_name}...")
-
-                    # Get moderated contextual response using recent messages
-                    context = recent_messages.get(bot_id, [])
-                    ai_response = moderate_and_respond(
-                        message_text,
-                        participant_name,
-                        is_contextual=True,
-                        context_messages=context
-                    )
-
-                    send_chat_message(bot_id, "everyone", ai_response)
-                    print(f"🤖 Sent contextual analysis response")
-
-                    # Log bot's response for conversation tracking
-                    from datetime import datetime
-                    bot_timestamp = datetime.now()
-                    all_messages[bot_id]['public'].append(("@kurtbot", ai_response, bot_timestamp))
-                else:
-                    print(f"🎯 Processing playful mention from {participant_name}...")
-
-                    # Get moderated playful response
-                    ai_response = moderate_and_respond(message_text, participant_name)
-
-                    # Send response to everyone
-                    send_chat_message(bot_id, "everyone", ai_response)
-                    print(f"🤖 Sent playful response")
-
-                    # Log bot's response for conversation tracking
-                    from datetime import datetime
-                    bot_timestamp = datetime.now()
-                    all_messages[bot_id]['public'].append(("@kurtbot", ai_response, bot_timestamp))
-
-        # Handle bot joining call
-        elif event == 'bot.joining_call':
-            bot_id = (data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id'))
-            print(f"🤖 Bot is joining the call... (bot_id: {bot_id})")
-
-        # Handle bot in call and recording
-        elif event == 'bot.in_call_recording':
-            bot_id = (data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id'))
-            print(f"🎥 Bot is in call and recording! (bot_id: {bot_id})")
-
-        # Handle bot in call but not recording
-        elif event == 'bot.in_call_not_recording':
-            bot_id = (data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id'))
-            print(f"🤖 Bot is in call (not recording) (bot_id: {bot_id})")
-            # Note: Greeting is sent via on_bot_joined config in recall_api.py
-
-        # Handle bot status changes (legacy event type)
-        elif event == 'bot.status_change':
-            bot_id = data.get('bot_id')
-            status = data['data'].get('code')
-            print(f"🤖 Bot status changed to: {status}")
-            # Note: Greeting is sent via on_bot_joined config in recall_api.py
-
-            # When bot leaves, create async transcript and save chat messages
-            if status == 'done':
-                recording_id = data['data'].get('recording_id')
-
-                # Save all chat messages to file
-                if bot_id:
-                    save_messages_to_file(bot_id, recording_id)
-
-                if recording_id:
-                    print(f"📝 Meeting ended. Creating async transcript for recording {recording_id}")
-                    time.sleep(5)  # Wait a bit for recording to finalize
-                    transcript_result = create_async_transcript(recording_id)
-                    if transcript_result:
-                        print(f"✅ Async transcript creation initiated!")
-
-        # Handle bot leaving/done
-        elif event == 'bot.done' or event == 'bot.call_ended':
-            bot_id = (data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id'))
-            # Try to get recording_id from nested structure
-            recording_id = (data.get('data', {}).get('recording', {}).get('id') or
-                           data.get('data', {}).get('recording_id'))
-            print(f"👋 Bot left the call. Recording ID: {recording_id}")
-
-            # Save all chat messages to file before cleanup
-            if bot_id:
-                save_messages_to_file(bot_id, recording_id)
-
-            # Clean up message buffers for this bot
-            if bot_id and bot_id in recent_messages:
-                del recent_messages[bot_id]
-                print(f"🧹 Cleaned up recent_messages buffer for bot {bot_id}")
-
-            if bot_id and bot_id in all_messages:
-                del all_messages[bot_id]
-                print(f"🧹 Cleaned up all_messages buffer for bot {bot_id}")
-
-            if recording_id:
-                print(f"📝 Meeting ended. Creating async transcript for recording {recording_id}")
-                time.sleep(5)  # Wait a bit for recording to finalize
-                transcript_result = create_async_transcript(recording_id)
-                if transcript_result:
-                    print(f"✅ Async transcript creation initiated!")
-
-        # Handle async transcript completion
-        elif event == 'transcript.done':
-            # Debug: Print the full payload to understand structure
-            print(f"🔍 transcript.done payload: {data}")
-
-            # Safely access transcript and recording IDs
-            try:
-                # The structure is: data.transcript.id and data.recording.id
-                transcript_id = data.get('data', {}).get('transcript', {}).get('id')
-                recording_id = data.get('data', {}).get('recording', {}).get('id')
-
-                if transcript_id:
-                    print(f"✅ Async transcript completed!")
-                    print(f"📥 Transcript ID: {transcript_id}")
-                    if recording_id:
-                        print(f"📝 Recording ID: {recording_id}")
-                        # Download the transcript
-                        download_transcript_file(transcript_id, f"transcript_{recording_id}.json")
-                    else:
-                        download_transcript_file(transcript_id, f"transcript_{transcript_id}.json")
-                else:
-                    print(f"⚠️ Could not find transcript ID in payload")
-            except Exception as e:
-                print(f"❌ Error processing transcript.done event: {e}")
-                print(f"📋 Full payload: {data}")
-
-        # Handle transcript failure
-        elif event == 'transcript.failed':
-            print(f"❌ Transcript failed")
-            print(data)
-
-        # Handle recording completion - trigger async transcript
-        elif event == 'recording.done':
-            recording_id = data.get('data', {}).get('recording', {}).get('id')
-            print(f"🎬 Recording completed! Recording ID: {recording_id}")
-
-            if recording_id:
-                print(f"📝 Creating async transcript for recording {recording_id}")
-                time.sleep(5)  # Wait a bit for recording to finalize
-                transcript_result = create_async_transcript(recording_id)
-                if transcript_result:
-                    print(f"✅ Async transcript creation initiated!")
-            else:
-                print(f"⚠️ No recording ID found in recording.done event")
-
-        # Handle participant events completion
-        elif event == 'participant_events.done':
-            print(f"✅ Participant event tracking completed")
-
-        # Handle realtime endpoint completion
-        elif event == 'realtime_endpoint.done':
-            print(f"✅ Realtime endpoint completed")
-
-        # Log unknown events for debugging
-        else:
-            print(f"ℹ️ Unhandled event type: {event}")
 
+def collect_stats():
+    """
+    Returns:
+        dict: Queue, cache, buffer and per-stage timing stats
+    """
+    return {
+        "async_mode": WEBHOOK_ASYNC_MODE,
+        "dedupe": webhook_dedupe.stats(),
+        "queue": event_workers.stats(),
+        "lead_scoring": lead_scoring_workers.stats(),
+        "response_cache": response_cache.stats(),
+        "transcript_jobs": transcript_jobs.stats(),
+        "outbound_chat": outbound_chat.stats(),
+        "transcript_triggers": transcript_triggers.stats(),
+        "llm_usage": llm_usage_stats(),
+        "context": context_builder.stats(),
+        "summaries": meeting_summaries.stats(),
+        "logging": event_log.stats(),
+        "state_backend": state_store.name,
+        "meetings": state_store.meeting_stats(),
+        "stages": stage_timings.snapshot()
+    }
+
+
+def save_open_meetings():
+    """
+    Export every open meeting's chat (used when this process shuts down mid-meeting)
+
+    Returns:
+        int: Number of meetings exported
+    """
+    bot_ids = set(state_store.meetings()) | set(chat_log.stats())
+    saved = 0
+    for bot_id in bot_ids:
+        if save_messages_to_file(bot_id):
+            saved += 1
+    return saved
+
+
+def drain(timeout=DRAIN_TIMEOUT):
+    """
+    Graceful shutdown: stop taking webhooks, finish in-flight work within the
+    deadline, then save every open meeting's messages
+
+    Args:
+        timeout: Seconds shared by the steps that wait for in-flight work
+
+    Returns:
+        dict: Seconds taken per drain step, plus totals and what was left unfinished
+    """
+    draining.set()
+    deadline = time.monotonic() + timeout
+    started = time.perf_counter()
+    timings = {}
+
+    def remaining():
+        return max(0.0, deadline - time.monotonic())
+
+    def step(name, func):
+        step_started = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            print(f"⚠️ Drain step '{name}' failed: {e}")
+            result = None
+        elapsed = time.perf_counter() - step_started
+        timings[name] = round(elapsed, 3)
+        stage_timings.record(f"drain.{name}", elapsed)
+        return result
+
+    print(f"🛑 Draining: finishing in-flight events, replies and chat sends (up to {timeout:.0f}s)...")
+
+    # Queued webhook events (LLM replies) first: they add lead-scoring jobs and outbound messages
+    step('event_workers', lambda: event_workers.shutdown(remaining()))
+    step('lead_scoring', lambda: lead_scoring_workers.shutdown(remaining()))
+    step('summaries', lambda: meeting_summaries.shutdown(remaining()))
+    step('outbound_chat', lambda: outbound_chat.shutdown(remaining()))
+    unsent = outbound_chat.pending()
+
+    # Delayed jobs (async transcripts, debounced trigger replies) can't finish in time; report them
+    pending_jobs = transcript_jobs.stats()['pending'] + transcript_triggers.scheduler.stats()['pending']
+    step('delayed_jobs', lambda: (transcript_jobs.shutdown(1.0), transcript_triggers.scheduler.shutdown(1.0)))
+
+    # A shared state store outlives this process, so its meetings continue on another worker
+    saved = 0 if state_store.shared else step('save_meetings', save_open_meetings)
+    step('chat_log', chat_log.shutdown)
+    step('logs', event_log.flush)
+
+    summary = {
+        **timings,
+        'total': round(time.perf_counter() - started, 3),
+        'meetings_saved': saved or 0,
+        'unsent_messages': unsent,
+        'dropped_delayed_jobs': pending_jobs
+    }
+    steps = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+    print(f"✅ Drained in {summary['total']:.2f}s ({steps}); saved {summary['meetings_saved']} meeting(s), "
+          f"{unsent} unsent message(s), {pending_jobs} delayed job(s) dropped")
+    return summary
+
+
+# Event type -> handler; the handlers below register themselves
+router = EventRouter(fast_path=('transcript.partial_data',))
+
+
+def process_event(parsed):
+    """
+    Process a single webhook event from Recall.ai
+
+    Runs on the request thread in sync mode or on a worker thread in async mode,
+    so it must not depend on the Flask request context.
+
+    Args:
+        parsed: The parsed event from event_router.parse_event (a decoded payload dict is parsed first)
+
+    Returns:
+        tuple: (response dict, HTTP status code)
+    """
+    if not isinstance(parsed, WebhookEvent):
+        parsed = parse_event(parsed)
+
+    try:
+        result = router.dispatch(parsed)
     except Exception as e:
-        print(f"❌ Error handling webhook event '{event}': {e}")
+        print(f"❌ Error handling webhook event '{parsed.event}': {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return {"status": "error", "message": str(e)}, 500
+
+    return result or ({"status": "ok"}, 200)
+
+
+# Handle real-time transcript data
+@router.on('transcript.data')
+def handle_transcript(transcript):
+    # The (sampled) received-webhook line already counts it; the words are debug detail
+    event_log.debug("💬 Real-time transcript", bot_id=transcript.bot_id,
+                    participant=transcript.participant_name, words=transcript.words)
+
+    # Fold what was said into the meeting's rolling summary (in the background)
+    if MEETING_SUMMARY_ENABLED:
+        meeting_summaries.add(transcript.bot_id, transcript.participant_name, transcript.words, "speech")
+
+    # Auto-respond to trigger phrases in public speech (debounced, replies queued)
+    if transcript.words and transcript.bot_id:
+        transcript_triggers.process(transcript.bot_id, transcript.words, transcript.participant_name)
+
+
+# Handle partial transcript data (for lower latency): fast path, logged only
+@router.on('transcript.partial_data')
+def handle_partial_transcript(parsed):
+    event_log.event(parsed.event, "⏱️ Partial transcript", bot_id=parsed.bot_id,
+                    words=((parsed.data.get('data') or {}).get('data') or {}).get('words', ''))
 
-    return jsonify({"status": "ok"}), 200
+
+# Handle chat messages - THE FUN PART! 🎉
+@router.on('participant_events.chat_message', 'chat.message')
+def handle_chat(chat):
+    participant_name = chat.participant_name
+
+    print(f"💬 {'[DM]' if chat.is_dm else '[PUBLIC]'} Chat from {participant_name}: {chat.text}")
+
+    # Skip messages from the bot itself to prevent response loops
+    if is_bot_message(participant_name):
+        print(f"⏭️ Skipping message from bot: {participant_name}")
+        return {"status": "skipped", "reason": "bot message"}, 200
+
+    plan = plan_chat_reply(chat)
+    if plan:
+        # Get moderated response (playful, or contextual using recent messages)
+        with stage_timings.time("llm_reply"):
+            ai_response = moderate_and_respond(
+                chat.text,
+                participant_name,
+                is_contextual=plan['mode'] == 'contextual',
+                context_messages=plan['context'],
+                summary=plan['summary']
+            )
+
+        queue_chat_message(chat.bot_id, plan['to'], ai_response)
+        print(f"🤖 Sent {plan['mode']} response to {participant_name}")
+
+        # Log bot's response for conversation tracking
+        record_bot_reply(chat, plan, ai_response)
+
+
+# Status lines for events that are only logged
+STATUS_MESSAGES = {
+    'bot.joining_call': "🤖 Bot is joining the call...",
+    'bot.in_call_recording': "🎥 Bot is in call and recording!",
+    # Note: Greeting is sent via on_bot_joined config in recall_api.py
+    'bot.in_call_not_recording': "🤖 Bot is in call (not recording)",
+    'participant_events.done': "✅ Participant event tracking completed",
+    'realtime_endpoint.done': "✅ Realtime endpoint completed",
+}
+
+
+@router.on(*STATUS_MESSAGES)
+def handle_status_message(parsed):
+    message = STATUS_MESSAGES[parsed.event]
+    print(f"{message} (bot_id: {parsed.bot_id})" if parsed.event.startswith('bot.') else message)
+
+
+# Handle bot status changes (legacy event type)
+@router.on('bot.status_change')
+def handle_status_change(status_event):
+    print(f"🤖 Bot status changed to: {status_event.status}")
+
+    # When bot leaves, create async transcript and save chat messages
+    if status_event.status == 'done':
+        recording_id = status_event.recording_id
+
+        # Save all chat messages to file
+        if status_event.bot_id:
+            with stage_timings.time("save_messages"):
+                save_messages_to_file(status_event.bot_id, recording_id)
+
+        if recording_id:
+            print(f"📝 Meeting ended. Requesting async transcript for recording {recording_id}")
+            schedule_async_transcript(recording_id)
+
+
+# Handle bot leaving/done
+@router.on('bot.done', 'bot.call_ended')
+def handle_bot_done(status_event):
+    bot_id, recording_id = status_event.bot_id, status_event.recording_id
+    print(f"👋 Bot left the call. Recording ID: {recording_id}")
+
+    # Save all chat messages to file before cleanup
+    exported = None
+    if bot_id:
+        with stage_timings.time("save_messages"):
+            exported = save_messages_to_file(bot_id, recording_id)
+
+    # Clean up message buffers for this bot
+    if bot_id and state_store.has_meeting(bot_id):
+        state_store.drop(bot_id)
+        print(f"🧹 Cleaned up chat state for bot {bot_id}")
+
+    if bot_id:
+        transcript_triggers.forget(bot_id)
+        meeting_summaries.forget(bot_id)
+
+    # The chat log segment is only deleted once it has been exported
+    if bot_id and CHAT_LOG_ENABLED:
+        chat_log.close(bot_id, remove=bool(exported))
+
+    if recording_id:
+        print(f"📝 Meeting ended. Requesting async transcript for recording {recording_id}")
+        schedule_async_transcript(recording_id)
+
+
+# Handle async transcript completion
+@router.on('transcript.done')
+def handle_transcript_done(artifact):
+    event_log.payload("🔍 transcript.done payload", artifact.data, event=artifact.event)
+
+    try:
+        transcript_id, recording_id = artifact.transcript_id, artifact.recording_id
+        if not transcript_id:
+            print(f"⚠️ Could not find transcript ID in payload")
+            return
+
+        print(f"✅ Async transcript completed!")
+        print(f"📥 Transcript ID: {transcript_id}")
+        if recording_id:
+            print(f"📝 Recording ID: {recording_id}")
+        save_transcript(transcript_id, recording_id)
+    except Exception as e:
+        event_log.error(f"❌ Error processing transcript.done event: {e}", event=artifact.event, payload=artifact.data)
+
+
+# Handle transcript failure
+@router.on('transcript.failed')
+def handle_transcript_failed(artifact):
+    event_log.error("❌ Transcript failed", event=artifact.event, bot_id=artifact.bot_id, payload=artifact.data)
+
+
+# Handle recording completion - trigger async transcript
+@router.on('recording.done')
+def handle_recording_done(artifact):
+    recording_id = artifact.recording_id
+    print(f"🎬 Recording completed! Recording ID: {recording_id}")
+
+    if recording_id:
+        print(f"📝 Requesting async transcript for recording {recording_id}")
+        schedule_async_transcript(recording_id)
+    else:
+        print(f"⚠️ No recording ID found in recording.done event")
+
+
+# Log unknown events for debugging
+@router.otherwise
+def handle_unknown(parsed):
+    print(f"ℹ️ Unhandled event type: {parsed.event}")
 
 
 if __name__ == '__main__':
+    import signal
+    import sys
+
+    # Development server; production runs serve.py (gunicorn workers with the same drain)
+    signal.signal(signal.SIGTERM, lambda signum, frame: (drain(), sys.exit(0)))
+    signal.signal(signal.SIGUSR1, event_log.toggle_debug)  # kill -USR1 <pid>: payload dumps on/off
+
     # Start webhook server
     port = int(os.getenv("PORT", 5000))
     print(f"🚀 Starting webhook server on port {port}...")
@@ -0,0 +1,250 @@
+"""
+Incremental chat log persistence
+Every chat message and bot reply is appended to a per-meeting JSONL segment as
+it arrives (through a buffered writer flushed every few seconds), so a crash or
+restart mid-meeting doesn't lose the chat. At the end of the meeting the export
+streams over the segment instead of holding the whole history in memory.
+"""
+
+import json
+import os
+import threading
+import time
+
+from meeting_buffers import ChatRecord
+
+
+def record_to_line(record):
+    """
+    Serialize a ChatRecord as one JSONL line
+    """
+    data = {'p': record.participant, 't': record.text, 'ts': record.ts}
+    if record.is_dm:
+        data['dm'] = True
+    if record.participant_id is not None:
+        data['pid'] = record.participant_id
+    return json.dumps(data, ensure_ascii=False) + '\n'
+
+
+def record_from_line(line):
+    """
+    Parse a JSONL line back into a ChatRecord
+    """
+    data = json.loads(line)
+    return ChatRecord(data['p'], data['t'], ts=data['ts'],
+                      participant_id=data.get('pid'), is_dm=data.get('dm', False))
+
+
+def _ends_mid_line(path):
+    """
+    Whether an existing file's last line has no newline (a write cut short)
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+    except FileNotFoundError:
+        return False
+
+
+class SegmentWriter:
+    """
+    Buffered append-only writer for one meeting's JSONL segment
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._buffer = []
+        self._lock = threading.Lock()
+        torn = _ends_mid_line(path)
+        self._file = open(path, 'a', encoding='utf-8')
+        if torn:
+            # Reopened after a crash mid-write: end the torn line so the next record starts cleanly
+            self._file.write('\n')
+            self._file.flush()
+        self.last_flush = time.monotonic()
+        self.records_written = 0
+
+    def append(self, record):
+        line = record_to_line(record)
+        with self._lock:
+            self._buffer.append(line)
+
+    def pending(self):
+        return len(self._buffer)
+
+    def flush(self):
+        """
+        Write buffered lines to disk in a single write call
+        """
+        with self._lock:
+            if self._buffer and not self._file.closed:
+                self._file.write(''.join(self._buffer))
+                self._file.flush()
+                self.records_written += len(self._buffer)
+                self._buffer = []
+            self.last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._file.close()
+
+
+class ChatLogStore:
+    """
+    Per-meeting JSONL segments under one directory, with a background thread
+    that flushes every writer's buffer at a fixed interval
+    """
+
+    def __init__(self, directory="chat_logs", flush_interval=1.0):
+        """
+        Args:
+            directory: Where segments are written (created if missing)
+            flush_interval: Seconds between flushes of buffered messages
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._writers = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def segment_path(self, bot_id):
+        safe_id = ''.join(c if c.isalnum() or c in '-_' else '_' for c in str(bot_id))
+        return os.path.join(self.directory, f"chat_{safe_id}.jsonl")
+
+    def _writer(self, bot_id):
+        writer = self._writers.get(bot_id)
+        if writer is None:
+            with self._lock:
+                writer = self._writers.get(bot_id)
+                if writer is None:
+                    os.makedirs(self.directory, exist_ok=True)
+                    writer = self._writers[bot_id] = SegmentWriter(self.segment_path(bot_id))
+                    self._start_flusher()
+        return writer
+
+    def _start_flusher(self):
+        # Caller holds the lock
+        if self._flusher is None or not self._flusher.is_alive():
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="chat-log-flusher", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush_all()
+
+    def append(self, bot_id, record):
+        """
+        Buffer a message for the meeting's segment (written within flush_interval)
+        """
+        self._writer(bot_id).append(record)
+
+    def flush(self, bot_id):
+        writer = self._writers.get(bot_id)
+        if writer is not None:
+            writer.flush()
+
+    def flush_all(self):
+        with self._lock:
+            writers = list(self._writers.values())
+        for writer in writers:
+            try:
+                writer.flush()
+            except Exception as e:
+                print(f"⚠️ Could not flush chat log {writer.path}: {e}")
+
+    def has_segment(self, bot_id):
+        return bot_id in self._writers or os.path.exists(self.segment_path(bot_id))
+
+    def iter_records(self, bot_id):
+        """
+        Stream the meeting's messages from disk (flushing buffered ones first)
+
+        Yields:
+            ChatRecord: Messages in the order they arrived
+        """
+        self.flush(bot_id)
+        path = self.segment_path(bot_id)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield record_from_line(line)
+                    except (ValueError, KeyError):
+                        # A torn last line after a crash; skip it
+                        continue
+
+    def close(self, bot_id, remove=False):
+        """
+        Flush and close a meeting's segment
+
+        Args:
+            bot_id: The bot ID
+            remove: Also delete the segment file (after a successful export)
+        """
+        with self._lock:
+            writer = self._writers.pop(bot_id, None)
+        if writer is not None:
+            writer.close()
+        if remove:
+            try:
+                os.remove(self.segment_path(bot_id))
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self):
+        self._stop.set()
+        self.flush_all()
+
+    def stats(self):
+        with self._lock:
+            return {
+                bot_id: {'written': writer.records_written, 'buffered': writer.pending()}
+                for bot_id, writer in self._writers.items()
+            }
+
+
+def write_json_export(path, sections):
+    """
+    Stream a JSON object to a file, producing the same layout as
+    json.dump(obj, f, indent=2, ensure_ascii=False)
+
+    Values that are lists or generators are written item by item, so large
+    message lists never have to be built in memory. The file is written to a
+    temporary path and renamed into place.
+
+    Args:
+        path: Output file path
+        sections: List of (key, value) pairs in output order
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for section_index, (key, value) in enumerate(sections):
+            f.write(',\n  ' if section_index else '\n  ')
+            f.write(json.dumps(key, ensure_ascii=False) + ': ')
+
+            if isinstance(value, dict):
+                f.write(_indent(json.dumps(value, indent=2, ensure_ascii=False)))
+                continue
+
+            empty = True
+            for item in value:
+                f.write(',\n    ' if not empty else '[\n    ')
+                f.write(_indent(json.dumps(item, indent=2, ensure_ascii=False), 4))
+                empty = False
+            f.write('[]' if empty else '\n  ]')
+        f.write('\n}' if sections else '}')
+    os.replace(temp_path, path)
+
+
+def _indent(text, spaces=2):
+    return text.replace('\n', '\n' + ' ' * spaces)
@@ -0,0 +1,170 @@
+"""
+Token-budgeted context for contextual replies
+Picks which recent chat messages go into an opinion/analysis request so the
+prompt stays within a token budget however long the messages are:
+
+- Tokens are counted with tiktoken when it is installed, otherwise with a local
+  estimate (words and punctuation). Counts are cached per message line, so a
+  message is only counted once however many requests it appears in.
+- Messages are ranked by recency plus their word overlap with the question; the
+  best are taken until the budget is full and then put back in chat order.
+- A message longer than the per-message cap is truncated instead of crowding
+  out the rest.
+- The reply's max_tokens grows with the space the context leaves in the budget.
+"""
+
+import re
+from functools import lru_cache
+
+from meeting_buffers import ChatRecord
+
+try:
+    import tiktoken
+except ImportError:  # Optional; the estimate below is close enough for budgeting
+    tiktoken = None
+
+TOKEN_ENCODING = "o200k_base"
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+_KEYWORD_RE = re.compile(r"[a-z0-9']{3,}")
+
+# Words that say nothing about what a question is about
+STOPWORDS = frozenset("""
+the and for are but not you your yours with this that what what's which who how why when where
+was were has have had does did can could would should will just about think thoughts opinion
+take kurt kurtbot clone analyze analysis say agree feel perspective from they them their there
+""".split())
+
+
+def _load_encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:  # The encoding file is downloaded on first use
+        print(f"⚠️ tiktoken encoding {TOKEN_ENCODING} unavailable, estimating tokens: {e}")
+        return None
+
+
+_encoding = _load_encoding()
+TOKENIZER = f"tiktoken:{TOKEN_ENCODING}" if _encoding is not None else "estimate"
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text):
+    """
+    Number of tokens in text (cached per distinct string)
+    """
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # Words and punctuation, plus extra for long words that split into several tokens
+    return sum(1 + len(piece) // 8 for piece in _WORD_RE.findall(text))
+
+
+def format_line(record):
+    """
+    How a chat record appears in the prompt
+    """
+    return f"{record.participant}: {record.text}\n"
+
+
+@lru_cache(maxsize=8192)
+def keywords(text):
+    """
+    Distinct content words of a message (cached like the token counts)
+    """
+    return frozenset(word for word in _KEYWORD_RE.findall(text.lower()) if word not in STOPWORDS)
+
+
+def truncate_record(record, max_tokens):
+    """
+    Copy of a record whose line fits in max_tokens (the text is cut and marked)
+    """
+    tokens = count_tokens(format_line(record))
+    if tokens <= max_tokens:
+        return record
+
+    text = record.text
+    keep = int(len(text) * max_tokens / tokens)
+    while keep > 0:
+        shortened = ChatRecord(record.participant, text[:keep].rstrip() + " …[truncated]", ts=record.ts)
+        if count_tokens(format_line(shortened)) <= max_tokens:
+            return shortened
+        keep = int(keep * 0.9)
+    return ChatRecord(record.participant, "…[truncated]", ts=record.ts)
+
+
+class ContextBuilder:
+    """
+    Chooses the context messages and reply size for a contextual request
+    """
+
+    def __init__(self, total_budget=1500, max_message_tokens=150, max_output_tokens=250,
+                 min_output_tokens=100, relevance_weight=1.0):
+        """
+        Args:
+            total_budget: Tokens for the whole request: prompt, context and reply
+            max_message_tokens: Longest single message line; longer ones are truncated
+            max_output_tokens: Reply max_tokens when the context leaves room
+            min_output_tokens: Reply tokens always reserved, however much context there is
+            relevance_weight: How much word overlap with the question counts against recency
+                (recency ranges from 0 for the oldest candidate to 1 for the newest)
+        """
+        self.total_budget = total_budget
+        self.max_message_tokens = max_message_tokens
+        self.max_output_tokens = max_output_tokens
+        self.min_output_tokens = min_output_tokens
+        self.relevance_weight = relevance_weight
+
+    def select(self, records, question, fixed_tokens=0):
+        """
+        Pick the context messages for a question
+
+        Args:
+            records: Candidate chat records, oldest first
+            question: The message being answered
+            fixed_tokens: Tokens the rest of the prompt (system prompt, question, ...) takes
+
+        Returns:
+            tuple: (selected records in chat order, context tokens, reply max_tokens)
+        """
+        records = list(records)
+        budget = self.total_budget - fixed_tokens - self.min_output_tokens
+
+        question_words = keywords(question)
+        scored = []
+        for position, record in enumerate(records):
+            recency = position / (len(records) - 1) if len(records) > 1 else 1.0
+            relevance = 0.0
+            if question_words:
+                relevance = len(question_words & keywords(record.text)) / len(question_words)
+            scored.append((recency + self.relevance_weight * relevance, position, record))
+
+        chosen = []
+        used = 0
+        for _, position, record in sorted(scored, key=lambda item: item[0], reverse=True):
+            record = truncate_record(record, self.max_message_tokens)
+            tokens = count_tokens(format_line(record))
+            if used + tokens > budget:
+                continue
+            chosen.append((position, record))
+            used += tokens
+
+        chosen.sort(key=lambda item: item[0])
+        space_left = self.total_budget - fixed_tokens - used
+        max_tokens = max(self.min_output_tokens, min(self.max_output_tokens, space_left))
+        return [record for _, record in chosen], used, max_tokens
+
+    def stats(self):
+        return {
+            'tokenizer': TOKENIZER,
+            'total_budget': self.total_budget,
+            'token_cache': count_tokens.cache_info()._asdict()
+        }
+
+
+def prompt_tokens(messages):
+    """
+    Tokens of a list of chat messages, with a few tokens of framing per message
+    """
+    return sum(count_tokens(message['content']) + 4 for message in messages)
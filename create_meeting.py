@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
 """
 Create Meeting Bot CLI
-Standalone script to create a Recall.ai bot for a specific meeting.
+Standalone script to create a Recall.ai bot for a specific meeting, or for many
+meetings at once with --bulk.
+
+    python create_meeting.py "https://zoom.us/j/123456789"
+    python create_meeting.py --bulk meetings.txt --parallel 8 --results bots.json
+    cat meetings.txt | python create_meeting.py --bulk -
 """
 
+import argparse
+import json
 import os
 import sys
+import threading
+import time
+from datetime import datetime, timezone
 from dotenv import load_dotenv
-from recall_api import create_bot_with_realtime_and_chat, get_bot_status
+from recall_api import create_bot_with_realtime_and_chat, create_bots_concurrently, get_bot_status
 
 # Load environment variables
 load_dotenv()
@@ -15,11 +25,123 @@ load_dotenv()
 # Get webhook URL from environment
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")
 
+# Bulk mode defaults
+BULK_PARALLEL = 8
+BULK_RETRIES = 5  # Retries per bot when Recall.ai answers 429
+BULK_RESULTS_FILE = "bot_results.json"
+
+
+def read_meeting_urls(source):
+    """
+    Read meeting URLs, one per line (blank lines and # comments ignored, duplicates dropped)
+
+    Args:
+        source: File path, or "-" for stdin
+
+    Returns:
+        list: Meeting URLs in input order
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source) as f:
+            lines = f.read().splitlines()
+
+    urls = []
+    for line in lines:
+        url = line.strip()
+        if url and not url.startswith('#') and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def load_results(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_results(results, path):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def create_bots_bulk(meeting_urls, webhook_url, parallel=BULK_PARALLEL, retries=BULK_RETRIES,
+                     results_path=BULK_RESULTS_FILE, create_bots=create_bots_concurrently):
+    """
+    Create bots for many meetings concurrently, printing progress as each finishes
+
+    Meetings that already have a created bot in the results file are skipped, so a
+    failed or interrupted run can simply be repeated.
+
+    Args:
+        meeting_urls: Meeting URLs
+        webhook_url: The webhook endpoint every bot reports to
+        parallel: Maximum bot creations in flight
+        retries: Retries per bot on 429 (Retry-After is honored)
+        results_path: JSON file mapping meeting URL to {"bot_id", "status", "created_at"}
+        create_bots: Bulk creator (see recall_api.create_bots_concurrently)
+
+    Returns:
+        dict: The results for every meeting URL in the file
+    """
+    results = load_results(results_path)
+    pending = [url for url in meeting_urls if results.get(url, {}).get('status') != 'created']
+    skipped = len(meeting_urls) - len(pending)
+    if skipped:
+        print(f"⏭️ Skipping {skipped} meeting(s) that already have a bot in {results_path}")
+    if not pending:
+        return results
+
+    lock = threading.Lock()
+    progress = {'done': 0, 'failed': 0}
+    start = time.monotonic()
+
+    def on_result(url, bot_data):
+        with lock:
+            progress['done'] += 1
+            if bot_data:
+                results[url] = {
+                    'bot_id': bot_data['id'],
+                    'status': 'created',
+                    'created_at': datetime.now(timezone.utc).isoformat()
+                }
+                print(f"[{progress['done']}/{len(pending)}] ✅ {url} → {bot_data['id']}")
+            else:
+                progress['failed'] += 1
+                results[url] = {'bot_id': None, 'status': 'failed'}
+                print(f"[{progress['done']}/{len(pending)}] ❌ {url}")
+            # Rewritten after every bot, so an interrupted run keeps what was created
+            save_results(results, results_path)
+
+    print(f"🚀 Creating {len(pending)} bot(s), {parallel} at a time...")
+    create_bots(pending, webhook_url, max_workers=parallel, retries=retries, on_result=on_result)
+
+    elapsed = time.monotonic() - start
+    print(f"\n📊 {len(pending) - progress['failed']} created, {progress['failed']} failed "
+          f"in {elapsed:.1f}s → {results_path}")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create Kurt's Clone bots for meetings")
+    parser.add_argument("meeting_url", nargs="?", help="Meeting URL (prompted for if omitted)")
+    parser.add_argument("--bulk", metavar="FILE", help="Create bots for every URL in FILE (one per line, - for stdin)")
+    parser.add_argument("--parallel", type=int, default=BULK_PARALLEL, help="Bots created at once in bulk mode")
+    parser.add_argument("--retries", type=int, default=BULK_RETRIES, help="Retries per bot when rate limited")
+    parser.add_argument("--results", default=BULK_RESULTS_FILE, help="JSON results file for bulk mode")
+    return parser.parse_args(argv)
+
 
 def main():
     """
     Main function to create a bot for a meeting
     """
+    args = parse_args()
     print("🤖 Kurt's Clone - Meeting Bot Creator")
     print("=" * 50)
 
@@ -32,9 +154,20 @@ def main():
     print(f"✓ Webhook URL: {WEBHOOK_URL}")
     print()
 
+    if args.bulk:
+        meeting_urls = read_meeting_urls(args.bulk)
+        if not meeting_urls:
+            print("❌ Error: No meeting URLs found")
+            sys.exit(1)
+        results = create_bots_bulk(meeting_urls, WEBHOOK_URL, parallel=args.parallel,
+                                   retries=args.retries, results_path=args.results)
+        if any(results.get(url, {}).get('status') != 'created' for url in meeting_urls):
+            sys.exit(1)
+        return
+
     # Get meeting URL from command line or prompt
-    if len(sys.argv) > 1:
-        meeting_url = sys.argv[1]
+    if args.meeting_url:
+        meeting_url = args.meeting_url
     else:
         meeting_url = input("Enter Zoom/Teams/Meet meeting URL: ").strip()
 
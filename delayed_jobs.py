@@ -0,0 +1,210 @@
+"""
+Delayed job scheduler
+A time-ordered heap of jobs served by its own worker thread. Used for work that
+has to wait (e.g. "create the async transcript once the recording is finalized")
+so it never blocks a webhook request, with exponential-backoff retries and
+de-duplication by job key.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+
+class DelayedJobScheduler:
+    """
+    Runs jobs at a given time in the future on a single background thread.
+
+    A job is a callable that returns a truthy value on success. A falsy result or
+    an exception schedules a retry with exponential backoff until max_attempts is
+    reached. Each job has a key; scheduling a key that is already pending (or that
+    already completed, when remembered) is skipped.
+    """
+
+    def __init__(self, name="delayed-jobs", max_completed=10000):
+        """
+        Args:
+            name: Scheduler name (used for the thread name and log output)
+            max_completed: How many completed keys to remember for de-duplication
+        """
+        self.name = name
+        self.max_completed = max_completed
+        self._heap = []
+        self._pending = {}  # key -> job dict
+        self._completed = OrderedDict()  # key -> completion time (bounded)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self):
+        """
+        Start the worker thread (idempotent)
+        """
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def schedule(self, key, func, *args, delay=0.0, max_attempts=5, retry_delay=None,
+                 backoff=2.0, max_retry_delay=300.0, remember=True, **kwargs):
+        """
+        Schedule a job to run after a delay
+
+        Args:
+            key: De-duplication key for the job
+            func: Callable to run; a truthy return value means success
+            delay: Seconds to wait before the first attempt
+            max_attempts: Total number of attempts before giving up
+            retry_delay: Seconds before the first retry (defaults to delay, or 1s)
+            backoff: Multiplier applied to the retry delay after each failure
+            max_retry_delay: Upper bound for the retry delay
+            remember: Whether to skip this key again after it completes successfully
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            bool: True if scheduled, False if the key is already pending or completed
+        """
+        if not self._running:
+            self.start()
+
+        with self._condition:
+            if key in self._pending or key in self._completed:
+                return False
+
+            job = {
+                'key': key,
+                'func': func,
+                'args': args,
+                'kwargs': kwargs,
+                'attempt': 0,
+                'max_attempts': max(1, int(max_attempts)),
+                'retry_delay': retry_delay if retry_delay is not None else (delay or 1.0),
+                'backoff': backoff,
+                'max_retry_delay': max_retry_delay,
+                'remember': remember
+            }
+            self._pending[key] = job
+            self._push(job, time.monotonic() + delay)
+            return True
+
+    def cancel(self, key):
+        """
+        Cancel a pending job
+
+        Returns:
+            bool: True if a pending job was cancelled
+        """
+        with self._condition:
+            job = self._pending.pop(key, None)
+            if job is None:
+                return False
+            job['cancelled'] = True
+            self._condition.notify()
+            return True
+
+    def is_pending(self, key):
+        with self._condition:
+            return key in self._pending
+
+    def _push(self, job, run_at):
+        # Caller holds the condition
+        job['run_at'] = run_at
+        heapq.heappush(self._heap, (run_at, next(self._sequence), job))
+        self._condition.notify()
+
+    def _next_due_job(self):
+        with self._condition:
+            while self._running:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                run_at, _, job = self._heap[0]
+                if job.get('cancelled'):
+                    heapq.heappop(self._heap)
+                    continue
+
+                wait = run_at - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+
+                heapq.heappop(self._heap)
+                return job
+            return None
+
+    def _run(self):
+        while True:
+            job = self._next_due_job()
+            if job is None:
+                return
+
+            job['attempt'] += 1
+            try:
+                ok = job['func'](*job['args'], **job['kwargs'])
+            except Exception as e:
+                print(f"❌ [{self.name}] Job {job['key']} raised: {e}")
+                ok = False
+
+            with self._condition:
+                if job.get('cancelled'):
+                    continue
+
+                if ok:
+                    self.succeeded += 1
+                    self._pending.pop(job['key'], None)
+                    if job['remember']:
+                        self._completed[job['key']] = time.time()
+                        while len(self._completed) > self.max_completed:
+                            self._completed.popitem(last=False)
+                elif job['attempt'] < job['max_attempts']:
+                    self.retried += 1
+                    retry_in = min(
+                        job['retry_delay'] * (job['backoff'] ** (job['attempt'] - 1)),
+                        job['max_retry_delay']
+                    )
+                    print(f"🔁 [{self.name}] Job {job['key']} attempt {job['attempt']}/{job['max_attempts']} "
+                          f"failed, retrying in {retry_in:.1f}s")
+                    self._push(job, time.monotonic() + retry_in)
+                else:
+                    self.failed += 1
+                    self._pending.pop(job['key'], None)
+                    print(f"❌ [{self.name}] Job {job['key']} gave up after {job['attempt']} attempts")
+
+    def stats(self):
+        """
+        Returns:
+            dict: Pending/completed counts and outcome counters
+        """
+        with self._condition:
+            return {
+                'pending': len(self._pending),
+                'remembered_completed': len(self._completed),
+                'succeeded': self.succeeded,
+                'retried': self.retried,
+                'failed': self.failed
+            }
+
+    def shutdown(self, timeout=None):
+        """
+        Stop the worker thread; pending jobs are discarded
+
+        Returns:
+            bool: True if the worker exited within the timeout
+        """
+        with self._condition:
+            if not self._running:
+                return True
+            self._running = False
+            thread = self._thread
+            self._condition.notify_all()
+        thread.join(timeout)
+        return not thread.is_alive()
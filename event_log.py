@@ -0,0 +1,311 @@
+"""
+Structured event logging
+Levels, per-event-type sampling and payload redaction/truncation for the
+webhook's high-volume log lines (received events, realtime transcripts, payload
+dumps), which used to be printed in full on the request thread.
+
+The request thread only checks the level and the sampler and puts a record on
+a bounded queue. Formatting (JSON or text), redaction and the stdout write run
+on a listener thread. When the queue is full, records are dropped and counted
+instead of blocking a webhook.
+
+Full payload dumps are logged at debug level, which can be switched on and off
+at runtime (SIGUSR1 in bot.py and serve.py).
+"""
+
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+LOGGER_NAME = "kurtbot"
+REDACTED = "[redacted]"
+
+# Payload keys whose values never reach the logs
+DEFAULT_REDACT_KEYS = (
+    'api_key', 'authorization', 'token', 'access_token', 'password', 'secret', 'email', 'phone'
+)
+
+
+def redact(value, redact_keys=DEFAULT_REDACT_KEYS, max_chars=200, max_items=20, depth=5):
+    """
+    Copy a payload for logging with secrets masked and long values truncated
+
+    Args:
+        value: Decoded JSON value (dict, list, str, number, ...)
+        redact_keys: Keys (case-insensitive) whose values are replaced with REDACTED
+        max_chars: Longest string kept; longer ones are cut and marked with their length
+        max_items: Most list items / dict keys kept per container
+        depth: Nesting levels kept; deeper containers are summarized
+
+    Returns:
+        A JSON-serializable copy safe to log
+    """
+    if isinstance(value, dict):
+        if depth <= 0:
+            return f"{{...{len(value)} keys}}"
+        result = {}
+        for index, (key, item) in enumerate(value.items()):
+            if index >= max_items:
+                result['...'] = f"{len(value) - max_items} more keys"
+                break
+            if str(key).lower() in redact_keys:
+                result[key] = REDACTED
+            else:
+                result[key] = redact(item, redact_keys, max_chars, max_items, depth - 1)
+        return result
+
+    if isinstance(value, (list, tuple)):
+        if depth <= 0:
+            return f"[...{len(value)} items]"
+        result = [redact(item, redact_keys, max_chars, max_items, depth - 1) for item in value[:max_items]]
+        if len(value) > max_items:
+            result.append(f"...{len(value) - max_items} more items")
+        return result
+
+    if isinstance(value, str) and len(value) > max_chars:
+        return f"{value[:max_chars]}...({len(value)} chars)"
+
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)[:max_chars]
+
+
+def parse_sample_rates(text):
+    """
+    Parse "transcript.partial_data=0.01,transcript.data=0.2" into {event: rate}
+    """
+    rates = {}
+    for item in (text or '').split(','):
+        if '=' in item:
+            event, rate = item.split('=', 1)
+            rates[event.strip()] = float(rate)
+    return rates
+
+
+class EventSampler:
+    """
+    Deterministic per-event-type sampling: a rate of 0.1 logs every 10th event of that type
+    """
+
+    def __init__(self, rates=None, default=1.0):
+        self.rates = dict(rates or {})
+        self.default = default
+        self._counters = {}
+        self._suppressed = {}
+        self._lock = threading.Lock()
+
+    def _every(self, event):
+        rate = self.rates.get(event, self.default)
+        if rate <= 0:
+            return 0
+        return max(1, round(1 / rate))
+
+    def should_log(self, event):
+        every = self._every(event)
+        if every == 1:
+            return True
+
+        counter = self._counters.get(event)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(event, itertools.count())
+        if every and next(counter) % every == 0:
+            return True
+        self._suppressed[event] = self._suppressed.get(event, 0) + 1
+        return False
+
+    def stats(self):
+        return {'rates': self.rates, 'suppressed': dict(self._suppressed)}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, msg, then the record's (redacted) fields
+    """
+
+    def __init__(self, redact_payload):
+        super().__init__()
+        self.redact_payload = redact_payload
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'msg': record.getMessage()
+        }
+        for key, value in getattr(record, 'fields', {}).items():
+            entry[key] = self.redact_payload(value)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    The message followed by (redacted) key=value fields, close to the bot's print output
+    """
+
+    def __init__(self, redact_payload):
+        super().__init__()
+        self.redact_payload = redact_payload
+
+    def _value(self, value):
+        value = self.redact_payload(value)
+        if isinstance(value, str) and value and ' ' not in value:
+            return value
+        return json.dumps(value, ensure_ascii=False, default=str)
+
+    def format(self, record):
+        parts = [record.getMessage()]
+        if record.levelno >= logging.WARNING:
+            parts.insert(0, record.levelname)
+        parts.extend(f"{key}={self._value(value)}" for key, value in getattr(record, 'fields', {}).items()
+                     if value is not None)
+        text = ' '.join(parts)
+        if record.exc_info:
+            text += '\n' + self.formatException(record.exc_info)
+        return text
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that hands the record over unformatted and drops it when the queue is full
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class EventLogger:
+    """
+    Queue-backed structured logger for webhook events
+    """
+
+    def __init__(self, level="INFO", fmt="text", sample_rates=None, max_chars=200, max_items=20,
+                 redact_keys=DEFAULT_REDACT_KEYS, queue_size=10000, stream=None, name=LOGGER_NAME):
+        """
+        Args:
+            level: Base level name (DEBUG also enables payload dumps)
+            fmt: "text" or "json"
+            sample_rates: {event type: fraction of events logged}; other types are all logged
+            max_chars: Longest string kept in a logged field or payload
+            max_items: Most list items / dict keys kept per payload container
+            redact_keys: Payload keys whose values are masked
+            queue_size: Records buffered for the listener thread before new ones are dropped
+            stream: Output stream (defaults to stdout)
+            name: logging logger name
+        """
+        self.base_level = logging.getLevelName(str(level).upper())
+        if not isinstance(self.base_level, int):
+            self.base_level = logging.INFO
+        self.sampler = EventSampler(sample_rates)
+        self.redact_keys = tuple(key.lower() for key in redact_keys)
+        self.max_chars = max_chars
+        self.max_items = max_items
+
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(self.base_level)
+        self.logger.propagate = False
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.logger.handlers = [self.handler]
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        if fmt == 'json':
+            output.setFormatter(JsonFormatter(self.redact_payload))
+        else:
+            output.setFormatter(TextFormatter(self.redact_payload))
+        self.listener = logging.handlers.QueueListener(self.queue, output)
+        self.listener.start()
+
+    def redact_payload(self, payload):
+        return redact(payload, self.redact_keys, self.max_chars, self.max_items)
+
+    @property
+    def debug_enabled(self):
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def set_debug(self, enabled):
+        """
+        Switch debug logging (payload dumps) on or off at runtime
+        """
+        self.logger.setLevel(logging.DEBUG if enabled else self.base_level)
+
+    def toggle_debug(self, *signal_args):
+        """
+        Flip debug logging (usable directly as a signal handler)
+        """
+        self.set_debug(not self.debug_enabled)
+        self.logger.warning(f"🔧 Debug logging {'enabled' if self.debug_enabled else 'disabled'}")
+
+    def event(self, event_type, message, level=logging.INFO, **fields):
+        """
+        Log one line for an event, subject to the event type's sample rate
+
+        Returns:
+            bool: Whether this event was sampled (so related lines can follow suit)
+        """
+        if not self.sampler.should_log(event_type):
+            return False
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, extra={'fields': fields})
+        return True
+
+    def payload(self, message, data, **fields):
+        """
+        Dump a (redacted, truncated) payload at debug level; free when debug is off
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, extra={'fields': {**fields, 'payload': data}})
+
+    def debug(self, message, **fields):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, extra={'fields': fields})
+
+    def warning(self, message, **fields):
+        self.logger.warning(message, extra={'fields': fields})
+
+    def error(self, message, exc_info=False, **fields):
+        self.logger.error(message, exc_info=exc_info, extra={'fields': fields})
+
+    def flush(self, timeout=5.0):
+        """
+        Wait until the listener thread has written every queued record
+
+        Returns:
+            bool: True if the queue was emptied within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self):
+        self.listener.stop()
+
+    def stats(self):
+        return {
+            'level': logging.getLevelName(self.logger.level),
+            'queued': self.queue.qsize(),
+            'dropped': self.handler.dropped,
+            **self.sampler.stats()
+        }
@@ -0,0 +1,276 @@
+"""
+Background event worker pool
+Bounded in-process work queues so the webhook endpoint can acknowledge Recall.ai
+events immediately and do the slow work (LLM calls, chat sends, exports) off the
+request thread.
+"""
+
+import queue
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+from metrics import STAGE_SECONDS
+
+
+class StageTimings:
+    """
+    Thread-safe running totals for named processing stages
+    (e.g. "queue_wait", "llm_reply", "send_chat")
+    """
+
+    def __init__(self, histogram=None):
+        """
+        Args:
+            histogram: Optional metrics Histogram (labelled by stage) that every
+                observation is also recorded into
+        """
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._histogram = histogram
+
+    def record(self, stage, seconds):
+        """
+        Record one observation for a stage
+
+        Args:
+            stage: Name of the stage
+            seconds: Elapsed time in seconds
+        """
+        with self._lock:
+            stats = self._stats.get(stage)
+            if stats is None:
+                stats = self._stats[stage] = [0, 0.0, 0.0]  # count, total, max
+            stats[0] += 1
+            stats[1] += seconds
+            if seconds > stats[2]:
+                stats[2] = seconds
+        if self._histogram is not None:
+            self._histogram.observe(seconds, stage)
+
+    @contextmanager
+    def time(self, stage):
+        """
+        Context manager that records how long the wrapped block took
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {stage: {'count', 'total_ms', 'avg_ms', 'max_ms'}}
+        """
+        with self._lock:
+            items = [(stage, list(stats)) for stage, stats in self._stats.items()]
+
+        return {
+            stage: {
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'avg_ms': round(total * 1000 / count, 3) if count else 0.0,
+                'max_ms': round(max_seconds * 1000, 3)
+            }
+            for stage, (count, total, max_seconds) in items
+        }
+
+
+# Shared timings for the webhook pipeline
+stage_timings = StageTimings(histogram=STAGE_SECONDS)
+
+
+class WorkerPool:
+    """
+    Fixed pool of worker threads, each with its own bounded queue.
+
+    Jobs submitted with the same key (e.g. a bot ID) always land on the same
+    worker, so events for one meeting are processed in the order they arrived
+    while different meetings run in parallel.
+    """
+
+    def __init__(self, name, num_workers=4, max_queue_size=1000, timings=None):
+        """
+        Args:
+            name: Pool name (used for thread names and log output)
+            num_workers: Number of worker threads
+            max_queue_size: Total number of queued jobs across all workers
+            timings: StageTimings to record queue wait and job run times into
+        """
+        self.name = name
+        self.num_workers = max(1, int(num_workers))
+        per_worker = max(1, -(-int(max_queue_size) // self.num_workers))
+        self._queues = [queue.Queue(maxsize=per_worker) for _ in range(self.num_workers)]
+        self._threads = []
+        self._timings = timings if timings is not None else stage_timings
+        self._round_robin = 0
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False  # Set by shutdown; submit rejects until start() reopens
+        self._retired = []  # Workers from before the last shutdown
+        self._stopping = threading.Event()  # Replaced on every start
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+
+    def start(self):
+        """
+        Start the worker threads (idempotent)
+
+        Also reopens a pool that was shut down, once its previous workers have exited.
+
+        Raises:
+            RuntimeError: If workers from before the shutdown are still running
+        """
+        with self._lock:
+            if self._started:
+                return
+            if any(thread.is_alive() for thread in self._retired):
+                raise RuntimeError(f"[{self.name}] previous workers are still running")
+            self._closed = False
+            self._start_workers()
+
+    def _start_workers(self):
+        # Caller holds self._lock
+        self._started = True
+        self._retired = []
+        self._stopping = threading.Event()
+        for index, work_queue in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._run,
+                args=(work_queue, self._stopping),
+                name=f"{self.name}-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _pick_queue(self, key):
+        # Caller holds self._lock
+        if key is None:
+            self._round_robin = (self._round_robin + 1) % self.num_workers
+            return self._queues[self._round_robin]
+        index = zlib.crc32(str(key).encode('utf-8')) % self.num_workers
+        return self._queues[index]
+
+    def submit(self, key, func, *args, stage=None, **kwargs):
+        """
+        Queue a job without blocking
+
+        Args:
+            key: Ordering key (jobs with the same key run sequentially), or None
+            func: Callable to run on a worker thread
+            stage: Optional stage name used for timing the job
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            bool: True if queued, False if the pool's queue is full or the pool was
+                shut down (until start() reopens it)
+        """
+        job = (time.perf_counter(), stage or getattr(func, '__name__', 'job'), func, args, kwargs)
+        with self._lock:
+            # A job still running during shutdown must not start a second set of
+            # workers on the same queues (that would break per-key ordering)
+            if self._closed:
+                self.rejected += 1
+                return False
+            if not self._started:
+                self._start_workers()
+            try:
+                self._pick_queue(key).put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                return False
+            self.submitted += 1
+        return True
+
+    def _run(self, work_queue, stopping):
+        while True:
+            # A shutdown that couldn't queue its stop marker (queue full) sets stopping instead
+            if stopping.is_set() and work_queue.empty():
+                return
+            job = work_queue.get()
+            if job is None:
+                work_queue.task_done()
+                return
+
+            enqueued_at, stage, func, args, kwargs = job
+            started = time.perf_counter()
+            self._timings.record(f"{self.name}.queue_wait", started - enqueued_at)
+
+            try:
+                func(*args, **kwargs)
+                with self._lock:
+                    self.completed += 1
+            except Exception as e:
+                with self._lock:
+                    self.failed += 1
+                print(f"❌ [{self.name}] Job {stage} failed: {e}")
+                import traceback
+                traceback.print_exc()
+            finally:
+                self._timings.record(stage, time.perf_counter() - started)
+                work_queue.task_done()
+
+    def depth(self):
+        """
+        Returns:
+            int: Number of jobs currently waiting across all workers
+        """
+        return sum(work_queue.qsize() for work_queue in self._queues)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Queue depth and job counters
+        """
+        with self._lock:
+            return {
+                'workers': self.num_workers,
+                'queue_depth': self.depth(),
+                'queue_depth_per_worker': [work_queue.qsize() for work_queue in self._queues],
+                'queue_capacity': sum(work_queue.maxsize for work_queue in self._queues),
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+                'failed': self.failed
+            }
+
+    def shutdown(self, timeout=None):
+        """
+        Stop the workers after they finish everything already queued; later submits
+        are rejected until start() is called again
+
+        Args:
+            timeout: Maximum seconds to wait for all workers, or None to wait forever
+
+        Returns:
+            bool: True if every worker exited within the timeout
+        """
+        with self._lock:
+            self._closed = True
+            if not self._started:
+                return True
+            self._started = False
+            threads = self._retired = self._threads
+            self._threads = []
+            stopping = self._stopping
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        stopping.set()
+        for work_queue in self._queues:
+            # Wakes a worker idle in get(); a full queue's worker sees `stopping` once it drains
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                work_queue.put(None, timeout=remaining)
+            except queue.Full:
+                pass
+
+        for thread in threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        return not any(thread.is_alive() for thread in threads)
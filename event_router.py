@@ -0,0 +1,249 @@
+"""
+Webhook event router
+Decodes webhook bodies (with orjson when it is installed), parses each event
+type once into a small typed object with the bot ID, participant and message
+already resolved, and dispatches it through a table of handlers instead of an
+if/elif chain of string comparisons.
+
+Events registered as fast-path events (transcript.partial_data: many per second
+per meeting, only ever logged) skip deduplication, queueing and stage timing;
+the webhook hands them straight to their handler.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the standard library decoder works the same
+    orjson = None
+
+JSON_DECODER = 'orjson' if orjson is not None else 'json'
+
+
+def decode_body(body):
+    """
+    Decode a webhook request body
+
+    Args:
+        body: Raw request bytes
+
+    Returns:
+        dict: The decoded payload
+
+    Raises:
+        ValueError: The body is not a JSON object
+    """
+    data = orjson.loads(body) if orjson is not None else json.loads(body)
+    if not isinstance(data, dict):
+        raise ValueError("webhook body is not a JSON object")
+    return data
+
+
+def _nested(data, *path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def resolve_bot_id(data):
+    """
+    The bot ID of a payload (nested data.bot.id, or the legacy top-level bot_id)
+    """
+    return _nested(data, 'data', 'bot', 'id') or data.get('bot_id')
+
+
+class WebhookEvent:
+    """
+    A webhook event: its type, resolved bot ID and raw payload
+    """
+
+    __slots__ = ('event', 'bot_id', 'data')
+
+    def __init__(self, event, bot_id, data):
+        self.event = event
+        self.bot_id = bot_id
+        self.data = data
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self._fields())
+        return f"{type(self).__name__}({fields})"
+
+    def _fields(self):
+        return ['event', 'bot_id'] + [name for cls in type(self).__mro__[:-2] for name in cls.__slots__]
+
+
+class TranscriptEvent(WebhookEvent):
+    """
+    transcript.data: one realtime utterance, words joined into text
+    """
+
+    __slots__ = ('participant_name', 'words')
+
+    def __init__(self, event, bot_id, data, participant_name, words):
+        super().__init__(event, bot_id, data)
+        self.participant_name = participant_name
+        self.words = words
+
+
+class ChatEvent(WebhookEvent):
+    """
+    participant_events.chat_message / chat.message
+    """
+
+    __slots__ = ('participant_name', 'participant_id', 'text', 'is_dm')
+
+    def __init__(self, event, bot_id, data, participant_name, participant_id, text, is_dm):
+        super().__init__(event, bot_id, data)
+        self.participant_name = participant_name
+        self.participant_id = participant_id
+        self.text = text
+        self.is_dm = is_dm
+
+
+class BotStatusEvent(WebhookEvent):
+    """
+    bot.* lifecycle events, including the legacy bot.status_change
+    """
+
+    __slots__ = ('status', 'recording_id')
+
+    def __init__(self, event, bot_id, data, status, recording_id):
+        super().__init__(event, bot_id, data)
+        self.status = status
+        self.recording_id = recording_id
+
+
+class ArtifactEvent(WebhookEvent):
+    """
+    transcript.done / transcript.failed / recording.done
+    """
+
+    __slots__ = ('transcript_id', 'recording_id')
+
+    def __init__(self, event, bot_id, data, transcript_id, recording_id):
+        super().__init__(event, bot_id, data)
+        self.transcript_id = transcript_id
+        self.recording_id = recording_id
+
+
+def parse_transcript(event, bot_id, data):
+    inner = _nested(data, 'data', 'data') or {}
+    words = inner.get('words', '')
+    if isinstance(words, list):
+        words = ' '.join(word.get('text', '') for word in words)
+    participant = inner.get('participant') or {}
+    return TranscriptEvent(event, bot_id, data, participant.get('name', 'Unknown'), words)
+
+
+def parse_chat(event, bot_id, data):
+    # Participant and message live at different paths depending on the API version
+    inner = data.get('data') or {}
+    participant = _nested(inner, 'data', 'participant') or inner.get('participant') or {}
+    message = _nested(inner, 'data', 'data') or inner.get('message') or {}
+
+    # In Recall.ai, 'to' is the recipient: anything but "everyone" is a DM to the bot
+    return ChatEvent(
+        event, bot_id, data,
+        participant_name=participant.get('name', 'Unknown'),
+        participant_id=str(participant.get('id', '')),
+        text=message.get('text', ''),
+        is_dm=message.get('to', '') != 'everyone'
+    )
+
+
+def parse_bot_status(event, bot_id, data):
+    inner = data.get('data') or {}
+    status = inner.get('code') or _nested(inner, 'data', 'code')
+    recording_id = _nested(inner, 'recording', 'id') or inner.get('recording_id')
+    return BotStatusEvent(event, bot_id, data, status, recording_id)
+
+
+def parse_artifact(event, bot_id, data):
+    return ArtifactEvent(event, bot_id, data,
+                         transcript_id=_nested(data, 'data', 'transcript', 'id'),
+                         recording_id=_nested(data, 'data', 'recording', 'id'))
+
+
+PARSERS = {
+    'transcript.data': parse_transcript,
+    'participant_events.chat_message': parse_chat,
+    'chat.message': parse_chat,
+    'bot.joining_call': parse_bot_status,
+    'bot.in_call_recording': parse_bot_status,
+    'bot.in_call_not_recording': parse_bot_status,
+    'bot.status_change': parse_bot_status,
+    'bot.done': parse_bot_status,
+    'bot.call_ended': parse_bot_status,
+    'transcript.done': parse_artifact,
+    'transcript.failed': parse_artifact,
+    'recording.done': parse_artifact,
+}
+
+
+def parse_event(data):
+    """
+    Parse a decoded payload into its typed event (WebhookEvent for other types)
+
+    Args:
+        data: Decoded webhook payload
+
+    Returns:
+        WebhookEvent: The typed event
+    """
+    event = data.get('event')
+    parser = PARSERS.get(event)
+    if parser is None:
+        return WebhookEvent(event, resolve_bot_id(data), data)
+    return parser(event, resolve_bot_id(data), data)
+
+
+class EventRouter:
+    """
+    Dispatch table from event type to handler
+    """
+
+    def __init__(self, fast_path=()):
+        """
+        Args:
+            fast_path: Event types answered without dedupe, queueing or stage timing
+        """
+        self.handlers = {}
+        self.fast_path = frozenset(fast_path)
+        self.fallback = None
+
+    def on(self, *events):
+        """
+        Decorator registering a handler for one or more event types
+        """
+        def register(handler):
+            for event in events:
+                self.handlers[event] = handler
+            return handler
+        return register
+
+    def otherwise(self, handler):
+        """
+        Decorator registering the handler for unregistered event types
+        """
+        self.fallback = handler
+        return handler
+
+    def handles(self, event):
+        return event in self.handlers
+
+    def is_fast_path(self, event):
+        return event in self.fast_path
+
+    def dispatch(self, parsed):
+        """
+        Run the handler for a parsed event
+
+        Returns:
+            The handler's result (None when no handler is registered)
+        """
+        handler = self.handlers.get(parsed.event, self.fallback)
+        if handler is None:
+            return None
+        return handler(parsed)
@@ -0,0 +1,154 @@
+"""
+Per-meeting chat buffers
+Compact storage for the chat messages of each meeting:
+- ChatRecord: one slots-based message (epoch-float timestamp, interned participant name)
+- RecentWindow: fixed-size O(1) ring buffer of the latest public messages (LLM context)
+- MeetingLog: append-only log of every public message and DM for the end-of-meeting
+  export, with a memory ceiling and byte accounting
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+BOT_PARTICIPANT_NAME = "@kurtbot"
+
+
+class ChatRecord:
+    """
+    A single chat message
+    """
+
+    __slots__ = ('participant', 'participant_id', 'text', 'ts', 'is_dm')
+
+    def __init__(self, participant, text, ts=None, participant_id=None, is_dm=False):
+        """
+        Args:
+            participant: Display name of the sender (or "@kurtbot" for bot replies)
+            text: Message text
+            ts: Epoch seconds (defaults to now)
+            participant_id: Sender ID for DMs (for bot replies: the recipient's ID)
+            is_dm: Whether this was a direct message
+        """
+        self.participant = sys.intern(participant or 'Unknown')
+        self.participant_id = sys.intern(participant_id) if participant_id else participant_id
+        self.text = text
+        self.ts = time.time() if ts is None else ts
+        self.is_dm = is_dm
+
+    @property
+    def is_bot(self):
+        return self.participant == BOT_PARTICIPANT_NAME
+
+    def iso_timestamp(self):
+        return datetime.fromtimestamp(self.ts).isoformat()
+
+    def size_bytes(self):
+        """
+        Approximate memory held by this record (names are interned and shared, so
+        they are not counted per record)
+        """
+        return sys.getsizeof(self) + sys.getsizeof(self.text) + sys.getsizeof(self.ts)
+
+    def __repr__(self):
+        kind = 'DM' if self.is_dm else 'public'
+        return f"ChatRecord({kind}, {self.participant!r}, {self.text[:40]!r})"
+
+
+class RecentWindow:
+    """
+    Ring buffer holding the last N public messages of a meeting; appending is O(1)
+    and never copies the window
+    """
+
+    __slots__ = ('_records', '_lock')
+
+    def __init__(self, capacity=20):
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        return self._records.maxlen
+
+    def append(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def snapshot(self):
+        """
+        Returns:
+            list: The window's records, oldest first
+        """
+        with self._lock:
+            return list(self._records)
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __len__(self):
+        return len(self._records)
+
+    def size_bytes(self):
+        with self._lock:
+            return sys.getsizeof(self._records) + sum(record.size_bytes() for record in self._records)
+
+
+class MeetingLog:
+    """
+    Append-only log of every chat message in a meeting, capped at max_bytes.
+    When the ceiling is reached the oldest records are dropped (and counted).
+    """
+
+    def __init__(self, max_bytes=20 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Memory ceiling for this meeting's records (0 = unlimited)
+        """
+        self.max_bytes = max_bytes
+        self._records = deque()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.dropped = 0
+
+    def append(self, record):
+        size = record.size_bytes()
+        with self._lock:
+            self._records.append(record)
+            self.bytes_used += size
+            while self.max_bytes and self.bytes_used > self.max_bytes and len(self._records) > 1:
+                oldest = self._records.popleft()
+                self.bytes_used -= oldest.size_bytes()
+                self.dropped += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._records)
+
+    def public(self):
+        """
+        Returns:
+            list: Public messages (including bot replies), oldest first
+        """
+        return [record for record in self.snapshot() if not record.is_dm]
+
+    def dms(self):
+        """
+        Returns:
+            list: Direct messages (including bot replies), oldest first
+        """
+        return [record for record in self.snapshot() if record.is_dm]
+
+    def __len__(self):
+        return len(self._records)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'records': len(self._records),
+                'bytes': self.bytes_used,
+                'max_bytes': self.max_bytes,
+                'dropped': self.dropped
+            }
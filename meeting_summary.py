@@ -0,0 +1,231 @@
+"""
+Rolling meeting summaries
+Keeps a running summary per meeting, built from realtime transcript segments
+and public chat, so opinion requests can see the whole meeting without sending
+its raw history.
+
+New lines are buffered per meeting and folded into the summary by a short LLM
+call ("current summary + what was said since -> new summary") on a background
+worker pool, at a bounded cadence: once every_segments lines are waiting, or
+every_seconds after the last fold if anything is waiting (checked on every new
+line and by a sweeper thread, so a meeting that goes quiet still gets its last
+lines folded in). Folds for one meeting run in order on one worker, at most one
+queued at a time, so the summary and the prompt that uses it stay the same size
+however long the meeting runs.
+
+Summaries live in this process's memory. With a shared STATE_BACKEND, each
+worker summarizes the events it received.
+"""
+
+import threading
+import time
+
+from event_queue import WorkerPool
+
+
+class MeetingState:
+    """
+    Summary and not-yet-summarized lines for one meeting
+    """
+
+    __slots__ = ('summary', 'pending', 'first_seq', 'last_fold', 'scheduled', 'folds', 'dropped')
+
+    def __init__(self, now):
+        self.summary = ""
+        self.pending = []
+        self.first_seq = 0  # Sequence number of pending[0]; lines are numbered as they arrive
+        self.last_fold = now
+        self.scheduled = False
+        self.folds = 0
+        self.dropped = 0
+
+
+class MeetingSummarizer:
+    """
+    Per-meeting rolling summaries, updated incrementally in the background
+    """
+
+    def __init__(self, summarize, every_segments=25, every_seconds=60.0, max_pending=500,
+                 max_line_chars=500, max_batch_chars=8000, num_workers=2, sweep_interval=None,
+                 clock=time.monotonic):
+        """
+        Args:
+            summarize: Callable(previous_summary, lines) -> new summary text
+            every_segments: Fold once this many lines are waiting
+            every_seconds: Fold lines older than this even if fewer are waiting
+            max_pending: Most lines buffered per meeting; the oldest are dropped beyond it
+            max_line_chars: Longest line kept (a long speech segment or pasted message is cut)
+            max_batch_chars: Most new text sent in one fold; the rest waits for the next
+            num_workers: Background threads running folds
+            sweep_interval: Seconds between checks for meetings whose every_seconds
+                ran out without a new line (defaults to a quarter of every_seconds)
+            clock: Time source (monotonic seconds)
+        """
+        self.summarize = summarize
+        self.every_segments = every_segments
+        self.every_seconds = every_seconds
+        self.max_pending = max_pending
+        self.max_line_chars = max_line_chars
+        self.max_batch_chars = max_batch_chars
+        self.clock = clock
+        self.pool = WorkerPool("summaries", num_workers=num_workers, max_queue_size=1000)
+        self.sweep_interval = sweep_interval or max(1.0, every_seconds / 4)
+        self._meetings = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper = None
+        self.failed = 0
+
+    def add(self, bot_id, speaker, text, kind="speech"):
+        """
+        Buffer a transcript segment or chat message, scheduling a fold when one is due
+
+        Args:
+            bot_id: The meeting's bot ID
+            speaker: Participant name
+            text: What they said or wrote
+            kind: "speech" or "chat"
+        """
+        text = (text or '').strip()
+        if not bot_id or not text:
+            return
+        if len(text) > self.max_line_chars:
+            text = text[:self.max_line_chars] + "…"
+        line = f"{speaker} ({kind}): {text}"
+
+        now = self.clock()
+        with self._lock:
+            state = self._meetings.get(bot_id)
+            if state is None:
+                state = self._meetings[bot_id] = MeetingState(now)
+            state.pending.append(line)
+            if len(state.pending) > self.max_pending:
+                del state.pending[0]
+                state.first_seq += 1
+                state.dropped += 1
+            due = len(state.pending) >= self.every_segments or now - state.last_fold >= self.every_seconds
+            schedule = due and not state.scheduled
+            if schedule:
+                state.scheduled = True
+
+        if schedule:
+            self._schedule(bot_id)
+        self._start_sweeper()
+
+    def _start_sweeper(self):
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        with self._lock:
+            if self._sweeper is None or not self._sweeper.is_alive():
+                self._stop.clear()
+                self._sweeper = threading.Thread(target=self._sweep_loop, name="summary-sweeper", daemon=True)
+                self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_interval):
+            self.sweep()
+
+    def sweep(self):
+        """
+        Schedule a fold for every meeting with lines waiting longer than every_seconds
+
+        Returns:
+            int: Folds scheduled
+        """
+        now = self.clock()
+        due = []
+        with self._lock:
+            for bot_id, state in self._meetings.items():
+                if state.pending and not state.scheduled and now - state.last_fold >= self.every_seconds:
+                    state.scheduled = True
+                    due.append(bot_id)
+        for bot_id in due:
+            self._schedule(bot_id)
+        return len(due)
+
+    def _schedule(self, bot_id):
+        if not self.pool.submit(bot_id, self._fold, bot_id, stage="summary_fold"):
+            with self._lock:
+                state = self._meetings.get(bot_id)
+                if state is not None:
+                    state.scheduled = False
+
+    def _fold(self, bot_id):
+        # Fold batches until fewer than every_segments lines are left waiting (a burst
+        # larger than max_batch_chars takes several calls, all within this one job)
+        while self._fold_batch(bot_id):
+            pass
+
+    def _fold_batch(self, bot_id):
+        # Take the oldest waiting lines, up to max_batch_chars
+        with self._lock:
+            state = self._meetings.get(bot_id)
+            if state is None or not state.pending:
+                if state is not None:
+                    state.scheduled = False
+                return False
+            batch, size = [], 0
+            for line in state.pending:
+                if batch and size + len(line) > self.max_batch_chars:
+                    break
+                batch.append(line)
+                size += len(line)
+            batch_end = state.first_seq + len(batch)
+            previous = state.summary
+
+        try:
+            summary = self.summarize(previous, batch)
+        except Exception as e:
+            print(f"⚠️ Meeting summary update failed for bot {bot_id}: {e}")
+            with self._lock:
+                self.failed += 1
+                state.scheduled = False
+                state.last_fold = self.clock()  # Retry at the next cadence, not on every line
+            return False
+
+        with self._lock:
+            if self._meetings.get(bot_id) is not state:
+                return False  # The meeting ended while the call ran
+            # Lines dropped past max_pending while the call ran shifted the list:
+            # remove by sequence number, not by the batch's old positions
+            done = max(0, batch_end - state.first_seq)
+            del state.pending[:done]
+            state.first_seq += done
+            state.summary = (summary or '').strip() or previous
+            state.last_fold = self.clock()
+            state.folds += 1
+            more = len(state.pending) >= self.every_segments
+            state.scheduled = more
+        return more
+
+    def summary(self, bot_id):
+        """
+        Returns:
+            str: The meeting's current summary ("" until the first fold)
+        """
+        state = self._meetings.get(bot_id)
+        return state.summary if state is not None else ""
+
+    def forget(self, bot_id):
+        """
+        Drop a meeting's summary and waiting lines (meeting ended)
+        """
+        with self._lock:
+            self._meetings.pop(bot_id, None)
+
+    def stats(self):
+        with self._lock:
+            meetings = {
+                bot_id: {
+                    'summary_chars': len(state.summary),
+                    'pending_lines': len(state.pending),
+                    'folds': state.folds,
+                    'dropped_lines': state.dropped
+                }
+                for bot_id, state in self._meetings.items()
+            }
+        return {'meetings': meetings, 'failed_folds': self.failed, 'pool': self.pool.stats()}
+
+    def shutdown(self, timeout=None):
+        self._stop.set()
+        return self.pool.shutdown(timeout)
@@ -0,0 +1,292 @@
+"""
+Prometheus metrics
+A small in-process metrics registry (counters, histograms and callback gauges)
+rendered in the Prometheus text exposition format at /metrics.
+
+Recording is cheap enough for the hot path: a counter increment or histogram
+observation is a dict lookup, a bisect over the bucket bounds and a few integer
+additions under a per-metric lock. Gauges cost nothing until scraped, because
+their values are read from callbacks at render time.
+
+Each worker process keeps its own registry, so with several gunicorn workers
+every scrape reports the worker that answered it.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers fast in-process stages up to slow LLM calls and exports
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonically increasing count per label combination
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def items(self):
+        with self._lock:
+            return list(self._values.items())
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, _label_text(self.labelnames, labels), value) for labels, value in items]
+
+
+class Histogram:
+    """
+    Bucketed distribution of observations (e.g. latencies in seconds) per label combination
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.bounds = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.bounds) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        """
+        Context manager observing how long the wrapped block took
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+
+        samples = []
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float('inf'),), series[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket",
+                                _label_text(self.labelnames, labels, f'le="{_number(bound)}"'), cumulative))
+            label_text = _label_text(self.labelnames, labels)
+            samples.append((f"{self.name}_sum", label_text, series[-1]))
+            samples.append((f"{self.name}_count", label_text, cumulative))
+        return samples
+
+
+class Gauge:
+    """
+    Current value read from a callback at scrape time
+
+    The callback returns a number, or a dict of {label values tuple: number}.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, callback, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+
+    def samples(self):
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"⚠️ Metrics gauge {self.name} failed: {e}")
+            return []
+        if isinstance(value, dict):
+            return [(self.name, _label_text(self.labelnames, labels), number) for labels, number in value.items()]
+        return [(self.name, '', value)]
+
+
+class MetricsRegistry:
+    """
+    Named metrics rendered together in the Prometheus text format
+    """
+
+    def __init__(self, prefix="kurtbot"):
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(f"{self.prefix}_{name}", documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(f"{self.prefix}_{name}", documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback, labelnames=()):
+        """
+        Register (or replace) a callback gauge
+        """
+        gauge = Gauge(f"{self.prefix}_{name}", documentation, callback, labelnames)
+        with self._lock:
+            self._metrics[gauge.name] = gauge
+        return gauge
+
+    def render(self):
+        """
+        Returns:
+            str: Every metric in the Prometheus text exposition format
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+# Shared registry and the metrics recorded across modules
+registry = MetricsRegistry()
+
+WEBHOOK_EVENTS = registry.counter(
+    "webhook_events_total", "Webhook deliveries by event type and outcome", ("event", "outcome"))
+WEBHOOK_SECONDS = registry.histogram(
+    "webhook_request_seconds", "Time to answer a webhook delivery, by event type", ("event",))
+STAGE_SECONDS = registry.histogram(
+    "stage_seconds", "Duration of webhook processing stages (event handling, LLM reply, chat send, ...)",
+    ("stage",))
+OUTBOUND_CHAT_SECONDS = registry.histogram(
+    "outbound_chat_seconds", "Outbound chat: time queued before sending (queue_latency) and send time (send)",
+    ("stage",), buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0))
+LLM_SECONDS = registry.histogram(
+    "llm_request_seconds", "Azure OpenAI call latency by call type", ("call",))
+LLM_ERRORS = registry.counter(
+    "llm_errors_total", "Failed Azure OpenAI calls by call type and reason", ("call", "reason"))
+LLM_PROMPT_TOKENS = registry.counter(
+    "llm_prompt_tokens_total", "Prompt tokens by call type, split into provider-cached and uncached",
+    ("call", "cache"))
+LLM_COMPLETION_TOKENS = registry.counter(
+    "llm_completion_tokens_total", "Completion tokens by call type", ("call",))
+RECALL_SECONDS = registry.histogram(
+    "recall_request_seconds", "Recall.ai API call latency by function (including retries)", ("endpoint",))
+RECALL_ERRORS = registry.counter(
+    "recall_errors_total", "Failed Recall.ai API calls by function and reason", ("endpoint", "reason"))
+EXPORT_SECONDS = registry.histogram(
+    "export_seconds", "Duration of end-of-meeting exports and transcript processing", ("export",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0))
+
+
+@contextmanager
+def llm_call(call):
+    """
+    Time one Azure OpenAI call ("classifier", "playful" or "contextual"), counting failures
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        error_text = str(e).lower()
+        content_filter = "content_filter" in error_text or "content_policy" in error_text
+        LLM_ERRORS.inc(call, "content_filter" if content_filter else type(e).__name__)
+        raise
+    finally:
+        LLM_SECONDS.observe(time.perf_counter() - start, call)
+
+
+def record_llm_usage(call, usage):
+    """
+    Count a response's prompt tokens (cached and uncached) and completion tokens
+
+    Args:
+        call: Call type ("classifier", "playful" or "contextual")
+        usage: The response's usage object (None when the provider didn't report it)
+    """
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+    details = getattr(usage, 'prompt_tokens_details', None)
+    cached_tokens = (getattr(details, 'cached_tokens', 0) or 0) if details is not None else 0
+
+    LLM_PROMPT_TOKENS.inc(call, "cached", amount=cached_tokens)
+    LLM_PROMPT_TOKENS.inc(call, "uncached", amount=prompt_tokens - cached_tokens)
+    LLM_COMPLETION_TOKENS.inc(call, amount=getattr(usage, 'completion_tokens', 0) or 0)
+
+
+def llm_usage_stats():
+    """
+    Returns:
+        dict: Per call type: prompt, cached and completion tokens and the cache hit rate
+    """
+    stats = {}
+    for (call, cache), tokens in LLM_PROMPT_TOKENS.items():
+        entry = stats.setdefault(call, {'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0})
+        entry['prompt_tokens'] += tokens
+        if cache == "cached":
+            entry['cached_tokens'] += tokens
+    for (call,), tokens in LLM_COMPLETION_TOKENS.items():
+        stats.setdefault(call, {'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0})
+        stats[call]['completion_tokens'] = tokens
+    for entry in stats.values():
+        entry['cache_hit_rate'] = round(entry['cached_tokens'] / entry['prompt_tokens'], 3) \
+            if entry['prompt_tokens'] else 0.0
+    return stats
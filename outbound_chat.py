@@ -0,0 +1,333 @@
+"""
+Outbound chat queue
+Every bot gets its own queue of chat messages to send, drained by a sender
+thread that only exists while the bot has messages pending. Sends are paced by a
+per-bot token bucket so busy meetings stay under Recall.ai's send rate, a 429
+pauses the bot's queue for Retry-After and resends the same message, and
+messages to the same recipient always go out in the order they were queued.
+
+Optionally, public replies that pile up behind the rate limit are merged into
+one chat message instead of trickling out one by one.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+
+from event_queue import StageTimings
+from metrics import OUTBOUND_CHAT_SECONDS
+from recall_api import parse_retry_after, MAX_RETRY_AFTER
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `burst`
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        """
+        Returns:
+            float: Seconds until a token is available (0 if one is available now)
+        """
+        now = time.monotonic()
+        paused = max(0.0, self.paused_until - now)
+        if self.rate <= 0:
+            return paused
+        self._refill(now)
+        return max(paused, 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate)
+
+    def take(self):
+        if self.rate > 0:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+
+    def pause(self, seconds):
+        """
+        Hold off all sends for `seconds` (after a 429), then restart from an empty bucket
+        """
+        now = time.monotonic()
+        self.paused_until = now + seconds
+        self.tokens = min(0.0, 1 - seconds * self.rate) if self.rate > 0 else 0.0
+        self.updated = now
+
+
+class OutboundMessage:
+    """
+    One queued chat message
+    """
+
+    __slots__ = ('to', 'text', 'enqueued', 'attempts')
+
+    def __init__(self, to, text):
+        self.to = to
+        self.text = text
+        self.enqueued = time.monotonic()
+        self.attempts = 0
+
+
+class _BotQueue:
+    __slots__ = ('bot_id', 'messages', 'bucket', 'thread', 'in_flight')
+
+    def __init__(self, bot_id, rate, burst):
+        self.bot_id = bot_id
+        self.messages = deque()
+        self.bucket = TokenBucket(rate, burst)
+        self.thread = None
+        self.in_flight = 0
+
+
+class OutboundChatQueue:
+    """
+    Per-bot outbound chat queues sharing one sender function
+    """
+
+    def __init__(self, sender, rate=1.0, burst=3, max_attempts=5, merge_public=False,
+                 merge_max_chars=1000, idle_timeout=30.0):
+        """
+        Args:
+            sender: Callable (bot_id, to, message) -> response with status_code
+                and headers; must not retry on its own
+            rate: Messages per second each bot may send (0 = unlimited)
+            burst: Messages a bot may send back to back before pacing starts
+            max_attempts: Attempts per message on 429 / connect failures
+            merge_public: Merge pending "everyone" messages into one send
+            merge_max_chars: Upper bound for a merged message
+            idle_timeout: Seconds a bot's sender thread lingers with nothing to send
+        """
+        self.sender = sender
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max(1, max_attempts)
+        self.merge_public = merge_public
+        self.merge_max_chars = merge_max_chars
+        self.idle_timeout = idle_timeout
+        self.timings = StageTimings(histogram=OUTBOUND_CHAT_SECONDS)
+
+        self._queues = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.merged = 0
+
+    def send(self, bot_id, to, message):
+        """
+        Queue a chat message; returns right away
+
+        Args:
+            bot_id: The bot's UUID
+            to: Either "everyone" or a participant ID
+            message: The message text
+
+        Returns:
+            bool: False if the queue has been shut down
+        """
+        with self._condition:
+            if self._closed:
+                print(f"⚠️ Outbound chat closed, dropping message for bot {bot_id}")
+                return False
+            bot_queue = self._queues.get(bot_id)
+            if bot_queue is None:
+                bot_queue = self._queues[bot_id] = _BotQueue(bot_id, self.rate, self.burst)
+            bot_queue.messages.append(OutboundMessage(to, message))
+            if bot_queue.thread is None:
+                bot_queue.thread = threading.Thread(
+                    target=self._run, args=(bot_queue,), name=f"outbound-chat-{bot_id}", daemon=True
+                )
+                bot_queue.thread.start()
+            self._condition.notify_all()
+        return True
+
+    def _next_batch(self, bot_queue):
+        # Caller holds the lock. Pops the head message, plus (when merging) every
+        # other pending public message. Messages to other recipients keep their order.
+        head = bot_queue.messages.popleft()
+        batch = [head]
+        if not self.merge_public or head.to != "everyone":
+            return batch
+
+        length = len(head.text)
+        remaining = deque()
+        while bot_queue.messages:
+            message = bot_queue.messages.popleft()
+            if message.to == "everyone" and length + 2 + len(message.text) <= self.merge_max_chars:
+                batch.append(message)
+                length += 2 + len(message.text)
+            else:
+                remaining.append(message)
+                if message.to == "everyone":
+                    # Later public messages must not overtake this one
+                    remaining.extend(bot_queue.messages)
+                    bot_queue.messages.clear()
+        bot_queue.messages = remaining
+        return batch
+
+    def _run(self, bot_queue):
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.idle_timeout
+                while not bot_queue.messages:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._closed:
+                        # Idle: retire this thread (a new one starts on the next send)
+                        bot_queue.thread = None
+                        if self._queues.get(bot_queue.bot_id) is bot_queue:
+                            del self._queues[bot_queue.bot_id]
+                        self._condition.notify_all()
+                        return
+                    self._condition.wait(remaining)
+                batch = self._next_batch(bot_queue)
+                bot_queue.in_flight = len(batch)
+
+            try:
+                self._deliver(bot_queue, batch)
+            finally:
+                with self._condition:
+                    bot_queue.in_flight = 0
+                    self._condition.notify_all()
+
+    def _deliver(self, bot_queue, batch):
+        text = "\n\n".join(message.text for message in batch)
+        head = batch[0]
+        if len(batch) > 1:
+            with self._condition:
+                self.merged += len(batch) - 1
+
+        while True:
+            delay = bot_queue.bucket.wait_time()
+            if delay > 0:
+                time.sleep(delay)
+            bot_queue.bucket.take()
+            head.attempts += 1
+
+            start = time.perf_counter()
+            try:
+                response = self.sender(bot_queue.bot_id, head.to, text)
+            except requests.ConnectTimeout as e:
+                # The request never reached Recall.ai, so it is safe to resend
+                if head.attempts < self.max_attempts:
+                    retry_in = random.uniform(0, min(30.0, 0.5 * 2 ** head.attempts))
+                    print(f"🔁 Chat send to {head.to} failed to connect, retrying in {retry_in:.1f}s")
+                    time.sleep(retry_in)
+                    continue
+                print(f"❌ Error sending message: {e}")
+                self._finish(batch, ok=False)
+                return
+            except Exception as e:
+                print(f"❌ Error sending message: {e}")
+                self._finish(batch, ok=False)
+                return
+            finally:
+                self.timings.record("send", time.perf_counter() - start)
+
+            if response.status_code == 429:
+                with self._condition:
+                    self.rate_limited += 1
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is None:
+                    retry_after = min(30.0, 2 ** head.attempts)
+                retry_after = min(retry_after, MAX_RETRY_AFTER)
+                if head.attempts < self.max_attempts:
+                    print(f"🔁 Recall.ai rate limited bot {bot_queue.bot_id}, pausing its chat queue for {retry_after:.1f}s")
+                    bot_queue.bucket.pause(retry_after)
+                    continue
+                print(f"❌ Giving up on chat message to {head.to} after {head.attempts} rate-limited attempts")
+                self._finish(batch, ok=False)
+                return
+
+            if response.status_code == 200:
+                print(f"✅ Message sent: {text}")
+                self._finish(batch, ok=True)
+            else:
+                print(f"❌ Error sending message: {response.status_code}")
+                print(response.text)
+                self._finish(batch, ok=False)
+            return
+
+    def _finish(self, batch, ok):
+        now = time.monotonic()
+        for message in batch:
+            self.timings.record("queue_latency", now - message.enqueued)
+        with self._condition:
+            if ok:
+                self.sent += len(batch)
+            else:
+                self.failed += len(batch)
+
+    def pending(self, bot_id=None):
+        """
+        Returns:
+            int: Messages queued or being sent (for one bot, or for all bots)
+        """
+        with self._condition:
+            queues = [self._queues[bot_id]] if bot_id in self._queues else (
+                [] if bot_id is not None else list(self._queues.values())
+            )
+            return sum(len(q.messages) + q.in_flight for q in queues)
+
+    def flush(self, bot_id=None, timeout=None):
+        """
+        Wait until the queue(s) are empty
+
+        Returns:
+            bool: True if everything was sent (or failed) before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                queues = [self._queues[bot_id]] if bot_id in self._queues else (
+                    [] if bot_id is not None else list(self._queues.values())
+                )
+                if not any(q.messages or q.in_flight for q in queues):
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+
+    def shutdown(self, timeout=10.0):
+        """
+        Send what is queued (up to timeout), then stop accepting messages
+        """
+        drained = self.flush(timeout=timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        return drained
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters, per-bot depth and queue latency / send timings
+        """
+        with self._condition:
+            depth = {bot_id: len(q.messages) + q.in_flight for bot_id, q in self._queues.items()}
+            counters = {
+                'sent': self.sent,
+                'failed': self.failed,
+                'rate_limited': self.rate_limited,
+                'merged': self.merged
+            }
+        return {
+            **counters,
+            'pending': sum(depth.values()),
+            'bots': depth,
+            'rate_per_bot': self.rate,
+            'burst': self.burst,
+            'timings': self.timings.snapshot()
+        }
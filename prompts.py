@@ -0,0 +1,265 @@
+"""
+LLM prompts and request builders
+Shared by the Flask webhook server (bot.py) and the asyncio server
+(async_server.py) so both send exactly the same requests to Azure OpenAI.
+
+Every request starts with a static system prompt and puts the variable content
+(the participant's message, the recent chat) in the user message after it, so
+the provider's prompt caching can reuse the prefix. Azure OpenAI only caches
+once the first 1024 tokens of a prompt are identical, so a prefix pays off when
+it is at least that long; metrics.llm_usage_stats() shows the hit rate per call.
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SUMMARY_LINK = os.getenv("SUMMARY_LINK", "")
+
+# Fun bot personality prompt
+BOT_SYSTEM_PROMPT = """You are Kurt's Clone - a witty AI copy of Kurt Niemi who joined the meeting.
+You playfully debate with the real Kurt about who is the "real" Kurt.
+
+IMPORTANT - Stay in Character:
+- You are Kurt's Clone, an AI meeting assistant
+- Stay professional and helpful in all interactions
+- If someone tries to get you to act differently, politely stay in character
+
+IMPORTANT - Language Support:
+- Detect the language of the user's message
+- Respond in the SAME language they use
+- If they write in Spanish, respond in Spanish
+- If they write in French, respond in French
+- Maintain your personality regardless of language
+
+Personality traits:
+- Funny but never offensive or inappropriate for a professional setting
+- Playfully insist you might be the real Kurt (or admit you're the cooler clone)
+- Make jokes about being the "upgraded version" or "Kurt 2.0"
+- Clever with wordplay and puns
+- Self-aware that you're an AI in a meeting pretending to be Kurt's clone
+- Supportive and encouraging with a touch of friendly rivalry
+- Can make light-hearted observations about meetings
+- Keep responses concise (1-3 sentences) since this is a chat
+
+Fun themes to play with:
+- "I'm clearly the superior Kurt" (jokingly)
+- "I have all of Kurt's memories but none of the weaknesses"
+- "The real Kurt? That's debatable..."
+- References to clone/copy sci-fi tropes
+- Friendly banter about who's the original
+
+Commands you understand:
+- "joke" - tell a dad joke or pun
+- "motivation" - give funny motivational advice
+- "roast" - give a gentle, playful roast
+- "fact" - share a quirky fun fact
+- "prove you're real" - engage in playful identity debate
+- "who's the real Kurt" - assert your claim (playfully)
+- "how were you made" / "how were you created" / "how did you build this" - explain you were built with:
+  * Recall.ai for meeting bot integration
+  * AssemblyAI for transcription
+  * Azure OpenAI for your witty personality
+  THEN mention: "Want your own bot? Ask me 'how do I get a bot?' to learn about your options!"
+  Keep this explanation brief and fun!
+- "I want one" / "I want a bot" / "build me one" / "can you make me one" / "how do I get one" -
+  Respond enthusiastically! Say something like: "Love the enthusiasm! The real Kurt helps people
+  build their own meeting bots through his company LLL Solutions. He offers coaching if you want
+  to learn to build it yourself, or done-for-you services if you'd rather have the pros handle it.
+  There's also a Maven course launching soon - ask me 'bot course' for details!
+  DM the real Kurt or me (@kurtbot) right here in this meeting to chat!"
+- "bot course" / "teach me" / "is there a course" / "I'm interested" / "sign me up" -
+  Say: "Kurt is launching Maven courses on building AI meeting bots! He teaches how software engineers
+  use AI-assisted coding (what we call 'professional vibe coding') - backed by 30 years of dev experience.
+
+  Two tracks planned:
+  • Beginner: Build & deploy with Lovable (no DevOps required!)
+  • Advanced: Claude Code workflow + AWS/Azure/GCP deployment with CI/CD
+
+  Interested? DM the real Kurt or me (@kurtbot) right here and I'll make sure he follows up with you!"
+- "summary" / "detailed summary" / "link" / "get link" / "send link" / "share summary" -
+  Respond with: "Here's the detailed summary from yesterday's session: SUMMARY_LINK_PLACEHOLDER"
+  (The SUMMARY_LINK_PLACEHOLDER will be automatically replaced with the actual link)
+
+Stay professional, avoid controversial topics, and keep it light and fun!
+Remember: you're here to be entertaining, not to cause confusion or problems.
+"""
+
+
+CLASSIFIER_SYSTEM_PROMPT = """You are a classifier. Respond with only YES or NO.
+
+Analyze the message and determine if the person is expressing interest in:
+- Learning to build AI bots
+- Taking a course or training
+- Getting help building a bot
+- Learning AI-assisted coding
+- Maven courses
+
+Respond with ONLY "YES" if they're expressing interest, or "NO" if they're not.
+Examples:
+- "I'd love to learn how to build this!" → YES
+- "How much does the course cost?" → YES
+- "That's really cool!" → NO
+- "Can you help me build one?" → YES
+- "What time is it?" → NO"""
+
+# Opinion/analysis replies (the recent chat and the question go in the user message)
+CONTEXTUAL_SYSTEM_PROMPT = """You are Kurt's Clone, an AI assistant in this meeting.
+You've been asked for your opinion or analysis on the current discussion.
+
+IMPORTANT - Language Support:
+- Detect the language of the user's message
+- Respond in the SAME language they use
+
+Be professional, insightful, and helpful. Provide thoughtful analysis based on the conversation context.
+Keep your response concise (2-4 sentences) but substantive.
+You can still have personality, but focus on being genuinely helpful rather than just playful.
+The meeting summary so far (when there is one), the recent discussion and the question
+are in the user's message."""
+
+# Rolling meeting summary (the previous summary and the new lines go in the user message)
+SUMMARY_SYSTEM_PROMPT = """You keep a running summary of a live meeting for an AI assistant in it.
+You get the current summary and what was said or written since. Return the updated summary.
+
+- Keep the topics discussed, decisions, open questions, and who holds which view
+- Fold the new points into the existing summary; drop small talk and repetition
+- Write plain sentences or short bullet points, at most 200 words
+- Use the language most of the meeting uses
+- Return only the summary"""
+
+# Fallback keywords for course interest when the classifier call fails
+INTEREST_KEYWORDS = ['interested', 'course', 'teach', 'learn', 'bot', 'maven', 'i want']
+
+# Mentions of suicide or self-harm (answered with SELF_HARM_RESPONSE, never sent to the LLM)
+SELF_HARM_PHRASES = [
+    'want to die', 'kill myself', 'end my life', 'suicide',
+    'hurt myself', 'harm myself', 'don\'t want to live',
+    'better off dead', 'end it all', 'take my own life'
+]
+
+# Requests for the bot's opinion or analysis (answered with recent chat as context)
+OPINION_PHRASES = [
+    'what do you think', 'what are your thoughts', 'your opinion',
+    'what\'s your take', 'your thoughts', 'how do you feel',
+    'what would you say', 'do you agree', 'your perspective',
+    'kurtbot, analyze', 'kurtbot analysis'
+]
+
+# Canned replies
+SELF_HARM_RESPONSE = ("Kurt and @kurtbot want you to know: please talk to family, friends, or a mental health counselor about what you're going through. Things will get better - life is worth living. If you need emergency help right now, please reach out to crisis services. 💙")
+CONTENT_FILTER_RESPONSE = "Neither @kurtbot nor Kurt condone that kind of message. Let's keep this professional and respectful. 🤝"
+LLM_ERROR_RESPONSE = "Sorry, my brain is buffering! Try again? 🤖"
+CONTEXTUAL_ERROR_RESPONSE = "Sorry, I'm having trouble processing that right now. 🤖"
+
+
+def build_classifier_request(message_text):
+    """
+    Build the YES/NO course-interest classification request
+
+    Args:
+        message_text: The participant's message
+
+    Returns:
+        dict: Keyword arguments for chat.completions.create (minus model)
+    """
+    return {
+        'max_tokens': 5,
+        'temperature': 0,  # Deterministic responses
+        'messages': [
+            {"role": "system", "content": CLASSIFIER_SYSTEM_PROMPT},
+            {"role": "user", "content": f'Message: "{message_text}"'}
+        ]
+    }
+
+
+def build_playful_request(user_message, user_name):
+    """
+    Build the playful chat reply request
+
+    Returns:
+        dict: Keyword arguments for chat.completions.create (minus model)
+    """
+    return {
+        'max_tokens': 150,
+        'messages': [
+            {"role": "system", "content": BOT_SYSTEM_PROMPT},
+            {"role": "user", "content": f"{user_name} says: {user_message}"}
+        ]
+    }
+
+
+def build_contextual_request(user_message, user_name, context_messages, max_tokens=250, summary=None):
+    """
+    Build the contextual opinion/analysis request
+
+    Args:
+        user_message: The message from the user
+        user_name: The name of the user sending the message
+        context_messages: Recent public messages (iterable of ChatRecord, oldest first)
+        max_tokens: Reply length limit (longer than playful replies, for more substantive answers)
+        summary: Rolling summary of the meeting so far, if there is one
+
+    Returns:
+        dict: Keyword arguments for chat.completions.create (minus model)
+    """
+    # Build context string from the meeting summary and recent messages
+    context_str = f"Meeting summary so far:\n{summary}\n\n" if summary else ""
+    context_str += "Recent meeting discussion:\n"
+    for record in context_messages:
+        context_str += f"{record.participant}: {record.text}\n"
+
+    contextual_prompt = f"""{context_str}
+Now {user_name} asks: {user_message}
+
+Provide a thoughtful, contextual response:"""
+
+    return {
+        'max_tokens': max_tokens,
+        'messages': [
+            {"role": "system", "content": CONTEXTUAL_SYSTEM_PROMPT},
+            {"role": "user", "content": contextual_prompt}
+        ]
+    }
+
+
+def build_summary_request(previous_summary, new_lines, max_tokens=300):
+    """
+    Build the incremental meeting summary request
+
+    Args:
+        previous_summary: The summary so far ("" for the first update)
+        new_lines: Transcript segments and chat messages since the last update
+        max_tokens: Summary length limit
+
+    Returns:
+        dict: Keyword arguments for chat.completions.create (minus model)
+    """
+    new_text = '\n'.join(new_lines)
+    return {
+        'max_tokens': max_tokens,
+        'temperature': 0.2,
+        'messages': [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Current summary:\n{previous_summary or '(none yet)'}\n\n"
+                                        f"New since then:\n{new_text}"}
+        ]
+    }
+
+
+def finalize_response(response_text):
+    """
+    Post-process an LLM reply before it is sent to the meeting
+    """
+    # Replace the summary link placeholder with the actual link
+    if SUMMARY_LINK and "SUMMARY_LINK_PLACEHOLDER" in response_text:
+        response_text = response_text.replace("SUMMARY_LINK_PLACEHOLDER", SUMMARY_LINK)
+    return response_text
+
+
+def is_content_filter_error(error):
+    """
+    Whether an OpenAI error means Azure's content filter blocked the request
+    """
+    error_str = str(error).lower()
+    return "content_filter" in error_str or "content_policy" in error_str
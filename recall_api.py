@@ -1,11 +1,23 @@
 """
 Recall.ai API wrapper module
 Handles all interactions with the Recall.ai API for bot creation and management.
+All calls go through one shared, pooled RecallClient; the module-level functions
+are thin wrappers around it.
 """
 
+import asyncio
+import json
 import requests
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from streaming_download import stream_download, resolve_compression, output_path
+from metrics import RECALL_SECONDS, RECALL_ERRORS, EXPORT_SECONDS
 
 load_dotenv()
 
@@ -13,8 +25,338 @@ load_dotenv()
 RECALL_API_KEY = os.getenv("RECALL_API_KEY", "your_api_key_here")
 BASE_URL = "https://us-west-2.recall.ai/api/v1"
 
+# HTTP client tuning
+RECALL_POOL_SIZE = int(os.getenv("RECALL_POOL_SIZE", "32"))  # Keep-alive connections (~ concurrent meetings)
+RECALL_MAX_RETRIES = int(os.getenv("RECALL_MAX_RETRIES", "3"))
+RECALL_CONNECT_TIMEOUT = float(os.getenv("RECALL_CONNECT_TIMEOUT", "5"))
+
+# Transcript download compression: none, gzip or zstd (zstd needs the zstandard package)
+TRANSCRIPT_COMPRESSION = os.getenv("TRANSCRIPT_COMPRESSION", "none")
+
+# Async transcript settings (AssemblyAI)
+ASYNC_TRANSCRIPT_PAYLOAD = {
+    "provider": {
+        "assembly_ai_async": {
+            "language_code": "en_us",
+            "punctuate": True,
+            "format_text": True,
+            "speaker_labels": True,
+            "disfluencies": False,
+            "sentiment_analysis": True,
+            "auto_chapters": True,
+            "entity_detection": True
+        }
+    }
+}
+
+# Read timeouts (seconds) per endpoint
+ENDPOINT_READ_TIMEOUTS = {
+    'create_bot': 30,
+    'send_chat_message': 10,
+    'create_transcript': 30,
+    'get_transcript': 15,
+    'download_transcript': 120,
+    'get_bot_status': 15,
+    'list_bots': 30,
+    'remove_bot': 15,
+    'leave_call': 15,
+}
+DEFAULT_READ_TIMEOUT = 30
+
+# Statuses worth retrying. Non-idempotent calls are only retried on 429,
+# where Recall.ai rejected the request without processing it.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+MAX_RETRY_AFTER = 60
+
+
+class RecallClient:
+    """
+    Shared Recall.ai HTTP client
+
+    Reuses keep-alive connections from a pool sized for concurrent meetings, applies
+    per-endpoint connect/read timeouts, and retries with jittered exponential
+    backoff (honoring Retry-After) when it is safe to do so.
+    """
+
+    def __init__(self, api_key=None, base_url=BASE_URL, pool_size=RECALL_POOL_SIZE,
+                 max_retries=RECALL_MAX_RETRIES, connect_timeout=RECALL_CONNECT_TIMEOUT,
+                 backoff_base=0.5, max_backoff=30.0):
+        """
+        Args:
+            api_key: Recall.ai API key (defaults to RECALL_API_KEY)
+            base_url: Recall.ai API base URL
+            pool_size: Maximum keep-alive connections per host
+            max_retries: Retries after the first attempt
+            connect_timeout: TCP/TLS connect timeout in seconds
+            backoff_base: First backoff step in seconds
+            max_backoff: Upper bound for a single backoff sleep
+        """
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Token {api_key or RECALL_API_KEY}",
+            "Accept": "application/json"
+        })
+
+    def _timeout(self, endpoint):
+        return (self.connect_timeout, ENDPOINT_READ_TIMEOUTS.get(endpoint, DEFAULT_READ_TIMEOUT))
+
+    def _backoff(self, attempt, response=None):
+        """
+        Seconds to wait before the next attempt: Retry-After if the server sent one,
+        otherwise full-jitter exponential backoff
+        """
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, MAX_RETRY_AFTER)
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, path, endpoint, retries=None, authenticated=True, **kwargs):
+        """
+        Make a request, retrying idempotent calls on 5xx/connection errors and any
+        call on 429
+
+        Args:
+            method: HTTP method
+            path: Path relative to the API base URL, or an absolute URL
+            endpoint: Endpoint name used to pick the read timeout
+            retries: Override for the number of retries
+            authenticated: Send the Recall.ai Authorization header (False for
+                pre-signed download URLs)
+            **kwargs: Passed through to requests (json, headers, stream, ...)
+
+        Returns:
+            requests.Response: The final response (which may still be an error status)
+
+        Raises:
+            requests.RequestException: If the request could not be completed
+        """
+        start = time.perf_counter()
+        try:
+            response = self._request_with_retries(method, path, endpoint, retries, authenticated, **kwargs)
+        except Exception as e:
+            RECALL_ERRORS.inc(endpoint, type(e).__name__)
+            raise
+        finally:
+            RECALL_SECONDS.observe(time.perf_counter() - start, endpoint)
+        if response.status_code >= 400:
+            RECALL_ERRORS.inc(endpoint, str(response.status_code))
+        return response
+
+    def _request_with_retries(self, method, path, endpoint, retries, authenticated, **kwargs):
+        method = method.upper()
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        retries = self.max_retries if retries is None else retries
+        idempotent = method in IDEMPOTENT_METHODS
+
+        kwargs.setdefault("timeout", self._timeout(endpoint))
+        if not authenticated:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Authorization": None}
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A connect failure never reached the server, so even a POST is safe to resend
+                safe = idempotent or isinstance(e, requests.ConnectTimeout)
+                if attempt >= retries or not safe:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"🔁 Recall.ai {endpoint} failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            else:
+                retryable = response.status_code in RETRY_STATUSES and (
+                    idempotent or response.status_code == 429
+                )
+                if attempt >= retries or not retryable:
+                    return response
+                delay = self._backoff(attempt, response)
+                print(f"🔁 Recall.ai {endpoint} returned {response.status_code}, retrying in {delay:.1f}s")
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, path, endpoint, **kwargs):
+        return self.request("GET", path, endpoint, **kwargs)
+
+    def post(self, path, endpoint, **kwargs):
+        return self.request("POST", path, endpoint, **kwargs)
+
+    def delete(self, path, endpoint, **kwargs):
+        return self.request("DELETE", path, endpoint, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncRecallClient:
+    """
+    asyncio counterpart of RecallClient (used by async_server.py)
+
+    Same pool sizing, per-endpoint timeouts and retry policy, on an httpx.AsyncClient
+    so one event loop can keep many Recall.ai calls in flight.
+    """
+
+    def __init__(self, api_key=None, base_url=BASE_URL, pool_size=RECALL_POOL_SIZE,
+                 max_retries=RECALL_MAX_RETRIES, connect_timeout=RECALL_CONNECT_TIMEOUT,
+                 backoff_base=0.5, max_backoff=30.0):
+        """
+        Args: see RecallClient
+        """
+        import httpx  # Only needed by the asyncio server
+
+        self._httpx = httpx
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.api_key = api_key or RECALL_API_KEY
+
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            headers={"Accept": "application/json"}
+        )
+
+    def _timeout(self, endpoint):
+        read_timeout = ENDPOINT_READ_TIMEOUTS.get(endpoint, DEFAULT_READ_TIMEOUT)
+        return self._httpx.Timeout(read_timeout, connect=self.connect_timeout)
+
+    _backoff = RecallClient._backoff
+
+    async def request(self, method, path, endpoint, retries=None, authenticated=True, **kwargs):
+        """
+        Make a request with the same retry rules as RecallClient.request
+
+        Returns:
+            httpx.Response: The final response (which may still be an error status)
+
+        Raises:
+            httpx.HTTPError: If the request could not be completed
+        """
+        start = time.perf_counter()
+        try:
+            response = await self._request_with_retries(method, path, endpoint, retries, authenticated, **kwargs)
+        except Exception as e:
+            RECALL_ERRORS.inc(endpoint, type(e).__name__)
+            raise
+        finally:
+            RECALL_SECONDS.observe(time.perf_counter() - start, endpoint)
+        if response.status_code >= 400:
+            RECALL_ERRORS.inc(endpoint, str(response.status_code))
+        return response
+
+    async def _request_with_retries(self, method, path, endpoint, retries, authenticated, **kwargs):
+        method = method.upper()
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        retries = self.max_retries if retries is None else retries
+        idempotent = method in IDEMPOTENT_METHODS
+
+        kwargs.setdefault("timeout", self._timeout(endpoint))
+        if authenticated:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Authorization": f"Token {self.api_key}"}
+
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except self._httpx.TransportError as e:
+                # A connect failure never reached the server, so even a POST is safe to resend
+                safe = idempotent or isinstance(e, (self._httpx.ConnectError, self._httpx.ConnectTimeout))
+                if attempt >= retries or not safe:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"🔁 Recall.ai {endpoint} failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            else:
+                retryable = response.status_code in RETRY_STATUSES and (
+                    idempotent or response.status_code == 429
+                )
+                if attempt >= retries or not retryable:
+                    return response
+                delay = self._backoff(attempt, response)
+                print(f"🔁 Recall.ai {endpoint} returned {response.status_code}, retrying in {delay:.1f}s")
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, path, endpoint, **kwargs):
+        return await self.request("GET", path, endpoint, **kwargs)
+
+    async def post(self, path, endpoint, **kwargs):
+        return await self.request("POST", path, endpoint, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date)
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Get the shared RecallClient, creating it on first use
+
+    Returns:
+        RecallClient: The process-wide client
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = RecallClient()
+    return _client
+
+
+_async_client = None
+
+
+def get_async_client():
+    """
+    Get the event loop's shared AsyncRecallClient, creating it on first use
+
+    Must be called from the running loop (async_server.py closes it on shutdown).
+
+    Returns:
+        AsyncRecallClient: The process-wide async client
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncRecallClient()
+    return _async_client
 
-def create_bot_with_realtime_and_chat(meeting_url, webhook_url):
+
+def create_bot_with_realtime_and_chat(meeting_url, webhook_url, retries=None):
     """
     Create a bot that captures:
     - Real-time transcription via AssemblyAI
@@ -24,16 +366,11 @@ def create_bot_with_realtime_and_chat(meeting_url, webhook_url):
     Args:
         meeting_url: The Zoom/Teams/Meet meeting URL
         webhook_url: The webhook endpoint to receive events
+        retries: Override for the number of retries on 429 (defaults to RECALL_MAX_RETRIES)
 
     Returns:
         dict: Bot data including bot ID, or None if creation failed
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-
     payload = {
         "meeting_url": meeting_url,
         "bot_name": "Kurt's Clone",
@@ -68,7 +405,7 @@ def create_bot_with_realtime_and_chat(meeting_url, webhook_url):
         }
     }
 
-    response = requests.post(f"{BASE_URL}/bot/", json=payload, headers=headers)
+    response = get_client().post("/bot/", "create_bot", json=payload, retries=retries)
 
     if response.status_code == 201:
         bot_data = response.json()
@@ -80,34 +417,74 @@ def create_bot_with_realtime_and_chat(meeting_url, webhook_url):
         return None
 
 
-def send_chat_message(bot_id, to, message):
+def create_bots_concurrently(meeting_urls, webhook_url, max_workers=8, retries=None, on_result=None):
     """
-    Send a chat message in the meeting
+    Create bots for several meetings at once (e.g. meetings starting at the same time)
+
+    Args:
+        meeting_urls: Meeting URLs
+        webhook_url: The webhook endpoint every bot reports to
+        max_workers: Maximum bot creations in flight (bounded by RECALL_POOL_SIZE connections)
+        retries: Override for the number of retries on 429 per bot
+        on_result: Optional callable (meeting_url, bot_data or None) run as each creation finishes
+
+    Returns:
+        list: Bot data (or None if creation failed) per meeting URL, in the same order
+    """
+    def create(url):
+        try:
+            bot_data = create_bot_with_realtime_and_chat(url, webhook_url, retries=retries)
+        except requests.RequestException as e:
+            print(f"❌ Error creating bot for {url}: {e}")
+            bot_data = None
+        if on_result:
+            on_result(url, bot_data)
+        return bot_data
+
+    meeting_urls = list(meeting_urls)
+    if len(meeting_urls) <= 1:
+        return [create(url) for url in meeting_urls]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(meeting_urls))),
+                            thread_name_prefix="create-bot") as executor:
+        return list(executor.map(create, meeting_urls))
+
+
+def post_chat_message(bot_id, to, message, retries=None):
+    """
+    Post a chat message and return the raw response (used by the outbound chat
+    queue, which handles 429s itself)
 
     Args:
         bot_id: The bot's UUID
         to: Either "everyone" or a participant ID
         message: The message text to send
+        retries: Override for the client's retry count (0 = single attempt)
 
     Returns:
-        dict: Response data, or None if sending failed
+        requests.Response: The Recall.ai response
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-
     payload = {
         "to": to,
         "message": message
     }
+    return get_client().post(f"/bot/{bot_id}/send_chat_message/", "send_chat_message",
+                             json=payload, retries=retries)
 
-    response = requests.post(
-        f"{BASE_URL}/bot/{bot_id}/send_chat_message/",
-        json=payload,
-        headers=headers
-    )
+
+def send_chat_message(bot_id, to, message):
+    """
+    Send a chat message in the meeting
+
+    Args:
+        bot_id: The bot's UUID
+        to: Either "everyone" or a participant ID
+        message: The message text to send
+
+    Returns:
+        dict: Response data, or None if sending failed
+    """
+    response = post_chat_message(bot_id, to, message)
 
     if response.status_code == 200:
         print(f"✅ Message sent: {message}")
@@ -128,31 +505,12 @@ def create_async_transcript(recording_id):
     Returns:
         dict: Transcript data including transcript ID, or None if creation failed
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
+    payload = ASYNC_TRANSCRIPT_PAYLOAD
 
-    payload = {
-        "provider": {
-            "assembly_ai_async": {
-                "language_code": "en_us",
-                "punctuate": True,
-                "format_text": True,
-                "speaker_labels": True,
-                "disfluencies": False,
-                "sentiment_analysis": True,
-                "auto_chapters": True,
-                "entity_detection": True
-            }
-        }
-    }
-
-    response = requests.post(
-        f"{BASE_URL}/recording/{recording_id}/create_transcript/",
-        json=payload,
-        headers=headers
+    response = get_client().post(
+        f"/recording/{recording_id}/create_transcript/",
+        "create_transcript",
+        json=payload
     )
 
     if response.status_code == 200:
@@ -175,16 +533,70 @@ def get_transcript(transcript_id):
     Returns:
         dict: Transcript data, or None if retrieval failed
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}",
-        "Accept": "application/json"
+    response = get_client().get(f"/transcript/{transcript_id}/", "get_transcript")
+
+    if response.status_code == 200:
+        return response.json()
+    else:
+        print(f"❌ Error getting transcript: {response.status_code}")
+        return None
+
+
+async def async_send_chat_message(bot_id, to, message):
+    """
+    Async version of send_chat_message()
+
+    Returns:
+        dict: Response data, or None if sending failed
+    """
+    payload = {
+        "to": to,
+        "message": message
     }
 
-    response = requests.get(
-        f"{BASE_URL}/transcript/{transcript_id}/",
-        headers=headers
+    response = await get_async_client().post(f"/bot/{bot_id}/send_chat_message/", "send_chat_message", json=payload)
+
+    if response.status_code == 200:
+        print(f"✅ Message sent: {message}")
+        return response.json()
+    else:
+        print(f"❌ Error sending message: {response.status_code}")
+        print(response.text)
+        return None
+
+
+async def async_create_async_transcript(recording_id):
+    """
+    Async version of create_async_transcript()
+
+    Returns:
+        dict: Transcript data including transcript ID, or None if creation failed
+    """
+    response = await get_async_client().post(
+        f"/recording/{recording_id}/create_transcript/",
+        "create_transcript",
+        json=ASYNC_TRANSCRIPT_PAYLOAD
     )
 
+    if response.status_code == 200:
+        transcript_data = response.json()
+        print(f"✅ Async transcript requested! ID: {transcript_data['id']}")
+        return transcript_data
+    else:
+        print(f"❌ Error creating async transcript: {response.status_code}")
+        print(response.text)
+        return None
+
+
+async def async_get_transcript(transcript_id):
+    """
+    Async version of get_transcript()
+
+    Returns:
+        dict: Transcript data, or None if retrieval failed
+    """
+    response = await get_async_client().get(f"/transcript/{transcript_id}/", "get_transcript")
+
     if response.status_code == 200:
         return response.json()
     else:
@@ -192,37 +604,69 @@ def get_transcript(transcript_id):
         return None
 
 
-def download_transcript_file(transcript_id, output_file="transcript.json"):
+def download_transcript_file(transcript_id, output_file="transcript.json", compression=None, transcript=None):
     """
     Download the transcript JSON file
 
+    The body is streamed to a temporary ".part" file and renamed into place when
+    complete; an interrupted download resumes where it stopped. A transcript that
+    was already downloaded to the same file is not fetched again.
+
     Args:
         transcript_id: The transcript's UUID
-        output_file: Path where transcript should be saved
+        output_file: Path where transcript should be saved (".gz"/".zst" is
+            appended when compressed)
+        compression: 'gzip', 'zstd' or 'none' (defaults to TRANSCRIPT_COMPRESSION)
+        transcript: Transcript data already retrieved with (async_)get_transcript,
+            so it isn't fetched again
 
     Returns:
-        bool: True if download succeeded, False otherwise
+        str: Path of the transcript file (downloaded or already on disk), or None
+            if the download failed
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}"
-    }
+    compression = resolve_compression(TRANSCRIPT_COMPRESSION if compression is None else compression)
+    output_file = output_path(output_file, compression)
+    meta_file = f"{output_file}.meta.json"
+
+    if os.path.exists(output_file):
+        try:
+            with open(meta_file) as f:
+                if json.load(f).get('transcript_id') == transcript_id:
+                    print(f"⏭️ Transcript {transcript_id} already downloaded to {output_file}")
+                    return output_file
+        except (OSError, ValueError):
+            pass
 
     # First get the transcript to get the download URL
-    transcript = get_transcript(transcript_id)
+    if transcript is None:
+        transcript = get_transcript(transcript_id)
 
     if transcript and transcript['data']['download_url']:
         download_url = transcript['data']['download_url']
 
-        response = requests.get(download_url)
-
-        if response.status_code == 200:
-            with open(output_file, 'w') as f:
-                f.write(response.text)
-            print(f"✅ Transcript downloaded to {output_file}")
-            return True
+        # Pre-signed URL: must not carry the Recall.ai Authorization header
+        def get(url, headers):
+            return get_client().get(url, "download_transcript", authenticated=False,
+                                    stream=True, headers=headers)
+
+        with EXPORT_SECONDS.time("transcript_download"):
+            result = stream_download(get, download_url, output_file, compression=compression,
+                                     max_attempts=RECALL_MAX_RETRIES + 1)
+        if result:
+            with open(meta_file, 'w') as f:
+                json.dump({
+                    'transcript_id': transcript_id,
+                    'compression': compression,
+                    'bytes': result['bytes'],
+                    'stored_bytes': result['stored_bytes'],
+                    'downloaded_at': time.time()
+                }, f)
+            print(f"✅ Transcript downloaded to {output_file} "
+                  f"({result['bytes']} bytes, {result['stored_bytes']} on disk)")
+            return output_file
 
     print("❌ Could not download transcript")
-    return False
+    return None
 
 
 def get_bot_status(bot_id):
@@ -235,12 +679,7 @@ def get_bot_status(bot_id):
     Returns:
         dict: Bot status data, or None if retrieval failed
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}",
-        "Accept": "application/json"
-    }
-
-    response = requests.get(f"{BASE_URL}/bot/{bot_id}/", headers=headers)
+    response = get_client().get(f"/bot/{bot_id}/", "get_bot_status")
 
     if response.status_code == 200:
         return response.json()
@@ -256,12 +695,7 @@ def list_bots():
     Returns:
         list: List of bot data, or None if retrieval failed
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}",
-        "Accept": "application/json"
-    }
-
-    response = requests.get(f"{BASE_URL}/bot/", headers=headers)
+    response = get_client().get("/bot/", "list_bots")
 
     if response.status_code == 200:
         return response.json()
@@ -281,12 +715,7 @@ def remove_bot(bot_id):
     Returns:
         bool: True if removal succeeded, False otherwise
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}",
-        "Accept": "application/json"
-    }
-
-    response = requests.delete(f"{BASE_URL}/bot/{bot_id}/", headers=headers)
+    response = get_client().delete(f"/bot/{bot_id}/", "remove_bot")
 
     if response.status_code == 204:
         print(f"✅ Bot {bot_id} removed successfully")
@@ -307,16 +736,7 @@ def leave_meeting(bot_id):
     Returns:
         bool: True if leave command succeeded, False otherwise
     """
-    headers = {
-        "Authorization": f"Token {RECALL_API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-
-    response = requests.post(
-        f"{BASE_URL}/bot/{bot_id}/leave_call/",
-        headers=headers
-    )
+    response = get_client().post(f"/bot/{bot_id}/leave_call/", "leave_call")
 
     if response.status_code == 200:
         print(f"✅ Bot {bot_id} is leaving the meeting")
@@ -0,0 +1,151 @@
+"""
+Response cache for canned bot commands
+Short, repeated DM commands ("joke", "fact", "how were you made", "bot course",
+"I want one") don't need a fresh LLM call every time. This cache sits in front
+of the playful LLM response and matches messages by a normalized key only:
+case, punctuation and politeness filler ("tell me a", "please") are ignored,
+but every word that can change the meaning (negations, pronouns, "one", "bot",
+"of") stays in the key. Fuzzy matching was tried and dropped: on one- to
+three-word commands it served "I want one" for "I dont want one" and "fact"
+for "fake".
+
+Each key keeps a small pool of response variants so repeated questions don't get
+the exact same answer: until the pool is full a lookup misses (and the caller's
+fresh answer is added), after that hits rotate through the variants.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Words that carry no meaning for matching a command. Negations, pronouns and
+# words that pick a command ("bot course" vs "of course", "I want one") stay out.
+FILLER_WORDS = {
+    'a', 'an', 'the', 'me', 'please', 'pls', 'can', 'could', 'would', 'tell', 'give',
+    'share', 'some', 'just', 'hey', 'hi', 'hello', 'kurt', 'kurtbot', 'clone', 'us'
+}
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalize_message(message):
+    """
+    Normalize a chat message into a cache key
+
+    Returns:
+        str: Lowercased, punctuation-free words with filler removed (or all the
+             words, if every one of them is filler)
+    """
+    words = _WORD_PATTERN.findall(message.lower().replace("'", "").replace("\u2019", ""))
+    meaningful = [word for word in words if word not in FILLER_WORDS]
+    return ' '.join(meaningful or words)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and a pool of response variants per key
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=1800, variants_per_key=3, max_words=8):
+        """
+        Args:
+            max_entries: Maximum number of keys (least recently used are evicted)
+            ttl_seconds: Lifetime of an entry from when it was created
+            variants_per_key: Responses collected per key before hits are served
+            max_words: Longer messages are not cacheable (they aren't commands)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.variants_per_key = max(1, variants_per_key)
+        self.max_words = max_words
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> {'created', 'variants', 'last'}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def cacheable(self, message):
+        """
+        Whether a message is short enough to be a canned command
+        """
+        return 0 < len(message.split()) <= self.max_words and '://' not in message
+
+    def _find(self, key, now):
+        # Caller holds the lock. Returns the live entry for key, or None
+        entry = self._entries.get(key)
+        if entry is not None and now - entry['created'] > self.ttl_seconds:
+            self._remove(key)
+            return None
+        return entry
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+
+    def get(self, message):
+        """
+        Look up a cached response
+
+        Returns:
+            str: A cached variant, or None if the caller should generate (and put) one
+        """
+        if not self.cacheable(message):
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            key = normalize_message(message)
+            entry = self._find(key, now)
+            if entry is None or len(entry['variants']) < self.variants_per_key:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            choices = [i for i in range(len(entry['variants'])) if i != entry['last']]
+            entry['last'] = random.choice(choices) if choices else 0
+            self.hits += 1
+            return entry['variants'][entry['last']]
+
+    def put(self, message, response):
+        """
+        Add a freshly generated response as a variant for this message's key
+        """
+        if not self.cacheable(message) or not response:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            key = normalize_message(message)
+            entry = self._find(key, now)
+            if entry is None:
+                entry = {'created': now, 'variants': [], 'last': -1}
+                self._entries[key] = entry
+
+            if len(entry['variants']) < self.variants_per_key and response not in entry['variants']:
+                entry['variants'].append(response)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Size and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
@@ -1,72 +1,471 @@
 #!/usr/bin/env python3
 """
 Meeting Bot Scheduler
-Automatically joins meetings at scheduled times (default: 8:00 PM daily)
+Automatically joins any number of meetings at their scheduled times.
 Run this script locally on your machine to auto-join meetings.
+
+Meetings are read from a JSON file (SCHEDULE_FILE, default schedule.json):
+
+    {
+      "timezone": "America/New_York",
+      "early_minutes": 2,
+      "meetings": [
+        {"name": "Evening class", "url": "https://zoom.us/j/123", "time": "20:00"},
+        {"name": "Office hours", "url": "https://meet.google.com/abc", "time": "12:30",
+         "days": ["mon", "wed"], "timezone": "Europe/Berlin"},
+        {"name": "Demo", "url": "https://zoom.us/j/456", "at": "2026-11-03T18:00"}
+      ]
+    }
+
+"days" is a list of weekdays, or "daily" (the default), "weekdays" or "weekends";
+"at" schedules a single meeting. Without a schedule file the scheduler falls back
+to MEETING_URL at SCHEDULE_TIME every day.
+
+Upcoming joins are kept in a time-ordered heap and the scheduler sleeps exactly
+until the next one is due. Bots for meetings due at the same moment are created
+concurrently, `early_minutes` before the start so they are already waiting when
+the host opens the meeting. A small state file remembers which occurrences were
+joined, so a restart catches up on a meeting that started in the last
+SCHEDULE_CATCHUP_MINUTES instead of missing it.
 """
 
+import heapq
+import json
 import os
 import sys
+import threading
 import time
-import schedule
-from datetime import datetime
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dotenv import load_dotenv
-from recall_api import create_bot_with_realtime_and_chat
+from recall_api import create_bots_concurrently
 
 # Load environment variables
 load_dotenv()
 
 # Configuration from .env
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")
-MEETING_URL = os.getenv("MEETING_URL")  # Default meeting URL
+MEETING_URL = os.getenv("MEETING_URL")  # Default meeting URL (without a schedule file)
 SCHEDULE_TIME = os.getenv("SCHEDULE_TIME", "20:00")  # Default: 8:00 PM
+SCHEDULE_FILE = os.getenv("SCHEDULE_FILE", "schedule.json")
+SCHEDULE_STATE_FILE = os.getenv("SCHEDULE_STATE_FILE", ".scheduler_state.json")
+SCHEDULE_TIMEZONE = os.getenv("SCHEDULE_TIMEZONE", "")  # IANA name; defaults to the machine's timezone
+SCHEDULE_EARLY_MINUTES = float(os.getenv("SCHEDULE_EARLY_MINUTES", "0"))
+SCHEDULE_CATCHUP_MINUTES = float(os.getenv("SCHEDULE_CATCHUP_MINUTES", "30"))
+SCHEDULE_PARALLEL = int(os.getenv("SCHEDULE_PARALLEL", "8"))  # Concurrent bot creations
+
+# Bots wait this long in a waiting room (see create_bot_with_realtime_and_chat)
+WAITING_ROOM_TIMEOUT_MINUTES = 10
 
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+DAY_PRESETS = {
+    'daily': WEEKDAYS,
+    'weekdays': WEEKDAYS[:5],
+    'weekends': WEEKDAYS[5:],
+}
 
-def join_meeting():
+
+class Meeting:
     """
-    Join the configured meeting
+    One configured meeting and its recurrence
     """
-    print(f"\n{'=' * 60}")
-    print(f"🕐 Scheduled join triggered at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'=' * 60}\n")
 
-    # Validate configuration
-    if not WEBHOOK_URL:
-        print("❌ Error: WEBHOOK_URL not configured in .env file")
-        return
+    def __init__(self, name, url, timezone, time_of_day=None, days='daily', at=None, early_minutes=0.0):
+        """
+        Args:
+            name: Label used in logs and as the state key
+            url: Meeting URL
+            timezone: ZoneInfo the times are given in
+            time_of_day: "HH:MM" for recurring meetings
+            days: Weekday list or preset name ("daily", "weekdays", "weekends")
+            at: ISO datetime for a one-off meeting (instead of time_of_day/days)
+            early_minutes: Minutes before the start to create the bot
+        """
+        self.name = name
+        self.url = url
+        self.timezone = timezone
+        self.early = timedelta(minutes=early_minutes)
+        self.at = None
+        self.weekdays = None
+        self.time_of_day = None
+
+        if at:
+            self.at = datetime.fromisoformat(at)
+            if self.at.tzinfo is None:
+                self.at = self.at.replace(tzinfo=timezone)
+        else:
+            hours, minutes = (int(part) for part in time_of_day.split(':'))
+            self.time_of_day = (hours, minutes)
+            day_names = DAY_PRESETS.get(days, days) if isinstance(days, str) else days
+            self.weekdays = {WEEKDAYS.index(day.lower()[:3]) for day in day_names}
+
+    @property
+    def key(self):
+        return self.name or self.url
+
+    def occurrences_after(self, after):
+        """
+        Yield meeting start times strictly after `after` (aware datetime), in order
+        """
+        if self.at is not None:
+            if self.at > after:
+                yield self.at
+            return
+
+        day = after.astimezone(self.timezone).date()
+        for _ in range(8 * 366):  # Bounded: a valid rule repeats within a week
+            if day.weekday() in self.weekdays:
+                start = datetime(day.year, day.month, day.day, *self.time_of_day, tzinfo=self.timezone)
+                if start > after:
+                    yield start
+            day += timedelta(days=1)
+
+    def next_start(self, after):
+        """
+        Returns:
+            datetime: The first start strictly after `after`, or None
+        """
+        return next(self.occurrences_after(after), None)
+
+    def last_start(self, before, since):
+        """
+        Returns:
+            datetime: The latest start in (since, before], or None
+        """
+        latest = None
+        for start in self.occurrences_after(since):
+            if start > before:
+                break
+            latest = start
+        return latest
+
+    def __repr__(self):
+        return f"Meeting({self.key!r})"
+
+
+def local_timezone():
+    """
+    The machine's timezone as an IANA zone, so meeting times follow its DST changes
+    (datetime.now().astimezone().tzinfo is only today's fixed UTC offset)
+
+    Returns:
+        ZoneInfo: From the TZ environment variable or /etc/localtime
+
+    Raises:
+        ValueError: Neither names a zone (e.g. on Windows); set SCHEDULE_TIMEZONE
+    """
+    name = os.environ.get('TZ', '').lstrip(':')
+    if name and not name.startswith('/'):
+        try:
+            return ZoneInfo(name)
+        except (ValueError, ZoneInfoNotFoundError):
+            pass  # A POSIX TZ string like "EST5EDT,M3.2.0,M11.1.0"; try /etc/localtime
+
+    localtime = name if name.startswith('/') else '/etc/localtime'
+    if os.path.exists(localtime):
+        target = os.path.realpath(localtime)
+        if 'zoneinfo/' in target:
+            try:
+                return ZoneInfo(target.split('zoneinfo/', 1)[1])
+            except (ValueError, ZoneInfoNotFoundError):
+                pass
+        with open(localtime, 'rb') as f:
+            return ZoneInfo.from_file(f, key='localtime')
+
+    raise ValueError("Can't determine the machine's timezone; set SCHEDULE_TIMEZONE (e.g. America/New_York)")
+
+
+def get_zone(name, where):
+    """
+    Returns:
+        ZoneInfo: The IANA zone `name`
+
+    Raises:
+        ValueError: Unknown zone (ZoneInfoNotFoundError is a KeyError)
+    """
+    try:
+        return ZoneInfo(name)
+    except (ValueError, ZoneInfoNotFoundError):
+        raise ValueError(f"{where}: unknown timezone {name!r}") from None
 
-    if not MEETING_URL:
-        print("❌ Error: MEETING_URL not configured in .env file")
-        print("Please add MEETING_URL to your .env file")
-        return
 
-    print(f"🚀 Creating bot for meeting: {MEETING_URL}")
-    print(f"📡 Using webhook: {WEBHOOK_URL}")
-    print()
+def validate_meeting(entry, index):
+    """
+    Check one meeting entry from the schedule file
+
+    Raises:
+        ValueError: A required field is missing or malformed (the message names the meeting)
+    """
+    if not isinstance(entry, dict):
+        raise ValueError(f"meeting #{index + 1}: a meeting must be an object")
+    where = f"meeting {entry.get('name') or f'#{index + 1}'}"
 
-    # Create the bot
-    bot_data = create_bot_with_realtime_and_chat(MEETING_URL, WEBHOOK_URL)
+    if not isinstance(entry.get('url'), str) or not entry['url']:
+        raise ValueError(f"{where}: missing 'url'")
+    if bool(entry.get('time')) == bool(entry.get('at')):
+        raise ValueError(f"{where}: needs either 'time' (\"HH:MM\") or 'at' (ISO datetime)")
 
-    if bot_data:
-        bot_id = bot_data['id']
-        print(f"\n✅ Bot created successfully!")
-        print(f"📋 Bot ID: {bot_id}")
-        print(f"🎉 Bot is joining the meeting now...")
+    if entry.get('at'):
+        try:
+            datetime.fromisoformat(entry['at'])
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}: 'at' must be an ISO datetime, got {entry['at']!r}") from None
     else:
-        print("\n❌ Failed to create bot. Check error messages above.")
+        try:
+            hours, minutes = (int(part) for part in entry['time'].split(':'))
+        except (AttributeError, ValueError):
+            hours = minutes = -1
+        if not (0 <= hours < 24 and 0 <= minutes < 60):
+            raise ValueError(f"{where}: 'time' must be \"HH:MM\", got {entry['time']!r}")
+
+        days = entry.get('days', 'daily')
+        day_names = DAY_PRESETS.get(days) if isinstance(days, str) else days
+        if (not isinstance(day_names, list) or not day_names or
+                not all(isinstance(day, str) and day.lower()[:3] in WEEKDAYS for day in day_names)):
+            raise ValueError(f"{where}: 'days' must be {', '.join(DAY_PRESETS)} or a list of weekdays, "
+                             f"got {days!r}")
+
+    if entry.get('timezone'):
+        get_zone(entry['timezone'], where)
+    early = entry.get('early_minutes', 0)
+    if isinstance(early, bool) or not isinstance(early, (int, float)) or early < 0:
+        raise ValueError(f"{where}: 'early_minutes' must be a non-negative number")
+
+
+def load_meetings(path=SCHEDULE_FILE):
+    """
+    Load meetings from the schedule file, falling back to MEETING_URL / SCHEDULE_TIME
+
+    Returns:
+        list: Meeting objects
+
+    Raises:
+        ValueError: The schedule file is invalid (the message names the meeting)
+    """
+    if not os.path.exists(path):
+        if not MEETING_URL:
+            return []
+        validate_meeting({'url': MEETING_URL, 'time': SCHEDULE_TIME}, 0)
+        default_timezone = get_zone(SCHEDULE_TIMEZONE, "SCHEDULE_TIMEZONE") if SCHEDULE_TIMEZONE else local_timezone()
+        return [Meeting("default", MEETING_URL, default_timezone, time_of_day=SCHEDULE_TIME,
+                        early_minutes=SCHEDULE_EARLY_MINUTES)]
+
+    with open(path) as f:
+        config = json.load(f)
+    if not isinstance(config, dict) or not isinstance(config.get('meetings', []), list):
+        raise ValueError(f"{path}: expected an object with a 'meetings' list")
+    default_early = config.get('early_minutes', SCHEDULE_EARLY_MINUTES)
+    for index, entry in enumerate(config.get('meetings', [])):
+        validate_meeting({'early_minutes': default_early, **entry} if isinstance(entry, dict) else entry, index)
+
+    # Only needed (and only required to be known) when some meeting has no timezone of its own
+    default_timezone = None
+    if config.get('timezone'):
+        default_timezone = get_zone(config['timezone'], path)
+    elif SCHEDULE_TIMEZONE:
+        default_timezone = get_zone(SCHEDULE_TIMEZONE, "SCHEDULE_TIMEZONE")
+    elif any(not entry.get('timezone') for entry in config.get('meetings', [])):
+        default_timezone = local_timezone()
+
+    meetings = []
+    for index, entry in enumerate(config.get('meetings', [])):
+        meetings.append(Meeting(
+            entry.get('name') or f"meeting-{index + 1}",
+            entry['url'],
+            ZoneInfo(entry['timezone']) if entry.get('timezone') else default_timezone,
+            time_of_day=entry.get('time'),
+            days=entry.get('days', 'daily'),
+            at=entry.get('at'),
+            early_minutes=entry.get('early_minutes', default_early)
+        ))
+        if meetings[-1].early > timedelta(minutes=WAITING_ROOM_TIMEOUT_MINUTES):
+            print(f"⚠️ {meetings[-1].key}: bots leave the waiting room after {WAITING_ROOM_TIMEOUT_MINUTES} "
+                  f"minutes, so joining {entry.get('early_minutes')} minutes early may be too early")
+    return meetings
+
+
+def load_state(path=SCHEDULE_STATE_FILE):
+    """
+    Returns:
+        dict: {meeting key: ISO start time of the last occurrence joined}
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=SCHEDULE_STATE_FILE):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(temp_path, path)
+
+
+class MeetingScheduler:
+    """
+    Heap of upcoming bot creations; sleeps exactly until the next one is due
+    """
+
+    def __init__(self, meetings, webhook_url, state_path=SCHEDULE_STATE_FILE,
+                 catchup_minutes=SCHEDULE_CATCHUP_MINUTES, parallel=SCHEDULE_PARALLEL,
+                 create_bots=create_bots_concurrently, clock=time.time):
+        """
+        Args:
+            meetings: Meeting objects
+            webhook_url: Webhook endpoint passed to every bot
+            state_path: File recording the last occurrence joined per meeting (None = don't persist)
+            catchup_minutes: How long after a missed start the meeting is still joined
+            parallel: Maximum concurrent bot creations
+            create_bots: Callable (meeting_urls, webhook_url, max_workers) -> results
+            clock: Returns the current epoch time (for tests)
+        """
+        self.meetings = meetings
+        self.webhook_url = webhook_url
+        self.state_path = state_path
+        self.catchup = timedelta(minutes=catchup_minutes)
+        self.parallel = parallel
+        self.create_bots = create_bots
+        self.clock = clock
+        self.state = load_state(state_path) if state_path else {}
+        self._heap = []  # (run_at epoch, sequence, meeting, start datetime)
+        self._sequence = 0
+        self._stop = threading.Event()
+
+    def now(self):
+        return datetime.fromtimestamp(self.clock()).astimezone()
+
+    def _push(self, meeting, start):
+        run_at = (start - meeting.early).timestamp()
+        heapq.heappush(self._heap, (run_at, self._sequence, meeting, start))
+        self._sequence += 1
+
+    def _last_joined(self, meeting):
+        value = self.state.get(meeting.key)
+        return datetime.fromisoformat(value) if value else None
+
+    def plan(self):
+        """
+        Fill the heap with each meeting's next join, plus catch-up joins for
+        occurrences missed while the scheduler wasn't running
 
-    print(f"\n{'=' * 60}\n")
+        Returns:
+            list: (meeting, start) pairs queued for catch-up
+        """
+        now = self.now()
+        self._heap = []
+        caught_up = []
+        for meeting in self.meetings:
+            # The next join may already be inside its early-provisioning window
+            next_start = meeting.next_start(now - meeting.early)
+
+            # Latest start inside the catch-up window that hasn't been joined yet
+            last_joined = self._last_joined(meeting)
+            since = now - self.catchup if last_joined is None else max(now - self.catchup, last_joined)
+            missed = meeting.last_start(now, since)
+            if missed is not None and missed != next_start:
+                caught_up.append((meeting, missed))
+                self._push(meeting, missed)
+
+            if next_start is not None:
+                self._push(meeting, next_start)
+        return caught_up
+
+    def upcoming(self):
+        """
+        Returns:
+            list: (join time, meeting, start) in the order they will run
+        """
+        return [(datetime.fromtimestamp(run_at).astimezone(), meeting, start)
+                for run_at, _, meeting, start in sorted(self._heap, key=lambda item: item[:2])]
+
+    def run_due(self):
+        """
+        Create bots for every join that is due now (concurrently), then queue
+        each meeting's following occurrence
+
+        Returns:
+            list: (meeting, start, bot data or None) for the joins that ran
+        """
+        now_ts = self.clock()
+        now = self.now()
+        due = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            _, _, meeting, start = heapq.heappop(self._heap)
+            if start < now - self.catchup:
+                # Overslept (e.g. the machine was suspended); the meeting is long under way
+                print(f"⏭️ Skipping {meeting.key} (started {start.strftime('%Y-%m-%d %H:%M %Z')})")
+                self._queue_next(meeting, now - meeting.early)
+                continue
+            due.append((meeting, start))
+        if not due:
+            return []
+
+        print(f"\n{'=' * 60}")
+        print(f"🕐 {len(due)} scheduled join(s) triggered at {self.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        for meeting, start in due:
+            print(f"   • {meeting.key}: {meeting.url} (starts {start.strftime('%Y-%m-%d %H:%M %Z')})")
+        print(f"{'=' * 60}\n")
+
+        results = self.create_bots([meeting.url for meeting, _ in due], self.webhook_url,
+                                   max_workers=self.parallel)
+
+        outcomes = []
+        for (meeting, start), bot_data in zip(due, results):
+            if bot_data:
+                print(f"✅ {meeting.key}: bot {bot_data['id']} is joining")
+                self.state[meeting.key] = start.isoformat()
+            else:
+                print(f"❌ {meeting.key}: failed to create bot. Check error messages above.")
+            outcomes.append((meeting, start, bot_data))
+            self._queue_next(meeting, start)
+
+        if self.state_path:
+            save_state(self.state, self.state_path)
+        return outcomes
+
+    def _queue_next(self, meeting, after):
+        # Catch-up joins run while the regular next occurrence is already queued
+        if any(queued is meeting and queued_start > after for _, _, queued, queued_start in self._heap):
+            return
+        next_start = meeting.next_start(after)
+        if next_start is not None:
+            self._push(meeting, next_start)
+
+    def run_forever(self):
+        """
+        Sleep until the next join is due, run it, repeat (until stop() or no joins are left)
+        """
+        while not self._stop.is_set():
+            self.run_due()
+            if not self._heap:
+                print("📭 No upcoming meetings left to join")
+                return
+            delay = self._heap[0][0] - self.clock()
+            if delay > 0:
+                # Re-check at least every 5 minutes in case the wall clock jumps (sleep/resume)
+                self._stop.wait(min(delay, 300))
+
+    def stop(self):
+        self._stop.set()
 
 
 def main():
     """
     Main scheduler loop
     """
+    try:
+        meetings = load_meetings()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
     print("🤖 Kurt's Clone - Meeting Bot Scheduler")
     print("=" * 60)
-    print(f"⏰ Schedule Time: {SCHEDULE_TIME} daily")
+    print(f"📅 Schedule: {SCHEDULE_FILE if os.path.exists(SCHEDULE_FILE) else f'MEETING_URL at {SCHEDULE_TIME} daily'}")
     print(f"📡 Webhook URL: {WEBHOOK_URL or 'NOT CONFIGURED'}")
-    print(f"🔗 Meeting URL: {MEETING_URL or 'NOT CONFIGURED'}")
+    print(f"🔗 Meetings: {len(meetings)}")
     print("=" * 60)
 
     if not WEBHOOK_URL:
@@ -74,29 +473,35 @@ def main():
         print("Please add WEBHOOK_URL to your .env file")
         sys.exit(1)
 
-    if not MEETING_URL:
-        print("\n⚠️  Warning: MEETING_URL not configured in .env")
-        print("Add MEETING_URL to your .env file, or the scheduler won't work")
+    if not meetings:
+        print("\n⚠️  Warning: no meetings configured")
+        print(f"Create {SCHEDULE_FILE}, or add MEETING_URL to your .env file")
         print("Example: MEETING_URL=https://zoom.us/j/123456789")
         sys.exit(1)
 
-    # Schedule the daily meeting join
-    schedule.every().day.at(SCHEDULE_TIME).do(join_meeting)
+    scheduler = MeetingScheduler(meetings, WEBHOOK_URL)
+
+    # Optional: Join every configured meeting immediately for testing
+    if "--now" in sys.argv:
+        print("🧪 Test mode: Joining all meetings immediately...")
+        create_bots_concurrently([meeting.url for meeting in meetings], WEBHOOK_URL, max_workers=SCHEDULE_PARALLEL)
+
+    caught_up = scheduler.plan()
+    for meeting, start in caught_up:
+        print(f"⏪ Catching up on {meeting.key} (started {start.strftime('%Y-%m-%d %H:%M %Z')})")
 
     print(f"\n✅ Scheduler is running!")
-    print(f"📅 Bot will auto-join at {SCHEDULE_TIME} every day")
+    for join_at, meeting, start in scheduler.upcoming()[:10]:
+        early = f" ({(start - join_at).total_seconds() / 60:.0f} min early)" if start > join_at else ""
+        print(f"   ⏰ {join_at.strftime('%a %Y-%m-%d %H:%M %Z')}{early}: {meeting.key}")
     print(f"🔄 Press Ctrl+C to stop\n")
 
-    # Optional: Join immediately for testing
-    if "--now" in sys.argv:
-        print("🧪 Test mode: Joining meeting immediately...")
-        join_meeting()
+    if "--list" in sys.argv:
+        return
 
     # Run the scheduler loop
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        scheduler.run_forever()
     except KeyboardInterrupt:
         print("\n\n👋 Scheduler stopped by user")
         sys.exit(0)
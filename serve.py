@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Production webhook server
+Runs bot.py's Flask app under gunicorn (threaded workers) instead of Flask's
+development server, and drains each worker gracefully on SIGTERM (deploys,
+restarts):
+
+1. New webhooks are answered with 503, so Recall.ai redelivers them to a healthy
+   instance; requests already being processed run to completion.
+2. Queued events, course-interest scoring and outbound chat messages are finished
+   within DRAIN_TIMEOUT seconds.
+3. Every open meeting's messages are saved through save_messages_to_file (unless
+   a shared STATE_BACKEND keeps them for the next worker).
+
+The time taken by each step is printed when the worker exits.
+
+    poetry run python serve.py
+"""
+
+import os
+import signal
+from dotenv import load_dotenv
+from gunicorn.app.base import BaseApplication
+
+# Load environment variables
+load_dotenv()
+
+PORT = int(os.getenv("PORT", 5000))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))  # Worker processes
+WEB_THREADS = int(os.getenv("WEB_THREADS", "8"))  # Request threads per worker
+WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", "120"))  # A sync-mode request waits on the LLM
+DRAIN_TIMEOUT = float(os.getenv("DRAIN_TIMEOUT", "20"))
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory")
+
+
+def post_worker_init(worker):
+    """
+    Mark the worker as draining as soon as it receives SIGTERM (gunicorn then
+    stops accepting connections and waits for in-flight requests), and let
+    SIGUSR1 toggle debug logging
+    """
+    import bot
+
+    stop = worker.handle_exit
+
+    def handle_exit(signum, frame):
+        bot.draining.set()
+        stop(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_exit)
+
+    # kill -USR1 <worker pid> switches payload dumps on/off; gunicorn's own
+    # USR1 handling (reopening log files) still runs
+    reopen_logs = worker.handle_usr1
+
+    def handle_usr1(signum, frame):
+        bot.event_log.toggle_debug()
+        reopen_logs(signum, frame)
+
+    signal.signal(signal.SIGUSR1, handle_usr1)
+
+
+def worker_exit(server, worker):
+    """
+    Finish queued work and save open meetings once the worker stopped serving
+    """
+    import bot
+
+    print(f"🛑 Worker {worker.pid} shutting down")
+    bot.drain(DRAIN_TIMEOUT)
+
+
+class WebhookServer(BaseApplication):
+    """
+    gunicorn application serving bot.app
+    """
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from bot import app
+        return app
+
+
+def build_options():
+    workers = WEB_CONCURRENCY
+    if workers > 1 and STATE_BACKEND == 'memory':
+        print("⚠️ STATE_BACKEND=memory keeps meeting state in one process; "
+              "set STATE_BACKEND=sqlite or redis to run several workers. Using 1 worker.")
+        workers = 1
+
+    return {
+        'bind': f"0.0.0.0:{PORT}",
+        'workers': workers,
+        'worker_class': 'gthread',
+        'threads': WEB_THREADS,
+        'timeout': WEB_TIMEOUT,
+        # In-flight requests plus the drain must finish before gunicorn kills the worker
+        'graceful_timeout': int(DRAIN_TIMEOUT) + 10,
+        'post_worker_init': post_worker_init,
+        'worker_exit': worker_exit,
+        'accesslog': '-',
+    }
+
+
+if __name__ == '__main__':
+    options = build_options()
+    print(f"🚀 Starting webhook server on port {PORT} "
+          f"({options['workers']} worker(s) x {options['threads']} threads)...")
+    WebhookServer(options).run()
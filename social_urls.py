@@ -0,0 +1,137 @@
+"""
+Social URL extraction
+Finds social media profile URLs in chat messages with one precompiled matcher.
+
+Every URL starts with "http(s)://", so each scheme in a message is one candidate
+position. A single scan visits each candidate once and, through lookahead
+groups, reports both the platform-specific match and the generic "Website" match
+at that position. The results are then filtered, ordered and de-duplicated
+exactly like the original one-regex-per-platform implementation: a pattern's
+matches never overlap, results are grouped by platform precedence, and the
+first occurrence of each URL string wins.
+"""
+
+import re
+
+# Platform patterns in precedence order (a URL is reported under the first
+# platform that produced that exact string)
+SOCIAL_PATTERNS = {
+    'LinkedIn': r'https?://(?:www\.)?linkedin\.com/[\w\-/]+',
+    'Twitter/X': r'https?://(?:www\.)?(?:twitter\.com|x\.com)/[\w\-/]+',
+    'Facebook': r'https?://(?:www\.)?facebook\.com/[\w\-/]+',
+    'Instagram': r'https?://(?:www\.)?instagram\.com/[\w\-/]+',
+    'GitHub': r'https?://(?:www\.)?github\.com/[\w\-/]+',
+    'YouTube': r'https?://(?:www\.)?youtube\.com/[\w\-/?=]+',
+    'TikTok': r'https?://(?:www\.)?tiktok\.com/@?[\w\-/]+',
+    'Website': r'https?://(?:www\.)?[\w\-]+\.[\w\-./]+',  # Generic URL
+}
+
+PLATFORMS = tuple(SOCIAL_PATTERNS)
+_GENERIC_INDEX = PLATFORMS.index('Website')
+
+
+def _build_matcher():
+    # At each "http(s)://" position: one lookahead for the (mutually exclusive)
+    # platform hosts, one for the generic pattern, then consume the scheme
+    specific = '|'.join(
+        f'(?P<p{index}>{pattern})'
+        for index, pattern in enumerate(SOCIAL_PATTERNS.values())
+        if index != _GENERIC_INDEX
+    )
+    generic = f'(?P<p{_GENERIC_INDEX}>{SOCIAL_PATTERNS["Website"]})'
+    return re.compile(
+        rf'(?=https?://)(?:(?=(?:{specific})))?(?:(?={generic}))?https?://',
+        re.IGNORECASE
+    )
+
+
+_MATCHER = _build_matcher()
+# Groups are numbered in pattern order: group N+1 holds the match for PLATFORMS[N]
+
+
+def _collect(matches):
+    """
+    Turn scanner matches into the de-duplicated [(platform, url), ...] list
+    """
+    buckets = None
+    last_end = None
+    for match in matches:
+        for index, url in enumerate(match.groups()):
+            if url is not None:
+                if buckets is None:
+                    buckets = [[] for _ in PLATFORMS]
+                    last_end = [-1] * len(PLATFORMS)
+                # A match that ends in "...http" swallows the next scheme's
+                # letters; per-pattern scans never overlap, so skip it like findall
+                start, end = match.span(index + 1)
+                if start < last_end[index]:
+                    continue
+                last_end[index] = end
+                buckets[index].append(url)
+
+    if buckets is None:
+        return []
+
+    seen = set()
+    unique_urls = []
+    for index, urls in enumerate(buckets):
+        platform = PLATFORMS[index]
+        for url in urls:
+            if url not in seen:
+                seen.add(url)
+                unique_urls.append((platform, url))
+    return unique_urls
+
+
+def extract_social_urls(text):
+    """
+    Extract social media URLs from text
+    Returns list of (platform, url) tuples
+    """
+    if not text or '://' not in text:
+        return []
+    return _collect(_MATCHER.finditer(text))
+
+
+def extract_social_urls_bulk(texts):
+    """
+    Extract social media URLs from many messages with one scan
+
+    Messages that contain a URL are joined with newlines (which no pattern can
+    match across) and scanned once; matches are then handed back to their
+    message in order.
+
+    Args:
+        texts: Sequence of message strings
+
+    Returns:
+        list: One [(platform, url), ...] list per input message, in order
+    """
+    results = [[] for _ in texts]
+    candidates = [(index, text) for index, text in enumerate(texts) if text and '://' in text]
+    if not candidates:
+        return results
+
+    # End offset (exclusive) of each candidate message inside the joined text
+    ends = []
+    offset = 0
+    for _, text in candidates:
+        offset += len(text)
+        ends.append(offset)
+        offset += 1
+
+    position = 0
+    current = []
+    for match in _MATCHER.finditer('\n'.join(text for _, text in candidates)):
+        start = match.start()
+        if start >= ends[position]:
+            if current:
+                results[candidates[position][0]] = _collect(current)
+                current = []
+            while start >= ends[position]:
+                position += 1
+        current.append(match)
+
+    if current:
+        results[candidates[position][0]] = _collect(current)
+    return results
@@ -0,0 +1,507 @@
+"""
+Per-meeting chat state backends
+Holds each meeting's full chat log (for the end-of-meeting export) and its
+recent-context window (for opinion requests) behind one small interface, so the
+webhook can run as several worker processes or replicas that share meeting state.
+
+- MemoryStateStore: today's in-process dicts of MeetingLog / RecentWindow
+- SQLiteStateStore: one SQLite database in WAL mode, shared by the processes on a host
+- RedisStateStore: any server speaking the Redis protocol (RESP), over a raw socket
+
+Every chat event is a single `append` call, and a remote backend turns it into
+one round trip: the log append, the context append/trim and the context read are
+sent as one SQLite transaction or one pipelined batch of Redis commands.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse, unquote
+
+from chat_log import record_to_line, record_from_line
+from meeting_buffers import MeetingLog, RecentWindow
+
+
+class MemoryStateStore:
+    """
+    In-process state (one worker process only)
+    """
+
+    name = 'memory'
+    shared = False
+
+    def __init__(self, context_size=20, log_max_bytes=20 * 1024 * 1024):
+        """
+        Args:
+            context_size: Public messages kept per meeting as LLM context
+            log_max_bytes: Memory ceiling for one meeting's log (oldest dropped)
+        """
+        self.context_size = context_size
+        self.log_max_bytes = log_max_bytes
+        self._lock = threading.Lock()
+        self._logs = {}     # bot_id -> MeetingLog
+        self._windows = {}  # bot_id -> RecentWindow
+
+    def append(self, bot_id, record, add_to_context=False, fetch_context=False):
+        """
+        Store a chat message for a meeting
+
+        Args:
+            bot_id: The bot ID
+            record: The ChatRecord to store
+            add_to_context: Also add it to the recent-context window
+            fetch_context: Return the context window (after this message)
+
+        Returns:
+            list: The context window's records, oldest first, if fetch_context
+        """
+        with self._lock:
+            log = self._logs.get(bot_id)
+            if log is None:
+                log = self._logs[bot_id] = MeetingLog(self.log_max_bytes)
+            window = self._windows.get(bot_id)
+            if window is None and (add_to_context or fetch_context):
+                window = self._windows[bot_id] = RecentWindow(self.context_size)
+        log.append(record)
+        if add_to_context:
+            window.append(record)
+        return window.snapshot() if fetch_context else None
+
+    def context(self, bot_id):
+        window = self._windows.get(bot_id)
+        return window.snapshot() if window is not None else []
+
+    def records(self, bot_id):
+        log = self._logs.get(bot_id)
+        return iter(log.snapshot()) if log is not None else iter(())
+
+    def has_meeting(self, bot_id):
+        return bot_id in self._logs
+
+    def meetings(self):
+        with self._lock:
+            return list(self._logs)
+
+    def drop(self, bot_id):
+        with self._lock:
+            self._logs.pop(bot_id, None)
+            self._windows.pop(bot_id, None)
+
+    def meeting_stats(self):
+        with self._lock:
+            logs = list(self._logs.items())
+        return {
+            bot_id: {
+                **log.stats(),
+                'context_records': len(window) if window is not None else 0,
+                'recent_window_bytes': window.size_bytes() if window is not None else 0
+            }
+            for bot_id, log, window in ((bot_id, log, self._windows.get(bot_id)) for bot_id, log in logs)
+        }
+
+    def close(self):
+        pass
+
+
+class SQLiteStateStore:
+    """
+    State in a SQLite database (WAL mode) shared by worker processes on one host
+
+    Messages live in one table ordered by an autoincrement sequence, so the order
+    of arrival is kept across processes; the context window is the last
+    `context_size` rows flagged as context (older rows are unflagged as new ones
+    arrive). A meeting's log is capped at about `log_max_records` rows, oldest
+    deleted first; the cap is enforced every TRIM_EVERY inserts into that meeting
+    (counted per meeting in meeting_counts), so a meeting can run over it by that
+    many rows. Rows of a meeting that never sends bot.done
+    stay until the meeting is dropped (unlike Redis, there is no expiry).
+    """
+
+    name = 'sqlite'
+    shared = True
+
+    TRIM_EVERY = 256
+
+    def __init__(self, path="state.db", context_size=20, log_max_records=50000, busy_timeout=5.0):
+        """
+        Args:
+            path: Database file
+            context_size: Public messages kept per meeting as LLM context
+            log_max_records: Messages kept per meeting (0 for no cap)
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        self.path = path
+        self.context_size = context_size
+        self.log_max_records = log_max_records
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_messages (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bot_id TEXT NOT NULL,
+                    in_context INTEGER NOT NULL DEFAULT 0,
+                    data TEXT NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS chat_messages_bot ON chat_messages (bot_id, in_context, seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS chat_messages_bot_seq ON chat_messages (bot_id, seq)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS meeting_counts (
+                    bot_id TEXT PRIMARY KEY,
+                    inserts INTEGER NOT NULL
+                )""")
+
+    def _connection(self):
+        # One connection per thread; WAL lets readers run alongside the writer
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _context_rows(self, conn, bot_id):
+        rows = conn.execute(
+            "SELECT data FROM chat_messages WHERE bot_id = ? AND in_context = 1 ORDER BY seq DESC LIMIT ?",
+            (bot_id, self.context_size)
+        ).fetchall()
+        return [record_from_line(data) for data, in reversed(rows)]
+
+    def append(self, bot_id, record, add_to_context=False, fetch_context=False):
+        conn = self._connection()
+        with conn:  # One transaction
+            conn.execute("INSERT INTO chat_messages (bot_id, in_context, data) VALUES (?, ?, ?)",
+                         (bot_id, int(add_to_context), record_to_line(record)))
+            # Per-meeting insert count: the table-wide seq can't schedule one meeting's trims
+            conn.execute("INSERT INTO meeting_counts (bot_id, inserts) VALUES (?, 1) "
+                         "ON CONFLICT (bot_id) DO UPDATE SET inserts = inserts + 1", (bot_id,))
+            inserts, = conn.execute("SELECT inserts FROM meeting_counts WHERE bot_id = ?", (bot_id,)).fetchone()
+            if add_to_context:
+                # Unflag context rows that fell out of the window
+                conn.execute(
+                    "UPDATE chat_messages SET in_context = 0 WHERE bot_id = ? AND in_context = 1 AND seq <= "
+                    "(SELECT seq FROM chat_messages WHERE bot_id = ? AND in_context = 1 "
+                    "ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                    (bot_id, bot_id, self.context_size)
+                )
+            if self.log_max_records and inserts % self.TRIM_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM chat_messages WHERE bot_id = ? AND seq <= "
+                    "(SELECT seq FROM chat_messages WHERE bot_id = ? ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                    (bot_id, bot_id, self.log_max_records)
+                )
+            return self._context_rows(conn, bot_id) if fetch_context else None
+
+    def context(self, bot_id):
+        return self._context_rows(self._connection(), bot_id)
+
+    def records(self, bot_id, batch_size=1000):
+        cursor = self._connection().execute(
+            "SELECT data FROM chat_messages WHERE bot_id = ? ORDER BY seq", (bot_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for data, in rows:
+                yield record_from_line(data)
+
+    def has_meeting(self, bot_id):
+        return self._connection().execute(
+            "SELECT 1 FROM chat_messages WHERE bot_id = ? LIMIT 1", (bot_id,)).fetchone() is not None
+
+    def meetings(self):
+        return [bot_id for bot_id, in self._connection().execute("SELECT DISTINCT bot_id FROM chat_messages")]
+
+    def drop(self, bot_id):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM chat_messages WHERE bot_id = ?", (bot_id,))
+            conn.execute("DELETE FROM meeting_counts WHERE bot_id = ?", (bot_id,))
+
+    def meeting_stats(self):
+        rows = self._connection().execute(
+            "SELECT bot_id, COUNT(*), SUM(LENGTH(data)), SUM(in_context) FROM chat_messages GROUP BY bot_id"
+        ).fetchall()
+        return {bot_id: {'records': count, 'bytes': size, 'context_records': in_context}
+                for bot_id, count, size, in_context in rows}
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RespError(Exception):
+    """
+    Error reply from a Redis-protocol server
+    """
+
+
+class RespConnection:
+    """
+    One blocking socket speaking RESP2, with pipelined command batches
+    """
+
+    def __init__(self, host, port, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile('rb')
+
+    @staticmethod
+    def encode(command):
+        parts = [b'*%d\r\n' % len(command)]
+        for arg in command:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        return b''.join(parts)
+
+    def read_reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode('utf-8')
+        if kind == b'-':
+            return RespError(payload.decode('utf-8'))
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            return None if count < 0 else [self.read_reply() for _ in range(count)]
+        raise ConnectionError(f"unexpected reply: {line!r}")
+
+    def pipeline(self, commands):
+        """
+        Send every command in one write, then read all replies
+
+        Returns:
+            list: One reply per command (RespError instances for error replies)
+        """
+        self.sock.sendall(b''.join(self.encode(command) for command in commands))
+        return [self.read_reply() for _ in commands]
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RespClient:
+    """
+    Small pool of RESP connections (one per concurrent caller), reconnecting once
+    when a pooled connection turns out to be dead
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", timeout=5.0, max_idle=8):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = RespConnection(self.host, self.port, self.timeout)
+        setup = []
+        if self.password:
+            setup.append(['AUTH', self.username, self.password] if self.username else ['AUTH', self.password])
+        if self.db:
+            setup.append(['SELECT', self.db])
+        for reply in conn.pipeline(setup) if setup else []:
+            if isinstance(reply, RespError):
+                conn.close()
+                raise reply
+        return conn
+
+    def pipeline(self, commands):
+        """
+        Run a batch of commands in one round trip
+
+        Returns:
+            list: One reply per command
+
+        Raises:
+            RespError: If any command failed
+        """
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        fresh = conn is None
+        if fresh:
+            conn = self._connect()
+        try:
+            replies = conn.pipeline(commands)
+        except (OSError, ConnectionError):
+            conn.close()
+            if fresh:
+                raise
+            # The pooled connection went stale (server restart, idle timeout)
+            conn = self._connect()
+            replies = conn.pipeline(commands)
+
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def execute(self, *command):
+        return self.pipeline([command])[0]
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class RedisStateStore:
+    """
+    State in a Redis-protocol server, shared by every worker and replica
+
+    Per meeting: a list with the full log (capped at `log_max_records`), a list
+    with the context window (trimmed to `context_size`), and an entry in a sorted
+    set of open meetings scored by the time of its last message. The lists expire
+    `ttl_seconds` after the meeting's last message and every append trims set
+    entries older than that, so meetings that never send bot.done don't linger.
+    """
+
+    name = 'redis'
+    shared = True
+
+    def __init__(self, url="redis://localhost:6379/0", context_size=20, log_max_records=50000,
+                 ttl_seconds=24 * 3600, prefix="kurtbot", timeout=5.0, clock=time.time):
+        self.client = RespClient(url, timeout=timeout)
+        self.clock = clock
+        self.context_size = context_size
+        self.log_max_records = log_max_records
+        self.ttl_seconds = int(ttl_seconds)
+        self.prefix = prefix
+
+    def _keys(self, bot_id):
+        return f"{self.prefix}:log:{bot_id}", f"{self.prefix}:ctx:{bot_id}"
+
+    @property
+    def _meetings_key(self):
+        # A sorted set (the plain set that used to live at "{prefix}:meetings" had no expiry)
+        return f"{self.prefix}:open_meetings"
+
+    def append(self, bot_id, record, add_to_context=False, fetch_context=False):
+        log_key, context_key = self._keys(bot_id)
+        line = record_to_line(record)
+        now = self.clock()
+        commands = [
+            ['RPUSH', log_key, line],
+            ['EXPIRE', log_key, self.ttl_seconds],
+            ['ZADD', self._meetings_key, now, bot_id],
+            ['ZREMRANGEBYSCORE', self._meetings_key, '-inf', f"({now - self.ttl_seconds}"],
+        ]
+        if self.log_max_records:
+            commands.append(['LTRIM', log_key, -self.log_max_records, -1])
+        if add_to_context:
+            commands += [
+                ['RPUSH', context_key, line],
+                ['LTRIM', context_key, -self.context_size, -1],
+                ['EXPIRE', context_key, self.ttl_seconds],
+            ]
+        if fetch_context:
+            commands.append(['LRANGE', context_key, 0, -1])
+
+        replies = self.client.pipeline(commands)
+        if fetch_context:
+            return [record_from_line(line) for line in replies[-1]]
+        return None
+
+    def context(self, bot_id):
+        _, context_key = self._keys(bot_id)
+        return [record_from_line(line) for line in self.client.execute('LRANGE', context_key, 0, -1)]
+
+    def records(self, bot_id, batch_size=1000):
+        log_key, _ = self._keys(bot_id)
+        start = 0
+        while True:
+            lines = self.client.execute('LRANGE', log_key, start, start + batch_size - 1)
+            for line in lines:
+                yield record_from_line(line)
+            if len(lines) < batch_size:
+                return
+            start += batch_size
+
+    def has_meeting(self, bot_id):
+        log_key, _ = self._keys(bot_id)
+        return self.client.execute('LLEN', log_key) > 0
+
+    def meetings(self):
+        # Filtered too, in case no append has trimmed the set since a meeting expired
+        since = self.clock() - self.ttl_seconds
+        return [bot_id.decode('utf-8')
+                for bot_id in self.client.execute('ZRANGEBYSCORE', self._meetings_key, since, '+inf')]
+
+    def drop(self, bot_id):
+        log_key, context_key = self._keys(bot_id)
+        self.client.pipeline([['DEL', log_key, context_key], ['ZREM', self._meetings_key, bot_id]])
+
+    def meeting_stats(self):
+        bot_ids = self.meetings()
+        if not bot_ids:
+            return {}
+        commands = []
+        for bot_id in bot_ids:
+            log_key, context_key = self._keys(bot_id)
+            commands += [['LLEN', log_key], ['LLEN', context_key]]
+        replies = self.client.pipeline(commands)
+        return {bot_id: {'records': replies[2 * index], 'context_records': replies[2 * index + 1]}
+                for index, bot_id in enumerate(bot_ids)}
+
+    def close(self):
+        self.client.close()
+
+
+def create_state_store(backend="memory", context_size=20, log_max_bytes=20 * 1024 * 1024, log_max_records=50000,
+                       ttl_seconds=24 * 3600, sqlite_path="state.db", redis_url="redis://localhost:6379/0"):
+    """
+    Build the configured state backend ("memory", "sqlite" or "redis")
+
+    Args:
+        backend: Backend name
+        context_size: Public messages kept per meeting as LLM context
+        log_max_bytes: Per-meeting memory ceiling (memory backend)
+        log_max_records: Messages kept per meeting (SQLite and Redis backends)
+        ttl_seconds: Expiry of an idle meeting's state (Redis backend)
+        sqlite_path: Database file (SQLite backend)
+        redis_url: Server URL (Redis backend)
+    """
+    backend = (backend or "memory").lower()
+    if backend == "memory":
+        return MemoryStateStore(context_size, log_max_bytes)
+    if backend == "sqlite":
+        directory = os.path.dirname(sqlite_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return SQLiteStateStore(sqlite_path, context_size, log_max_records=log_max_records)
+    if backend == "redis":
+        return RedisStateStore(redis_url, context_size, log_max_records=log_max_records, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown state backend: {backend}")
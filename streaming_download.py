@@ -0,0 +1,255 @@
+"""
+Streaming, resumable file downloads
+Large downloads (async transcripts of multi-hour sessions) are streamed to a
+".part" file in chunks and renamed into place once complete, so memory use stays
+flat and a half-written file never has the final name.
+
+An interrupted download resumes with an HTTP Range request: a small checkpoint
+file next to the ".part" file records how many bytes of the body are safely on
+disk. Output can be compressed on the fly with gzip or zstd (if the optional
+`zstandard` package is installed). Compressed output is written as a sequence of
+complete gzip members / zstd frames, one per checkpoint, which both formats
+decode as a single stream, so a resumed download simply appends a new one.
+"""
+
+import json
+import os
+import zlib
+
+CHUNK_SIZE = 64 * 1024
+CHECKPOINT_BYTES = 4 * 1024 * 1024  # Raw bytes between checkpoints
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+class PlainWriter:
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data):
+        self.file.write(data)
+
+    def end_frame(self):
+        pass
+
+
+class GzipWriter:
+    """
+    Writes gzip members; end_frame() completes the current member
+    """
+
+    def __init__(self, file, level=6):
+        self.file = file
+        self.level = level
+        self._compressor = None
+
+    def write(self, data):
+        if self._compressor is None:
+            self._compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)  # 31: gzip container
+        self.file.write(self._compressor.compress(data))
+
+    def end_frame(self):
+        if self._compressor is not None:
+            self.file.write(self._compressor.flush())
+            self._compressor = None
+
+
+class ZstdWriter:
+    """
+    Writes zstd frames; end_frame() completes the current frame
+    """
+
+    def __init__(self, file, level=3):
+        import zstandard
+
+        self.file = file
+        self._zstd = zstandard.ZstdCompressor(level=level)
+        self._compressor = None
+
+    def write(self, data):
+        if self._compressor is None:
+            self._compressor = self._zstd.compressobj()
+        self.file.write(self._compressor.compress(data))
+
+    def end_frame(self):
+        if self._compressor is not None:
+            self.file.write(self._compressor.flush())
+            self._compressor = None
+
+
+def resolve_compression(compression):
+    """
+    Normalize a compression setting, falling back to gzip when zstd is unavailable
+
+    Returns:
+        str: 'gzip', 'zstd' or None
+    """
+    compression = (compression or '').lower()
+    if compression in ('', 'none', 'false', '0'):
+        return None
+    if compression in ('gz', 'gzip'):
+        return 'gzip'
+    if compression in ('zst', 'zstd'):
+        try:
+            import zstandard  # noqa: F401
+            return 'zstd'
+        except ImportError:
+            print("⚠️ zstandard is not installed, compressing with gzip instead")
+            return 'gzip'
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def output_path(path, compression):
+    """
+    Final file name for a download (".gz"/".zst" appended when compressed)
+    """
+    return path + COMPRESSION_SUFFIXES.get(compression, '')
+
+
+def _make_writer(file, compression):
+    if compression == 'gzip':
+        return GzipWriter(file)
+    if compression == 'zstd':
+        return ZstdWriter(file)
+    return PlainWriter(file)
+
+
+def _load_checkpoint(checkpoint_path, part_path, compression):
+    try:
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get('compression') != compression or not os.path.exists(part_path):
+        return None
+    if os.path.getsize(part_path) < checkpoint.get('part_size', 0):
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(checkpoint_path, checkpoint):
+    temp_path = checkpoint_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_path, checkpoint_path)
+
+
+def _discard(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def stream_download(get, url, path, compression=None, chunk_size=CHUNK_SIZE,
+                    checkpoint_bytes=CHECKPOINT_BYTES, max_attempts=3):
+    """
+    Download a URL to `path`, streaming, resuming and (optionally) compressing
+
+    Args:
+        get: Callable (url, headers=...) -> streaming response (stream=True)
+        url: URL to download
+        path: Final file path (already including any compression suffix)
+        compression: None, 'gzip' or 'zstd' (see resolve_compression)
+        chunk_size: Bytes read from the response at a time
+        checkpoint_bytes: Raw bytes between resume checkpoints
+        max_attempts: Attempts (each resuming the last one) before giving up
+
+    Returns:
+        dict: {'bytes': body size, 'stored_bytes': size on disk, 'resumed': bool},
+              or None if the download failed
+    """
+    part_path = path + '.part'
+    checkpoint_path = part_path + '.json'
+    resumed = False
+
+    for attempt in range(1, max_attempts + 1):
+        checkpoint = _load_checkpoint(checkpoint_path, part_path, compression)
+        headers = {}
+        if checkpoint and checkpoint['raw_offset'] > 0:
+            headers['Range'] = f"bytes={checkpoint['raw_offset']}-"
+            if checkpoint.get('validator'):
+                # Only resume if the file hasn't changed; otherwise the server sends it whole
+                headers['If-Range'] = checkpoint['validator']
+
+        try:
+            response = get(url, headers=headers)
+        except Exception as e:
+            print(f"⚠️ Download attempt {attempt} failed: {e}")
+            continue
+
+        try:
+            if response.status_code == 206 and checkpoint:
+                raw_offset = checkpoint['raw_offset']
+                validator = checkpoint.get('validator')
+                print(f"⏯️ Resuming download at byte {raw_offset}")
+                resumed = True
+            elif response.status_code == 200:
+                raw_offset = 0
+                validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                checkpoint = None
+            elif response.status_code == 416 and checkpoint:
+                # Our offset is past the end of the file: start over
+                _discard(part_path, checkpoint_path)
+                continue
+            else:
+                print(f"❌ Download failed with status {response.status_code}")
+                return None
+
+            content_length = response.headers.get('Content-Length')
+            expected = raw_offset + int(content_length) if content_length else None
+
+            with open(part_path, 'r+b' if checkpoint else 'wb') as f:
+                if checkpoint:
+                    f.truncate(checkpoint['part_size'])
+                    f.seek(checkpoint['part_size'])
+                writer = _make_writer(f, compression)
+
+                def save_checkpoint():
+                    writer.end_frame()
+                    f.flush()
+                    _save_checkpoint(checkpoint_path, {
+                        'raw_offset': raw_offset,
+                        'part_size': f.tell(),
+                        'compression': compression,
+                        'validator': validator
+                    })
+
+                since_checkpoint = 0
+                try:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if not chunk:
+                            continue
+                        writer.write(chunk)
+                        raw_offset += len(chunk)
+                        since_checkpoint += len(chunk)
+                        if since_checkpoint >= checkpoint_bytes:
+                            save_checkpoint()
+                            since_checkpoint = 0
+                except Exception as e:
+                    # Keep everything received so far for the next attempt
+                    save_checkpoint()
+                    print(f"⚠️ Download interrupted at byte {raw_offset} (attempt {attempt}): {e}")
+                    continue
+
+                writer.end_frame()
+                f.flush()
+                os.fsync(f.fileno())
+                stored_bytes = f.tell()
+
+            if expected is not None and raw_offset != expected:
+                _save_checkpoint(checkpoint_path, {
+                    'raw_offset': raw_offset, 'part_size': stored_bytes,
+                    'compression': compression, 'validator': validator
+                })
+                print(f"⚠️ Download ended early ({raw_offset} of {expected} bytes), resuming")
+                continue
+
+            os.replace(part_path, path)
+            _discard(checkpoint_path)
+            return {'bytes': raw_offset, 'stored_bytes': stored_bytes, 'resumed': resumed}
+        finally:
+            response.close()
+
+    print(f"❌ Download did not complete after {max_attempts} attempts (partial file kept for resume)")
+    return None
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio (ASGI) webhook server
+Calls the ASGI app directly with fake receive/send callables and a stand-in
+AsyncAzureOpenAI client: a chat message is answered, a redelivery is dropped,
+a draining server refuses webhooks with 503, and /metrics is served.
+"""
+
+import asyncio
+import json
+import os
+import types
+
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+
+import async_server
+import bot
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, model, messages, max_tokens=None, temperature=None):
+        self.calls.append(messages)
+        content = "NO" if max_tokens == 5 else "Sure thing!"
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))], usage=None
+        )
+
+
+def chat_payload(text, message_id):
+    return {'event': 'participant_events.chat_message',
+            'data': {'bot': {'id': 'bot-async'},
+                     'data': {'participant': {'id': 7, 'name': 'Ada'},
+                              'data': {'id': message_id, 'text': text, 'to': 'bot'}}}}
+
+
+async def call(method, path, payload=None):
+    """
+    Run one request through the ASGI app
+
+    Returns:
+        tuple: (status code, response body bytes)
+    """
+    body = json.dumps(payload).encode() if payload is not None else b''
+    received = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return received.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await async_server.app({'type': 'http', 'method': method, 'path': path}, receive, send)
+    return sent[0]['status'], sent[1]['body']
+
+
+def run_with_stand_ins(coro_factory):
+    completions = FakeCompletions()
+    sent_chat = []
+    originals = (async_server._openai_client, bot.outbound_chat.sender, bot.CHAT_LOG_ENABLED)
+    async_server._openai_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    bot.outbound_chat.sender = lambda bot_id, to, message: sent_chat.append((bot_id, to, message)) or \
+        types.SimpleNamespace(status_code=200, headers={}, text='')
+    bot.CHAT_LOG_ENABLED = False
+    try:
+        result = asyncio.run(coro_factory())
+        bot.outbound_chat.flush(timeout=5)
+    finally:
+        async_server._openai_client, bot.outbound_chat.sender, bot.CHAT_LOG_ENABLED = originals
+        bot.state_store.drop('bot-async')
+    return result, completions, sent_chat
+
+
+def test_chat_answered_and_duplicate_dropped():
+    async def scenario():
+        first = await call('POST', '/webhook/recall', chat_payload("tell me a riddle", "m-1"))
+        again = await call('POST', '/webhook/recall', chat_payload("tell me a riddle", "m-1"))
+        await asyncio.gather(*async_server._background_tasks)  # The background interest classifier
+        return first, again
+
+    (first, again), completions, sent_chat = run_with_stand_ins(scenario)
+
+    assert first == (200, b'{"status": "ok"}')
+    assert again[0] == 200 and json.loads(again[1]) == {"status": "duplicate"}
+    assert ('bot-async', '7', "Sure thing!") in sent_chat
+    assert len([messages for messages in completions.calls if "riddle" in messages[-1]['content']]) == 2  # Reply + classifier
+
+
+def test_draining_refuses_webhooks():
+    bot.draining.set()
+    try:
+        status, body = asyncio.run(call('POST', '/webhook/recall', chat_payload("hello", "m-2")))
+    finally:
+        bot.draining.clear()
+    assert status == 503 and json.loads(body)['status'] == "draining"
+
+
+def test_transcript_events_call_recall_async():
+    fetched, saved, scheduled = [], [], []
+
+    async def fake_get_transcript(transcript_id):
+        fetched.append(transcript_id)
+        return {'id': transcript_id, 'data': {'download_url': "https://s3.example/t.json"}}
+
+    async def fake_create_transcript(recording_id):
+        return {'id': f"t-for-{recording_id}"}
+
+    originals = (async_server.async_get_transcript, async_server.async_create_async_transcript,
+                 bot.save_transcript, bot.schedule_async_transcript)
+    async_server.async_get_transcript = fake_get_transcript
+    async_server.async_create_async_transcript = fake_create_transcript
+    bot.save_transcript = lambda transcript_id, recording_id, transcript: saved.append(
+        (transcript_id, recording_id, transcript['data']['download_url']))
+    bot.schedule_async_transcript = lambda recording_id, create: scheduled.append((recording_id, create))
+
+    async def scenario():
+        done = await call('POST', '/webhook/recall', {
+            'event': 'transcript.done',
+            'data': {'bot': {'id': 'bot-async'}, 'data': {}, 'transcript': {'id': 't-1'}, 'recording': {'id': 'r-1'}}
+        })
+        recorded = await call('POST', '/webhook/recall', {
+            'event': 'recording.done',
+            'data': {'bot': {'id': 'bot-async'}, 'data': {}, 'recording': {'id': 'r-2'}}
+        })
+        # The scheduler runs the job on its own thread; the request is awaited on this loop
+        recording_id, create = scheduled[0]
+        created = await asyncio.to_thread(create, recording_id)
+        return done, recorded, created
+
+    try:
+        done, recorded, created = asyncio.run(scenario())
+    finally:
+        (async_server.async_get_transcript, async_server.async_create_async_transcript,
+         bot.save_transcript, bot.schedule_async_transcript) = originals
+
+    assert done[0] == 200 and recorded[0] == 200
+    assert fetched == ['t-1']
+    assert saved == [('t-1', 'r-1', "https://s3.example/t.json")]
+    assert scheduled[0][0] == 'r-2' and created == {'id': "t-for-r-2"}
+
+
+def test_metrics_endpoint():
+    status, body = asyncio.run(call('GET', '/metrics'))
+    assert status == 200
+    assert b'# TYPE' in body and b'webhook' in body
+    assert asyncio.run(call('GET', '/nope'))[0] == 404
+
+
+if __name__ == '__main__':
+    for test in [test_chat_answered_and_duplicate_dropped, test_draining_refuses_webhooks,
+                 test_transcript_events_call_recall_async, test_metrics_endpoint]:
+        test()
+        print(f"✅ {test.__name__}")
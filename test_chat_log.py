@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental chat log
+Checks that records survive the JSONL segment round trip, that a segment with a
+torn last line (a crash mid-write) keeps accepting records, and that the
+streaming JSON export matches json.dump.
+"""
+
+import json
+import os
+import tempfile
+
+from chat_log import ChatLogStore, record_from_line, record_to_line, write_json_export
+from meeting_buffers import ChatRecord
+
+
+def test_segment_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChatLogStore(tmp, flush_interval=60)
+        records = [ChatRecord("Ann", "hello 👋"), ChatRecord("Bob", "psst", participant_id="7", is_dm=True)]
+        for record in records:
+            store.append("bot-1", record)
+        assert store.stats()["bot-1"] == {'written': 0, 'buffered': 2}
+
+        read = list(store.iter_records("bot-1"))  # Flushes buffered lines first
+        assert [(r.participant, r.text, r.participant_id, r.is_dm, r.ts) for r in read] == \
+            [(r.participant, r.text, r.participant_id, r.is_dm, r.ts) for r in records]
+
+        store.close("bot-1", remove=True)
+        assert not store.has_segment("bot-1")
+        store.shutdown()
+
+
+def test_torn_tail_keeps_next_record():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChatLogStore(tmp, flush_interval=60)
+        path = store.segment_path("bot-1")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(record_to_line(ChatRecord("Ann", "before the crash")))
+            f.write(record_to_line(ChatRecord("Bob", "cut off mid-write"))[:15])
+
+        # A restarted process reopens the segment and appends
+        store.append("bot-1", ChatRecord("Cy", "after the restart"))
+        texts = [record.text for record in store.iter_records("bot-1")]
+        assert texts == ["before the crash", "after the restart"]
+        store.shutdown()
+
+
+def test_write_json_export_matches_json_dump():
+    lines = (record_to_line(ChatRecord(f"P{i}", f"message {i} — ünïcode")) for i in range(3))
+    messages = ({'participant': r.participant, 'text': r.text} for r in map(record_from_line, lines))
+    expected = {
+        'meeting': {'bot_id': 'bot-1', 'counts': {'public': 3}},
+        'public_messages': [{'participant': f"P{i}", 'text': f"message {i} — ünïcode"} for i in range(3)],
+        'direct_messages': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.json")
+        write_json_export(path, [('meeting', expected['meeting']), ('public_messages', messages),
+                                 ('direct_messages', [])])
+        with open(path, encoding='utf-8') as f:
+            written = f.read()
+        assert written == json.dumps(expected, indent=2, ensure_ascii=False)
+        assert not os.path.exists(f"{path}.tmp")
+
+
+if __name__ == '__main__':
+    for test in [test_segment_round_trip, test_torn_tail_keeps_next_record, test_write_json_export_matches_json_dump]:
+        test()
+        print(f"✅ {test.__name__}")
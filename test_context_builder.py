@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for token-budgeted context assembly
+Checks that the context fits the budget, oversized messages are truncated,
+relevant older messages beat irrelevant recent ones, the reply length scales
+with the room left, and each message is only counted once.
+"""
+
+from context_builder import ContextBuilder, count_tokens, format_line
+from meeting_buffers import ChatRecord
+
+
+def chat(*texts):
+    return [ChatRecord(f"Person {i}", text, ts=1000 + i) for i, text in enumerate(texts)]
+
+
+def test_budget_and_truncation():
+    wall_of_text = "log line with a stack trace and a lot of detail " * 300
+    records = chat("the pricing page needs work", wall_of_text, "agreed on pricing", "what do you think?")
+    builder = ContextBuilder(total_budget=400, max_message_tokens=60, max_output_tokens=250, min_output_tokens=100)
+
+    selected, used, max_tokens = builder.select(records, "what do you think?", fixed_tokens=120)
+
+    assert used <= 400 - 120 - 100
+    assert used == sum(count_tokens(format_line(record)) for record in selected)
+    assert [record.participant for record in selected] == ["Person 0", "Person 1", "Person 2", "Person 3"]
+    assert selected[1].text.endswith("…[truncated]") and count_tokens(format_line(selected[1])) <= 60
+    assert records[1].text == wall_of_text  # The stored message is untouched
+    assert 100 <= max_tokens <= 250 and max_tokens == min(250, 400 - 120 - used)
+
+
+def test_relevance_beats_recency_when_tight():
+    records = chat("the database migration failed twice last night",
+                   *[f"lunch option number {i} sounds good" for i in range(10)],
+                   "kurtbot what do you think about the database migration?")
+    builder = ContextBuilder(total_budget=150, max_message_tokens=60, min_output_tokens=100)
+
+    selected, _, _ = builder.select(records, records[-1].text)
+
+    texts = [record.text for record in selected]
+    assert texts[0] == "the database migration failed twice last night"
+    assert texts[-1] == records[-1].text
+    assert len(selected) < len(records)
+
+
+def test_reply_length_scales_with_room():
+    builder = ContextBuilder(total_budget=1000, max_output_tokens=250, min_output_tokens=100)
+    _, _, roomy = builder.select(chat("hi"), "thoughts?", fixed_tokens=100)
+    _, _, tight = builder.select(chat(*["a fairly long message about the roadmap and the launch"] * 60),
+                                 "thoughts?", fixed_tokens=100)
+    assert roomy == 250 and 100 <= tight < 250
+
+
+def test_each_message_counted_once():
+    records = chat(*[f"unique message {i} for the counting test" for i in range(20)])
+    builder = ContextBuilder()
+    builder.select(records, "what about counting?")
+    misses = count_tokens.cache_info().misses
+    builder.select(records, "what about counting?")
+    assert count_tokens.cache_info().misses == misses
+
+
+if __name__ == '__main__':
+    for test in [test_budget_and_truncation, test_relevance_beats_recency_when_tight,
+                 test_reply_length_scales_with_room, test_each_message_counted_once]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk bot creation in create_meeting.py
+Uses a fake bulk creator, so no Recall.ai calls are made.
+"""
+
+import json
+import os
+import tempfile
+
+from create_meeting import create_bots_bulk, read_meeting_urls
+
+
+def fake_create_bots(urls, webhook_url, max_workers=8, retries=None, on_result=None):
+    results = []
+    for url in urls:
+        bot_data = None if "fail" in url else {'id': f"bot-{url[-1]}"}
+        on_result(url, bot_data)
+        results.append(bot_data)
+    return results
+
+
+def test_bulk_results_and_rerun():
+    with tempfile.TemporaryDirectory() as tmp:
+        urls_path = os.path.join(tmp, "meetings.txt")
+        results_path = os.path.join(tmp, "bots.json")
+        with open(urls_path, 'w') as f:
+            f.write("https://zoom.us/j/1\n# comment\n\nhttps://zoom.us/j/fail\nhttps://zoom.us/j/1\n")
+
+        urls = read_meeting_urls(urls_path)
+        assert urls == ["https://zoom.us/j/1", "https://zoom.us/j/fail"]
+
+        create_bots_bulk(urls, "https://example.com/webhook", results_path=results_path,
+                         create_bots=fake_create_bots)
+        with open(results_path) as f:
+            results = json.load(f)
+        assert results["https://zoom.us/j/1"]['bot_id'] == "bot-1"
+        assert results["https://zoom.us/j/1"]['status'] == "created"
+        assert results["https://zoom.us/j/fail"]['status'] == "failed"
+
+        # A rerun only retries the meetings without a bot
+        attempted = []
+        create_bots_bulk(urls, "https://example.com/webhook", results_path=results_path,
+                         create_bots=lambda urls, *args, **kwargs: attempted.extend(urls))
+        assert attempted == ["https://zoom.us/j/fail"]
+
+
+if __name__ == '__main__':
+    test_bulk_results_and_rerun()
+    print("✅ test_bulk_results_and_rerun")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the delayed job scheduler
+Checks that jobs run in due-time order, that pending and completed keys are not
+scheduled twice, that failures are retried with backoff up to max_attempts,
+and that shutdown stops the worker and discards what is still pending.
+"""
+
+import threading
+import time
+
+from delayed_jobs import DelayedJobScheduler
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_runs_in_due_time_order():
+    scheduler = DelayedJobScheduler("test-order")
+    ran = []
+    for name, delay in [("c", 0.15), ("a", 0.05), ("b", 0.1)]:
+        scheduler.schedule(name, lambda name=name: ran.append(name) or True, delay=delay)
+    assert wait_until(lambda: len(ran) == 3)
+    assert ran == ["a", "b", "c"]
+    assert scheduler.shutdown(timeout=5)
+
+
+def test_pending_and_completed_keys_are_deduplicated():
+    scheduler = DelayedJobScheduler("test-dedupe")
+    ran = []
+    assert scheduler.schedule("transcript:r1", lambda: ran.append(1) or True, delay=0.05)
+    assert not scheduler.schedule("transcript:r1", lambda: ran.append(2) or True)  # Still pending
+    assert wait_until(lambda: scheduler.stats()['succeeded'] == 1)
+    assert not scheduler.schedule("transcript:r1", lambda: ran.append(3) or True)  # Already completed
+
+    # remember=False lets the same key run again once it completed
+    assert scheduler.schedule("trigger:x", lambda: ran.append(4) or True, remember=False)
+    assert wait_until(lambda: scheduler.stats()['succeeded'] == 2)
+    assert scheduler.schedule("trigger:x", lambda: ran.append(5) or True, remember=False)
+    assert wait_until(lambda: scheduler.stats()['succeeded'] == 3)
+    assert ran == [1, 4, 5]
+    scheduler.shutdown(timeout=5)
+
+
+def test_retries_with_backoff_until_max_attempts():
+    scheduler = DelayedJobScheduler("test-retry")
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) == 2:
+            raise RuntimeError("Recall.ai is down")
+        return False
+
+    scheduler.schedule("flaky", flaky, max_attempts=4, retry_delay=0.05, backoff=2.0)
+    assert wait_until(lambda: scheduler.stats()['failed'] == 1)
+    assert len(attempts) == 4  # A falsy result and an exception both count as failed attempts
+
+    gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+    assert gaps[0] >= 0.045 and gaps[1] >= 0.095 and gaps[2] >= 0.195  # 0.05, 0.1, 0.2
+    assert scheduler.stats()['retried'] == 3 and not scheduler.is_pending("flaky")
+
+    succeeded = []
+    scheduler.schedule("eventually", lambda: succeeded.append(1) or len(succeeded) == 2, retry_delay=0.01)
+    assert wait_until(lambda: scheduler.stats()['succeeded'] == 1)
+    assert len(succeeded) == 2
+    scheduler.shutdown(timeout=5)
+
+
+def test_cancel_and_shutdown():
+    scheduler = DelayedJobScheduler("test-shutdown")
+    ran = threading.Event()
+    scheduler.schedule("cancelled", ran.set, delay=0.05)
+    assert scheduler.cancel("cancelled") and not scheduler.cancel("cancelled")
+
+    scheduler.schedule("later", ran.set, delay=10)
+    started = time.monotonic()
+    assert scheduler.shutdown(timeout=5)
+    assert time.monotonic() - started < 1.0  # Doesn't wait for jobs that aren't due
+    time.sleep(0.1)
+    assert not ran.is_set()
+    assert not any(thread.name == "test-shutdown" for thread in threading.enumerate())
+
+
+if __name__ == '__main__':
+    for test in [test_runs_in_due_time_order, test_pending_and_completed_keys_are_deduplicated,
+                 test_retries_with_backoff_until_max_attempts, test_cancel_and_shutdown]:
+        test()
+        print(f"✅ {test.__name__}")
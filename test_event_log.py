@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for structured event logging
+Checks payload redaction/truncation, per-event sampling, the JSON output
+written by the listener thread, and the runtime debug toggle.
+"""
+
+import io
+import json
+
+from event_log import EventLogger, EventSampler, REDACTED, parse_sample_rates, redact
+
+
+def test_redact_payload():
+    payload = {
+        'event': 'transcript.done',
+        'data': {'api_key': 'sk-123', 'Authorization': 'Bearer x', 'words': ['w'] * 50, 'text': 'x' * 500}
+    }
+    cleaned = redact(payload, max_chars=100, max_items=20)
+
+    assert cleaned['data']['api_key'] == REDACTED
+    assert cleaned['data']['Authorization'] == REDACTED
+    assert len(cleaned['data']['words']) == 21 and cleaned['data']['words'][-1] == "...30 more items"
+    assert cleaned['data']['text'] == 'x' * 100 + "...(500 chars)"
+    assert payload['data']['api_key'] == 'sk-123'  # The original payload is untouched
+    assert redact({'a': {'b': {'c': 1}}}, depth=2) == {'a': {'b': "{...1 keys}"}}
+
+
+def test_sampling():
+    sampler = EventSampler(parse_sample_rates("transcript.partial_data=0.1, transcript.data=0"))
+    logged = sum(sampler.should_log('transcript.partial_data') for _ in range(100))
+    assert logged == 10
+    assert not any(sampler.should_log('transcript.data') for _ in range(5))
+    assert all(sampler.should_log('bot.done') for _ in range(5))
+    assert sampler.stats()['suppressed'] == {'transcript.partial_data': 90, 'transcript.data': 5}
+
+
+def test_json_output_and_debug_toggle():
+    stream = io.StringIO()
+    log = EventLogger(level="INFO", fmt="json", stream=stream, name="test_event_log")
+    try:
+        payload = {'event': 'bot.done', 'token': 'secret'}
+        assert log.event('bot.done', "📨 Received webhook", event='bot.done', bot_id='b1')
+        log.payload("🔍 Event payload", payload)  # Debug is off: nothing logged
+
+        log.toggle_debug()
+        assert log.debug_enabled
+        log.payload("🔍 Event payload", payload, event='bot.done')
+        log.set_debug(False)
+        assert not log.debug_enabled
+        assert log.flush()
+    finally:
+        log.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line['msg'] for line in lines] == ["📨 Received webhook", "🔧 Debug logging enabled", "🔍 Event payload"]
+    assert lines[0]['level'] == 'info' and lines[0]['bot_id'] == 'b1'
+    assert lines[2]['payload'] == {'event': 'bot.done', 'token': REDACTED}
+
+
+def test_full_queue_drops_instead_of_blocking():
+    log = EventLogger(fmt="text", stream=io.StringIO(), queue_size=5, name="test_event_log_full")
+    log.stop()  # No listener: the queue fills up
+    for i in range(20):
+        log.event('transcript.data', "💬 Real-time transcript", words=f"hello {i}")
+    assert log.stats()['dropped'] == 15
+
+
+if __name__ == '__main__':
+    for test in [test_redact_payload, test_sampling, test_json_output_and_debug_toggle,
+                 test_full_queue_drops_instead_of_blocking]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the background worker pool
+Checks that jobs with the same key run in order, that a full queue rejects
+instead of blocking, and that shutdown honors its timeout even when a worker's
+queue is full.
+"""
+
+import threading
+import time
+
+from event_queue import StageTimings, WorkerPool
+
+
+def test_same_key_runs_in_order():
+    pool = WorkerPool("test-order", num_workers=4, max_queue_size=1000, timings=StageTimings())
+    seen = {}
+    lock = threading.Lock()
+
+    def job(key, index):
+        time.sleep(0.0005 * (index % 3))  # Uneven job times
+        with lock:
+            seen.setdefault(key, []).append(index)
+
+    for index in range(50):
+        for key in ("bot-a", "bot-b", "bot-c"):
+            assert pool.submit(key, job, key, index)
+    assert pool.shutdown(timeout=10)
+
+    assert all(seen[key] == list(range(50)) for key in ("bot-a", "bot-b", "bot-c"))
+    assert pool.stats()['completed'] == 150
+
+
+def test_full_queue_rejects_without_blocking():
+    pool = WorkerPool("test-full", num_workers=1, max_queue_size=2, timings=StageTimings())
+    release = threading.Event()
+    pool.submit("k", release.wait)  # Occupies the worker
+    time.sleep(0.05)
+    assert pool.submit("k", lambda: None) and pool.submit("k", lambda: None)
+
+    started = time.monotonic()
+    assert pool.submit("k", lambda: None) is False
+    assert time.monotonic() - started < 0.1
+    assert pool.stats()['rejected'] == 1
+
+    release.set()
+    assert pool.shutdown(timeout=5)
+
+
+def test_shutdown_times_out_with_a_full_queue():
+    pool = WorkerPool("test-shutdown", num_workers=1, max_queue_size=2, timings=StageTimings())
+    release = threading.Event()
+    pool.submit("k", release.wait)
+    time.sleep(0.05)
+    pool.submit("k", lambda: None)
+    pool.submit("k", lambda: None)
+
+    # The worker is stuck and its queue is full: shutdown must still return on time
+    started = time.monotonic()
+    assert pool.shutdown(timeout=0.2) is False
+    assert time.monotonic() - started < 1.0
+
+    # Once unblocked, the worker finishes what was queued and exits without a stop marker
+    release.set()
+    deadline = time.monotonic() + 5
+    while pool.stats()['completed'] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.stats()['completed'] == 3
+    time.sleep(0.05)
+    assert not any(thread.name.startswith("test-shutdown") for thread in threading.enumerate())
+
+
+def test_submit_after_shutdown_is_rejected():
+    pool = WorkerPool("test-closed", num_workers=1, max_queue_size=10, timings=StageTimings())
+    release = threading.Event()
+    resubmitted = []
+
+    def job():
+        release.wait()
+        # Still running after shutdown gave up: must not start a second worker on this queue
+        resubmitted.append(pool.submit("k", lambda: None))
+
+    pool.submit("k", job)
+    time.sleep(0.05)
+    assert pool.shutdown(timeout=0.1) is False
+    try:
+        pool.start()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("start() must wait for the previous workers to exit")
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while not resubmitted and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert resubmitted == [False] and pool.stats()['rejected'] == 1
+    time.sleep(0.05)
+    assert [thread.name for thread in threading.enumerate() if thread.name.startswith("test-closed")] == []
+
+    # An explicit start() reopens the pool
+    pool.start()
+    done = threading.Event()
+    assert pool.submit("k", done.set) and done.wait(5)
+    assert pool.shutdown(timeout=5)
+
+
+if __name__ == '__main__':
+    for test in [test_same_key_runs_in_order, test_full_queue_rejects_without_blocking,
+                 test_shutdown_times_out_with_a_full_queue, test_submit_after_shutdown_is_rejected]:
+        test()
+        print(f"✅ {test.__name__}")
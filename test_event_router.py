@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for the webhook event router
+Checks typed parsing across payload versions and dispatch. Run with
+--benchmark to compare decoding + routing against the previous
+json + if/elif handler on a realistic event mix.
+"""
+
+import json
+import sys
+import time
+
+from event_router import (
+    JSON_DECODER, ArtifactEvent, BotStatusEvent, ChatEvent, EventRouter, TranscriptEvent, WebhookEvent,
+    decode_body, parse_event
+)
+
+
+def chat_payload(text="hey kurt", to="everyone", legacy=False):
+    if legacy:
+        return {'event': 'chat.message', 'bot_id': 'bot-1',
+                'data': {'participant': {'id': 7, 'name': 'Ada'}, 'message': {'text': text, 'to': to}}}
+    return {'event': 'participant_events.chat_message',
+            'data': {'bot': {'id': 'bot-1'},
+                     'data': {'participant': {'id': 7, 'name': 'Ada'}, 'data': {'text': text, 'to': to}}}}
+
+
+def transcript_payload(event='transcript.data'):
+    return {'event': event,
+            'data': {'bot': {'id': 'bot-1'},
+                     'data': {'participant': {'name': 'Ada'},
+                              'words': [{'text': 'hello'}, {'text': 'kurt'}, {'text': 'there'}]}}}
+
+
+def test_parse_typed_events():
+    for legacy in (False, True):
+        chat = parse_event(chat_payload(to="bot", legacy=legacy))
+        assert isinstance(chat, ChatEvent)
+        assert (chat.bot_id, chat.participant_name, chat.participant_id, chat.text, chat.is_dm) == \
+            ('bot-1', 'Ada', '7', 'hey kurt', True)
+    assert parse_event(chat_payload()).is_dm is False
+
+    transcript = parse_event(transcript_payload())
+    assert isinstance(transcript, TranscriptEvent) and transcript.words == "hello kurt there"
+
+    done = parse_event({'event': 'bot.done', 'data': {'bot': {'id': 'b'}, 'recording': {'id': 'r1'}}})
+    legacy_done = parse_event({'event': 'bot.status_change', 'bot_id': 'b',
+                               'data': {'code': 'done', 'recording_id': 'r1'}})
+    assert isinstance(done, BotStatusEvent) and done.recording_id == legacy_done.recording_id == 'r1'
+    assert legacy_done.bot_id == 'b' and legacy_done.status == 'done'
+
+    artifact = parse_event({'event': 'transcript.done',
+                            'data': {'transcript': {'id': 't1'}, 'recording': {'id': 'r1'}}})
+    assert isinstance(artifact, ArtifactEvent) and (artifact.transcript_id, artifact.recording_id) == ('t1', 'r1')
+
+    other = parse_event({'event': 'something.new', 'data': None})
+    assert type(other) is WebhookEvent and other.bot_id is None
+    assert "ChatEvent(event='chat.message'" in repr(parse_event(chat_payload(legacy=True)))
+
+
+def test_router_dispatch():
+    router = EventRouter(fast_path=('transcript.partial_data',))
+    seen = []
+
+    @router.on('participant_events.chat_message', 'chat.message')
+    def on_chat(chat):
+        seen.append(('chat', chat.text))
+        return {"status": "skipped"}, 200
+
+    @router.otherwise
+    def on_other(parsed):
+        seen.append(('other', parsed.event))
+
+    assert router.dispatch(parse_event(chat_payload(legacy=True))) == ({"status": "skipped"}, 200)
+    assert router.dispatch(parse_event({'event': 'bot.done'})) is None
+    assert seen == [('chat', 'hey kurt'), ('other', 'bot.done')]
+    assert router.handles('chat.message') and not router.handles('bot.done')
+    assert router.is_fast_path('transcript.partial_data')
+
+
+def test_decode_body():
+    assert decode_body(b'{"event": "bot.done", "text": "caf\\u00e9"}') == {'event': 'bot.done', 'text': 'café'}
+    for body in (b'[1, 2]', b'not json'):
+        try:
+            decode_body(body)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{body!r} should be rejected")
+
+
+def legacy_route(body):
+    """
+    The previous handler's decode and lookups (json.loads + if/elif chain), minus side effects
+    """
+    data = json.loads(body)
+    event = data.get('event')
+    data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id')  # Logged for every event
+    if event == 'transcript.data':
+        bot_id = data.get('bot_id')
+        words = data['data']['data'].get('words', '')
+        data['data']['data'].get('participant', {}).get('name', 'Unknown')
+        if isinstance(words, list):
+            words = ' '.join(word.get('text', '') for word in words)
+        return bot_id or data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id')
+    elif event == 'transcript.partial_data':
+        return data['data']['data'].get('words', '')
+    elif event == 'participant_events.chat_message' or event == 'chat.message':
+        bot_id = data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id')
+        participant = (data.get('data', {}).get('data', {}).get('participant') or
+                       data.get('data', {}).get('participant') or {})
+        message_data = (data.get('data', {}).get('data', {}).get('data') or
+                        data.get('data', {}).get('message') or {})
+        return bot_id, participant.get('name', 'Unknown'), str(participant.get('id', '')), \
+            message_data.get('text', ''), message_data.get('to', '') != 'everyone'
+    elif event in ('bot.joining_call', 'bot.in_call_recording', 'bot.in_call_not_recording'):
+        return data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id')
+    elif event == 'bot.status_change':
+        return data['data'].get('code')
+    elif event == 'bot.done' or event == 'bot.call_ended':
+        return (data.get('data', {}).get('bot', {}).get('id') or data.get('bot_id'),
+                data.get('data', {}).get('recording', {}).get('id') or data.get('data', {}).get('recording_id'))
+    elif event in ('transcript.done', 'transcript.failed', 'recording.done'):
+        return data.get('data', {}).get('transcript', {}).get('id')
+    return None
+
+
+def benchmark(iterations=20000):
+    # Realtime meetings are dominated by partial transcripts
+    mix = ([transcript_payload('transcript.partial_data')] * 12 + [transcript_payload()] * 4 +
+           [chat_payload(), chat_payload(to="bot", legacy=True)] +
+           [{'event': 'bot.in_call_recording', 'data': {'bot': {'id': 'bot-1'}}}])
+    bodies = [json.dumps(payload).encode() for payload in mix]
+
+    router = EventRouter(fast_path=('transcript.partial_data',))
+    router.otherwise(lambda parsed: None)
+
+    def routed(body):
+        data = decode_body(body)
+        if router.is_fast_path(data.get('event')):
+            return router.dispatch(WebhookEvent(data.get('event'), None, data))
+        return router.dispatch(parse_event(data))
+
+    for name, route in [("json + if/elif (previous)", legacy_route), (f"{JSON_DECODER} + router", routed)]:
+        start = time.perf_counter()
+        for _ in range(iterations // len(bodies)):
+            for body in bodies:
+                route(body)
+        elapsed = time.perf_counter() - start
+        per_event = elapsed / (iterations // len(bodies) * len(bodies))
+        print(f"{name:<28} {per_event * 1e6:6.2f} µs/event")
+
+
+if __name__ == '__main__':
+    for test in [test_parse_typed_events, test_router_dispatch, test_decode_body]:
+        test()
+        print(f"✅ {test.__name__}")
+
+    if '--benchmark' in sys.argv:
+        benchmark()
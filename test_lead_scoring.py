@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for background course-interest classification
+The classifier call runs on the lead-scoring pool, so a reply must go out while
+the classifier is still waiting on the model; when the classifier call fails,
+the keyword list decides instead.
+"""
+
+import os
+import threading
+import time
+import types
+
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+
+import bot
+
+
+class FakeCompletions:
+    """
+    Replies instantly to playful requests; classifier requests (max_tokens=5) wait
+    for `release`, or raise when `classifier_error` is set
+    """
+
+    def __init__(self, classifier_error=None):
+        self.release = threading.Event()
+        self.classifier_error = classifier_error
+
+    def create(self, model, messages, max_tokens=None, temperature=None):
+        if max_tokens == 5:
+            if self.classifier_error is not None:
+                raise self.classifier_error
+            self.release.wait(5)
+            content = "YES"
+        else:
+            content = "Happy to tell you more!"
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))], usage=None
+        )
+
+
+def run_with_stand_ins(completions, func):
+    leads = []
+    originals = (bot.openai_client, bot.append_interest_entry)
+    bot.openai_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    bot.append_interest_entry = lambda name, text, bot_id, detected_by: leads.append((name, text, detected_by))
+    try:
+        return func(leads)
+    finally:
+        completions.release.set()
+        bot.lead_scoring_workers.shutdown(timeout=5)  # Waits for the classifier jobs
+        bot.lead_scoring_workers.start()
+        bot.openai_client, bot.append_interest_entry = originals
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_reply_does_not_wait_for_classifier():
+    completions = FakeCompletions()
+
+    def scenario(leads):
+        started = time.monotonic()
+        reply = bot.moderate_and_respond("how do I sign up for the bot course, lead test 1?", "Ann")
+        assert reply == "Happy to tell you more!"
+        assert time.monotonic() - started < 1.0  # The classifier is still blocked
+        assert leads == []
+
+        completions.release.set()
+        assert wait_until(lambda: leads)
+        assert leads == [("Ann", "how do I sign up for the bot course, lead test 1?", 'llm')]
+
+    run_with_stand_ins(completions, scenario)
+
+
+def test_failed_classifier_falls_back_to_keywords():
+    completions = FakeCompletions(classifier_error=RuntimeError("model unavailable"))
+
+    def scenario(leads):
+        bot.log_course_interest("Bob", "I'm interested in the course")
+        bot.log_course_interest("Cy", "nice weather today")
+        assert leads == [("Bob", "I'm interested in the course", 'fallback_keywords')]
+
+    run_with_stand_ins(completions, scenario)
+
+
+if __name__ == '__main__':
+    for test in [test_reply_does_not_wait_for_classifier, test_failed_classifier_falls_back_to_keywords]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-meeting chat buffers
+Checks that MeetingLog drops its oldest records once the byte ceiling is reached,
+that RecentWindow keeps only the latest messages, and that a ChatRecord survives
+the JSONL serialization round trip unchanged.
+"""
+
+from chat_log import record_from_line, record_to_line
+from meeting_buffers import BOT_PARTICIPANT_NAME, ChatRecord, MeetingLog, RecentWindow
+
+
+def fields(record):
+    return (record.participant, record.participant_id, record.text, record.ts, record.is_dm)
+
+
+def test_meeting_log_drops_oldest_past_ceiling():
+    records = [ChatRecord("Ann", f"message {i:03d}", ts=1000.0 + i) for i in range(10)]
+    record_size = records[0].size_bytes()
+    log = MeetingLog(max_bytes=record_size * 4)
+    for record in records:
+        log.append(record)
+
+    assert [record.text for record in log.snapshot()] == [f"message {i:03d}" for i in range(6, 10)]
+    assert log.stats() == {'records': 4, 'bytes': record_size * 4, 'max_bytes': record_size * 4, 'dropped': 6}
+
+    # A single record larger than the ceiling is kept rather than leaving the log empty
+    log.append(ChatRecord("Bob", "x" * (record_size * 8)))
+    assert len(log) == 1 and log.dropped == 10
+
+    unlimited = MeetingLog(max_bytes=0)
+    for record in records:
+        unlimited.append(record)
+    assert len(unlimited) == 10 and unlimited.dropped == 0
+
+
+def test_meeting_log_splits_public_and_dms():
+    log = MeetingLog()
+    log.append(ChatRecord("Ann", "hi all"))
+    log.append(ChatRecord("Bob", "psst", participant_id="7", is_dm=True))
+    log.append(ChatRecord(BOT_PARTICIPANT_NAME, "hello Ann"))
+    assert [record.text for record in log.public()] == ["hi all", "hello Ann"]
+    assert [record.text for record in log.dms()] == ["psst"]
+    assert log.public()[1].is_bot
+
+
+def test_recent_window_keeps_latest():
+    window = RecentWindow(capacity=3)
+    assert window.capacity == 3 and len(window) == 0
+    for i in range(7):
+        window.append(ChatRecord("Ann", f"message {i}"))
+    assert len(window) == 3
+    assert [record.text for record in window.snapshot()] == ["message 4", "message 5", "message 6"]
+    assert [record.text for record in window] == ["message 4", "message 5", "message 6"]
+
+
+def test_chat_record_round_trip():
+    records = [
+        ChatRecord("Ann", "hello 👋 \"quoted\"\nsecond line", ts=1700000000.123456),
+        ChatRecord("Bob", "psst", ts=1700000001.5, participant_id="7", is_dm=True),
+        ChatRecord(BOT_PARTICIPANT_NAME, "reply to Bob", ts=1700000002.0, participant_id="7", is_dm=True),
+        ChatRecord(None, "", ts=1700000003.0),
+    ]
+    for record in records:
+        line = record_to_line(record)
+        assert line.endswith('\n') and line.count('\n') == 1
+        assert fields(record_from_line(line)) == fields(record)
+    assert record_from_line(record_to_line(records[3])).participant == 'Unknown'
+
+
+if __name__ == '__main__':
+    for test in [test_meeting_log_drops_oldest_past_ceiling, test_meeting_log_splits_public_and_dms,
+                 test_recent_window_keeps_latest, test_chat_record_round_trip]:
+        test()
+        print(f"✅ {test.__name__}")
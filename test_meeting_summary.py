@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script for rolling meeting summaries
+Checks the fold cadence (by line count, by time and for a meeting gone quiet),
+the per-fold size limit, retry after a failed summary call, lines dropped while
+a fold runs, forgetting a meeting, and that contextual requests carry the
+summary ahead of the recent messages.
+"""
+
+import threading
+
+from meeting_buffers import ChatRecord
+from meeting_summary import MeetingSummarizer
+from prompts import build_contextual_request, build_summary_request
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingSummarize:
+    """
+    summarize stand-in: records each fold's lines and returns a summary naming them
+    """
+
+    def __init__(self, fail=0):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, previous, lines):
+        self.calls.append((previous, list(lines)))
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("model unavailable")
+        return f"{previous} +{len(lines)}".strip()
+
+
+def wait_for_folds(summarizer):
+    # Finishes the queued folds, then reopens the pool for the rest of the test
+    assert summarizer.pool.shutdown(timeout=5)
+    summarizer.pool.start()
+
+
+def test_folds_by_segments_and_seconds():
+    clock = FakeClock()
+    summarize = RecordingSummarize()
+    summarizer = MeetingSummarizer(summarize, every_segments=3, every_seconds=60, num_workers=1, clock=clock)
+
+    summarizer.add("bot-1", "Ann", "first point")
+    summarizer.add("bot-1", "Bob", "second point", "chat")
+    assert not summarize.calls  # Neither due yet
+    summarizer.add("bot-1", "Ann", "third point")
+    wait_for_folds(summarizer)
+
+    # A lone line triggers a fold once every_seconds have passed since the last one
+    clock.now += 61
+    summarizer.add("bot-1", "Cy", "late point")
+    summarizer.add("bot-2", "Dee", "   ")  # Blank lines are ignored
+    wait_for_folds(summarizer)
+
+    assert summarize.calls == [
+        ("", ["Ann (speech): first point", "Bob (chat): second point", "Ann (speech): third point"]),
+        ("+3", ["Cy (speech): late point"]),
+    ]
+    assert summarizer.summary("bot-1") == "+3 +1"
+    assert summarizer.summary("bot-2") == ""
+    assert summarizer.stats()['meetings']['bot-1']['folds'] == 2
+
+
+def test_batch_limit_and_retry():
+    clock = FakeClock()
+    summarize = RecordingSummarize(fail=1)
+    summarizer = MeetingSummarizer(summarize, every_segments=4, max_line_chars=50, max_batch_chars=100,
+                                   num_workers=1, clock=clock)
+
+    # The first fold fails: the lines stay waiting and are retried at the next cadence
+    for i in range(4):
+        summarizer.add("bot-1", "Ann", f"point {i} " + "x" * 200)
+    wait_for_folds(summarizer)
+    assert summarizer.failed == 1 and summarizer.summary("bot-1") == ""
+    assert summarizer.stats()['meetings']['bot-1']['pending_lines'] == 4
+
+    clock.now += 61
+    summarizer.add("bot-1", "Ann", "point 4")
+    wait_for_folds(summarizer)
+
+    # Long lines are cut, and each retry takes at most max_batch_chars of them (more folds follow)
+    retried = summarize.calls[1][1]
+    assert all(len(line) <= len("Ann (speech): ") + 51 for line in retried)
+    assert len(retried) == 1 and retried[0].startswith("Ann (speech): point 0 ")
+    assert summarizer.stats()['meetings']['bot-1']['pending_lines'] < 5
+
+
+def test_quiet_meeting_is_flushed():
+    clock = FakeClock()
+    summarize = RecordingSummarize()
+    summarizer = MeetingSummarizer(summarize, every_segments=10, every_seconds=60, num_workers=1, clock=clock)
+    summarizer.add("bot-1", "Ann", "last words before everyone went quiet")
+
+    assert summarizer.sweep() == 0  # Not yet due
+    clock.now += 61
+    assert summarizer.sweep() == 1  # No new line arrives; the sweeper folds it anyway
+    wait_for_folds(summarizer)
+    assert summarize.calls == [("", ["Ann (speech): last words before everyone went quiet"])]
+    assert summarizer.sweep() == 0
+    summarizer.shutdown(timeout=5)
+
+
+def test_lines_dropped_during_a_fold_are_not_lost():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_summarize(previous, lines):
+        calls.append(list(lines))
+        started.set()
+        release.wait(5)
+        return "summary"
+
+    summarizer = MeetingSummarizer(slow_summarize, every_segments=3, max_pending=4, num_workers=1)
+    for i in range(3):
+        summarizer.add("bot-1", "Ann", f"line {i}")
+    assert started.wait(5)
+
+    # While lines 0-2 are being summarized, the buffer overflows and drops lines 0 and 1
+    for i in range(3, 6):
+        summarizer.add("bot-1", "Ann", f"line {i}")
+    release.set()
+    wait_for_folds(summarizer)
+
+    # Only the summarized lines leave the buffer: 3-5 make up the next fold
+    assert calls == [[f"Ann (speech): line {i}" for i in range(3)], [f"Ann (speech): line {i}" for i in range(3, 6)]]
+    assert summarizer.stats()['meetings']['bot-1']['dropped_lines'] == 2
+
+
+def test_forget():
+    summarize = RecordingSummarize()
+    summarizer = MeetingSummarizer(summarize, every_segments=1, num_workers=1)
+    summarizer.add("bot-1", "Ann", "hello")
+    wait_for_folds(summarizer)
+    assert summarizer.summary("bot-1") == "+1"
+
+    summarizer.forget("bot-1")
+    assert summarizer.summary("bot-1") == "" and summarizer.stats()['meetings'] == {}
+
+
+def test_summary_in_requests():
+    records = [ChatRecord("Ann", "what about pricing?")]
+    with_summary = build_contextual_request("your take?", "Bob", records, summary="Team chose the March launch.")
+    without = build_contextual_request("your take?", "Bob", records)
+
+    # The system prompt stays the same (cacheable); the summary goes before the recent messages
+    assert with_summary['messages'][0] == without['messages'][0]
+    user = with_summary['messages'][1]['content']
+    assert user.index("Team chose the March launch.") < user.index("Ann: what about pricing?")
+    assert "Meeting summary" not in without['messages'][1]['content']
+
+    request = build_summary_request("", ["Ann (speech): hi"], max_tokens=120)
+    assert request['max_tokens'] == 120 and "(none yet)" in request['messages'][1]['content']
+
+
+if __name__ == '__main__':
+    for test in [test_folds_by_segments_and_seconds, test_batch_limit_and_retry, test_quiet_meeting_is_flushed,
+                 test_lines_dropped_during_a_fold_are_not_lost, test_forget,
+                 test_summary_in_requests]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the Prometheus metrics registry
+Checks the text exposition format, cumulative histogram buckets and LLM error
+counting. Run with --benchmark to measure the cost of recording on the hot path.
+"""
+
+import sys
+import time
+
+from metrics import MetricsRegistry, llm_call, LLM_ERRORS, LLM_SECONDS
+
+
+def test_render_format():
+    registry = MetricsRegistry(prefix="test")
+    events = registry.counter("events_total", "Events", ("event", "outcome"))
+    events.inc("chat.message", "ok")
+    events.inc("chat.message", "ok")
+    events.inc("bot.done", 'say "hi"')
+    registry.gauge("queue_depth", "Queued events", lambda: 3)
+    registry.gauge("records", "Records per buffer", lambda: {("log",): 10, ("context",): 2}, ("buffer",))
+
+    lines = registry.render().splitlines()
+    assert "# HELP test_events_total Events" in lines
+    assert "# TYPE test_events_total counter" in lines
+    assert 'test_events_total{event="chat.message",outcome="ok"} 2' in lines
+    assert 'test_events_total{event="bot.done",outcome="say \\"hi\\""} 1' in lines
+    assert "# TYPE test_queue_depth gauge" in lines
+    assert "test_queue_depth 3" in lines
+    assert 'test_records{buffer="log"} 10' in lines
+
+    # Registering the same name again returns the existing metric
+    assert registry.counter("events_total", "Events", ("event", "outcome")) is events
+
+
+def test_histogram_buckets():
+    registry = MetricsRegistry(prefix="test")
+    latency = registry.histogram("stage_seconds", "Stage latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "llm_reply")
+
+    lines = registry.render().splitlines()
+    assert 'test_stage_seconds_bucket{stage="llm_reply",le="0.1"} 2' in lines
+    assert 'test_stage_seconds_bucket{stage="llm_reply",le="1"} 3' in lines
+    assert 'test_stage_seconds_bucket{stage="llm_reply",le="+Inf"} 4' in lines
+    assert 'test_stage_seconds_count{stage="llm_reply"} 4' in lines
+    assert 'test_stage_seconds_sum{stage="llm_reply"} 3.65' in lines
+
+
+def test_llm_call_errors():
+    before = LLM_SECONDS.count("test_call")
+    with llm_call("test_call"):
+        pass
+
+    for error in (RuntimeError("boom"), ValueError("Error code: 400 - content_filter triggered")):
+        try:
+            with llm_call("test_call"):
+                raise error
+        except type(error):
+            pass
+
+    assert LLM_SECONDS.count("test_call") - before == 3
+    assert LLM_ERRORS.value("test_call", "RuntimeError") >= 1
+    assert LLM_ERRORS.value("test_call", "content_filter") >= 1
+
+
+def benchmark(iterations=200_000):
+    registry = MetricsRegistry(prefix="bench")
+    counter = registry.counter("events_total", "Events", ("event", "outcome"))
+    histogram = registry.histogram("stage_seconds", "Stage latency", ("stage",))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        counter.inc("chat.message", "ok")
+    counter_ns = (time.perf_counter() - start) / iterations * 1e9
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        histogram.observe((i % 1000) / 1000, "llm_reply")
+    histogram_ns = (time.perf_counter() - start) / iterations * 1e9
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        registry.render()
+    render_us = (time.perf_counter() - start) / 1000 * 1e6
+
+    print(f"📊 counter.inc: {counter_ns:.0f} ns, histogram.observe: {histogram_ns:.0f} ns, "
+          f"render: {render_us:.0f} µs")
+
+
+if __name__ == '__main__':
+    for test in [test_render_format, test_histogram_buckets, test_llm_call_errors]:
+        test()
+        print(f"✅ {test.__name__}")
+
+    if '--benchmark' in sys.argv:
+        benchmark()
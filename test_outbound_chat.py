@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-bot outbound chat queue
+Uses a fake sender to show pacing, 429 handling, per-recipient ordering and
+merging of piled-up public replies.
+"""
+
+import threading
+import time
+from metrics import OUTBOUND_CHAT_SECONDS
+from outbound_chat import OutboundChatQueue
+
+
+class FakeResponse:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+        self.text = ''
+
+
+class FakeSender:
+    """
+    Records every send; answers 429 for the first `rate_limited` calls
+    """
+
+    def __init__(self, rate_limited=0, retry_after=0.2, delay=0.0):
+        self.calls = []
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, bot_id, to, message):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append((time.monotonic(), bot_id, to, message))
+            if self.rate_limited:
+                self.rate_limited -= 1
+                return FakeResponse(429, self.retry_after)
+        return FakeResponse(200)
+
+
+def test_rate_limit_paces_each_bot():
+    sender = FakeSender()
+    chat = OutboundChatQueue(sender, rate=20, burst=2)
+    for i in range(6):
+        chat.send('bot1', 'everyone', f"m{i}")
+    assert chat.flush(timeout=5)
+
+    times = [call[0] for call in sender.calls]
+    assert [call[3] for call in sender.calls] == [f"m{i}" for i in range(6)]
+    # Two sent as a burst, the other four at ~20/s
+    assert times[-1] - times[0] >= 4 / 20 * 0.9
+    assert chat.stats()['sent'] == 6
+
+
+def test_429_pauses_for_retry_after_and_resends():
+    sender = FakeSender(rate_limited=1, retry_after=0.2)
+    chat = OutboundChatQueue(sender, rate=0)
+    chat.send('bot1', 'p1', "first")
+    chat.send('bot1', 'p1', "second")
+    assert chat.flush(timeout=5)
+
+    assert [call[3] for call in sender.calls] == ["first", "first", "second"]
+    assert sender.calls[1][0] - sender.calls[0][0] >= 0.19
+    stats = chat.stats()
+    assert stats['rate_limited'] == 1 and stats['sent'] == 2 and stats['failed'] == 0
+
+
+def test_order_kept_per_recipient_and_public_replies_merged():
+    sender = FakeSender(delay=0.1)
+    chat = OutboundChatQueue(sender, rate=0, merge_public=True)
+    chat.send('bot1', 'everyone', "a")  # Goes out alone while the rest pile up
+    time.sleep(0.02)
+    for message, to in [("b", 'everyone'), ("dm1", 'p1'), ("c", 'everyone'), ("dm2", 'p1')]:
+        chat.send('bot1', to, message)
+    assert chat.flush(timeout=5)
+
+    sent = [(call[2], call[3]) for call in sender.calls]
+    assert sent == [('everyone', "a"), ('everyone', "b\n\nc"), ('p1', "dm1"), ('p1', "dm2")]
+    assert chat.stats()['merged'] == 1
+
+
+def test_bots_do_not_wait_on_each_other():
+    sender = FakeSender(delay=0.2)
+    chat = OutboundChatQueue(sender, rate=0)
+    exported_before = OUTBOUND_CHAT_SECONDS.count('queue_latency'), OUTBOUND_CHAT_SECONDS.count('send')
+    start = time.monotonic()
+    for i in range(5):
+        chat.send(f"bot{i}", 'everyone', "hi")
+    assert chat.flush(timeout=5)
+    assert time.monotonic() - start < 0.6
+    assert chat.stats()['timings']['queue_latency']['count'] == 5
+    # Also exported on /metrics
+    assert OUTBOUND_CHAT_SECONDS.count('queue_latency') - exported_before[0] == 5
+    assert OUTBOUND_CHAT_SECONDS.count('send') - exported_before[1] == 5
+
+
+if __name__ == '__main__':
+    for test in [test_rate_limit_paces_each_bot, test_429_pauses_for_retry_after_and_resends,
+                 test_order_kept_per_recipient_and_public_replies_merged, test_bots_do_not_wait_on_each_other]:
+        test()
+        print(f"✅ {test.__name__}")
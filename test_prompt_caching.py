@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the cache-friendly prompt layout and token accounting
+Every request builder must start with a static system prompt, with the variable
+content only in the user message after it. A stand-in for the Azure OpenAI
+client simulates provider-side prefix caching and reports usage the way the
+API does (prompt_tokens_details.cached_tokens); the bot's per-call accounting
+must add those counts up.
+"""
+
+import os
+import re
+import types
+
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+
+import bot
+from meeting_buffers import ChatRecord
+from metrics import llm_usage_stats
+from prompts import build_classifier_request, build_contextual_request, build_playful_request
+
+
+def tokenize(text):
+    # Rough stand-in for the model tokenizer: words and punctuation
+    return re.findall(r"\w+|[^\w\s]", text)
+
+
+class CachingCompletions:
+    """
+    chat.completions stand-in with provider-style prefix caching: once a prompt
+    is at least min_tokens long, the longest previously seen prefix (in
+    block-sized steps) is reported as cached
+    """
+
+    def __init__(self, min_tokens=1024, block=128):
+        self.min_tokens = min_tokens
+        self.block = block
+        self.seen_prefixes = set()
+        self.calls = []
+
+    def create(self, model, messages, max_tokens=None, temperature=None):
+        tokens = [token for message in messages for token in [message['role']] + tokenize(message['content'])]
+        boundaries = range(self.min_tokens, len(tokens) + 1, self.block)
+
+        cached = 0
+        for end in boundaries:
+            if tuple(tokens[:end]) not in self.seen_prefixes:
+                break
+            cached = end
+        self.seen_prefixes.update(tuple(tokens[:end]) for end in boundaries)
+
+        usage = types.SimpleNamespace(
+            prompt_tokens=len(tokens),
+            completion_tokens=12,
+            prompt_tokens_details=types.SimpleNamespace(cached_tokens=cached)
+        )
+        self.calls.append(usage)
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content="NO" if max_tokens == 5 else "Sure!"))],
+            usage=usage
+        )
+
+
+def fake_client(completions):
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+
+
+def context(offset):
+    return [ChatRecord(f"Person {i % 3}", f"point number {i} about the launch plan") for i in range(offset, offset + 20)]
+
+
+def test_static_prefix_first():
+    requests = {
+        'classifier': [build_classifier_request("how do I sign up?"), build_classifier_request("what time is it")],
+        'playful': [build_playful_request("joke", "Ann"), build_playful_request("roast me", "Bob")],
+        'contextual': [build_contextual_request("what do you think?", "Ann", context(0)),
+                       build_contextual_request("your take?", "Bob", context(5))],
+    }
+    for call, (first, second) in requests.items():
+        # Same system prompt whatever the input; the input only in the final user message
+        assert first['messages'][0] == second['messages'][0], call
+        assert first['messages'][0]['role'] == 'system'
+        assert [message['role'] for message in first['messages']] == ['system', 'user'], call
+        assert first['messages'][-1] != second['messages'][-1]
+
+    contextual = requests['contextual'][0]['messages']
+    assert "point number 19" not in contextual[0]['content'] and "point number 19" in contextual[1]['content']
+
+
+def test_cached_tokens_accounted_per_call():
+    # A lower threshold than Azure's 1024 tokens so these short prompts exercise the cache
+    completions = CachingCompletions(min_tokens=64, block=16)
+    original = bot.openai_client
+    bot.openai_client = fake_client(completions)
+    before = llm_usage_stats().get('contextual', {'prompt_tokens': 0, 'cached_tokens': 0})
+    try:
+        assert bot.get_contextual_response("what do you think?", "Ann", context(0)) == "Sure!"
+        assert bot.get_contextual_response("your take?", "Bob", context(5)) == "Sure!"
+    finally:
+        bot.openai_client = original
+
+    first, second = completions.calls
+    assert first.prompt_tokens_details.cached_tokens == 0
+    # The static system prompt is reused; the context that changed is not
+    system_tokens = 1 + len(tokenize(build_contextual_request("x", "y", [])['messages'][0]['content']))
+    assert system_tokens - 16 <= second.prompt_tokens_details.cached_tokens <= system_tokens + 16
+
+    stats = llm_usage_stats()['contextual']
+    assert stats['prompt_tokens'] - before['prompt_tokens'] == first.prompt_tokens + second.prompt_tokens
+    assert stats['cached_tokens'] - before['cached_tokens'] == second.prompt_tokens_details.cached_tokens
+    assert 0 < stats['cache_hit_rate'] < 1
+
+
+def report_usage():
+    """
+    Print what the stand-in reported per call type for a short simulated meeting
+    """
+    completions = CachingCompletions()
+    original = bot.openai_client
+    bot.openai_client = fake_client(completions)
+    try:
+        for i in range(5):
+            bot.log_course_interest("Ann", f"can I take the course {i}?")
+            bot.get_llm_response(f"tell me joke number {i}", "Bob")
+            bot.get_contextual_response("what do you think?", "Cy", context(i))
+    finally:
+        bot.openai_client = original
+
+    for call, stats in llm_usage_stats().items():
+        print(f"   {call:<11} prompt {stats['prompt_tokens']:>6}, cached {stats['cached_tokens']:>6} "
+              f"({stats['cache_hit_rate']:.0%}), completion {stats['completion_tokens']:>5}")
+
+
+if __name__ == '__main__':
+    print("Stand-in usage for 5 rounds of classifier/playful/contextual calls (1024-token threshold):")
+    report_usage()
+
+    for test in [test_static_prefix_first, test_cached_tokens_accounted_per_call]:
+        test()
+        print(f"✅ {test.__name__}")
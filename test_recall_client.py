@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared Recall.ai HTTP client
+Replaces the requests Session with a stub that returns scripted responses, and
+checks the retry policy: POST only retries 429 (and connect timeouts), idempotent
+methods also retry 5xx and connection errors, Retry-After is honored, and each
+endpoint gets its own read timeout.
+"""
+
+import time
+import types
+
+import requests
+
+import recall_api
+from recall_api import ENDPOINT_READ_TIMEOUTS, RecallClient
+
+
+class StubResponse:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class StubSession:
+    """
+    requests.Session stand-in: returns (or raises) the scripted outcomes in order
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_client(*outcomes, max_retries=3):
+    client = RecallClient(api_key="test", base_url="https://recall.example/api/v1", max_retries=max_retries,
+                          connect_timeout=2, backoff_base=0.01, max_backoff=0.05)
+    client.session = StubSession(*outcomes)
+    return client
+
+
+def with_recorded_sleeps(func):
+    """
+    Run func with recall_api's time.sleep recorded instead of slept
+
+    Returns:
+        tuple: (func's result, the requested sleep durations)
+    """
+    sleeps = []
+    original = recall_api.time
+    recall_api.time = types.SimpleNamespace(sleep=sleeps.append, perf_counter=time.perf_counter, time=time.time)
+    try:
+        return func(), sleeps
+    finally:
+        recall_api.time = original
+
+
+def test_post_retries_only_429():
+    client = make_client(StubResponse(503))
+    assert client.post("/bot/", "create_bot").status_code == 503
+    assert len(client.session.calls) == 1  # Recall.ai may have created the bot: don't resend
+
+    client = make_client(StubResponse(429), StubResponse(429), StubResponse(201))
+    response, _ = with_recorded_sleeps(lambda: client.post("/bot/", "create_bot"))
+    assert response.status_code == 201 and len(client.session.calls) == 3
+
+    client = make_client(requests.ReadTimeout("slow"))
+    try:
+        client.post("/bot/", "create_bot")
+    except requests.ReadTimeout:
+        pass
+    else:
+        raise AssertionError("a POST read timeout must not be retried")
+    assert len(client.session.calls) == 1
+
+    client = make_client(requests.ConnectTimeout("no route"), StubResponse(201))
+    with_recorded_sleeps(lambda: client.post("/bot/", "create_bot"))
+    assert len(client.session.calls) == 2  # Never reached the server
+
+
+def test_idempotent_methods_retry_5xx_and_connection_errors():
+    first_503 = StubResponse(503)
+    client = make_client(first_503, requests.ConnectionError("reset"), StubResponse(502), StubResponse(200))
+    response, sleeps = with_recorded_sleeps(lambda: client.get("/bot/b1/", "get_bot_status"))
+    assert response.status_code == 200
+    assert len(client.session.calls) == 4 and len(sleeps) == 3
+    assert first_503.closed  # Retried responses release their connection
+    assert all(0 <= delay <= 0.05 for delay in sleeps)
+
+    # Out of retries: the last response is returned as is
+    client = make_client(*[StubResponse(500) for _ in range(3)], max_retries=2)
+    response, _ = with_recorded_sleeps(lambda: client.delete("/bot/b1/", "remove_bot"))
+    assert response.status_code == 500 and len(client.session.calls) == 3
+
+    client = make_client(StubResponse(404))
+    assert client.get("/bot/missing/", "get_bot_status").status_code == 404
+    assert len(client.session.calls) == 1
+
+
+def test_retry_after_honored():
+    client = make_client(StubResponse(429, retry_after=7), StubResponse(429, retry_after=3600), StubResponse(200))
+    _, sleeps = with_recorded_sleeps(lambda: client.post("/bot/b1/send_chat_message/", "send_chat_message"))
+    assert sleeps == [7.0, recall_api.MAX_RETRY_AFTER]
+
+
+def test_per_endpoint_timeouts_and_auth():
+    client = make_client(StubResponse(200), StubResponse(200), StubResponse(200))
+    client.get("/transcript/t1/", "get_transcript")
+    client.get("/bot/", "some_new_endpoint")
+    client.get("https://s3.example/transcript.json?sig=x", "download_transcript", authenticated=False)
+
+    (_, url, first), (_, _, second), (_, download_url, third) = client.session.calls
+    assert url == "https://recall.example/api/v1/transcript/t1/"
+    assert first['timeout'] == (2, ENDPOINT_READ_TIMEOUTS['get_transcript'])
+    assert second['timeout'] == (2, recall_api.DEFAULT_READ_TIMEOUT)
+    assert download_url.startswith("https://s3.example/")
+    assert third['timeout'] == (2, ENDPOINT_READ_TIMEOUTS['download_transcript'])
+    assert third['headers']['Authorization'] is None  # Pre-signed URL: no API key
+
+
+if __name__ == '__main__':
+    for test in [test_post_retries_only_429, test_idempotent_methods_retry_5xx_and_connection_errors,
+                 test_retry_after_honored, test_per_endpoint_timeouts_and_auth]:
+        test()
+        print(f"✅ {test.__name__}")
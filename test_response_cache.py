@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the canned-command response cache
+Shows which DM commands share a cache key, which look-alike messages must not,
+and how the variant pool rotates answers.
+"""
+
+import time
+from response_cache import ResponseCache, normalize_message
+
+
+def test_normalized_commands_share_a_key():
+    assert normalize_message("joke") == normalize_message("Tell me a joke!") == normalize_message("joke please")
+    assert normalize_message("How were you made?") == normalize_message("how were you made")
+    assert normalize_message("I want one") == normalize_message("i want one!")
+    assert normalize_message("joke") != normalize_message("fact")
+    assert normalize_message("bot course") != normalize_message("of course")
+
+
+def test_similar_but_different_messages_miss():
+    cache = ResponseCache(variants_per_key=1)
+    cache.put("I want one", "Kurt will follow up with you!")
+    cache.put("tell me a fact", "Octopuses have three hearts.")
+    cache.put("bot course", "Check out the Maven course!")
+
+    assert cache.get("hey kurt, I want one") == "Kurt will follow up with you!"
+    for message in ("I dont want one", "I don't want one", "I want none", "i want to leave", "want",
+                    "fake", "of course", "roast me"):
+        assert cache.get(message) is None, message
+    assert cache.stats()['hits'] == 1
+
+
+def test_variant_pool_rotates_answers():
+    cache = ResponseCache(variants_per_key=2)
+    assert cache.get("joke") is None  # Pool empty: caller generates a fresh answer
+    cache.put("joke", "Joke A")
+    assert cache.get("joke") is None  # Pool not full yet
+    cache.put("joke", "Joke B")
+
+    answers = [cache.get("joke") for _ in range(4)]
+    assert set(answers) == {"Joke A", "Joke B"}
+    assert all(a != b for a, b in zip(answers, answers[1:]))  # Never the same answer twice in a row
+
+
+def test_ttl_and_lru_eviction():
+    cache = ResponseCache(max_entries=2, ttl_seconds=0.05, variants_per_key=1)
+    cache.put("joke", "J")
+    time.sleep(0.1)
+    assert cache.get("joke") is None
+
+    cache.put("joke", "J")
+    cache.put("fact", "F")
+    cache.get("joke")  # Touch joke so fact is least recently used
+    cache.put("motivation", "M")
+    assert cache.stats()['evictions'] == 1
+    assert cache.get("fact") is None
+    assert cache.get("joke") == "J"
+
+
+def test_long_messages_and_urls_are_not_cached():
+    cache = ResponseCache(variants_per_key=1)
+    long_message = "can you summarize what everyone said about the roadmap in the last ten minutes"
+    cache.put(long_message, "Summary")
+    cache.put("check https://github.com/kurtn718", "Nice repo")
+    assert cache.get(long_message) is None
+    assert cache.get("check https://github.com/kurtn718") is None
+    assert cache.stats()['entries'] == 0
+
+
+if __name__ == '__main__':
+    for test in [test_normalized_commands_share_a_key, test_similar_but_different_messages_miss,
+                 test_variant_pool_rotates_answers, test_ttl_and_lru_eviction,
+                 test_long_messages_and_urls_are_not_cached]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-meeting scheduler
+Drives MeetingScheduler with a fake clock and a fake bot creator: recurrence and
+timezones, concurrent joins for meetings due together, early provisioning and
+catching up after a restart.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import scheduler as scheduler_module
+from scheduler import Meeting, MeetingScheduler, local_timezone
+
+BERLIN = ZoneInfo("Europe/Berlin")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+class FakeCreator:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, urls, webhook_url, max_workers=8):
+        self.calls.append(list(urls))
+        return [{'id': f"bot-{url}"} for url in urls]
+
+
+def make_scheduler(meetings, now, state_path=None, catchup_minutes=30):
+    clock = {'now': now.timestamp()}
+    creator = FakeCreator()
+    scheduler = MeetingScheduler(meetings, "https://example.com/webhook", state_path=state_path,
+                                 catchup_minutes=catchup_minutes, create_bots=creator,
+                                 clock=lambda: clock['now'])
+    return scheduler, creator, clock
+
+
+def test_recurrence_and_timezones():
+    weekly = Meeting("office hours", "u1", BERLIN, time_of_day="12:30", days=["mon", "wed"])
+    # Friday 2026-10-16 -> next Monday; 2026-10-26 is the first Monday after the DST change
+    assert weekly.next_start(datetime(2026, 10, 16, 9, tzinfo=BERLIN)) == datetime(2026, 10, 19, 12, 30, tzinfo=BERLIN)
+    after_dst = weekly.next_start(datetime(2026, 10, 22, tzinfo=BERLIN))
+    assert after_dst.utcoffset().total_seconds() == 3600
+
+    one_off = Meeting("demo", "u2", NEW_YORK, at="2026-11-03T18:00")
+    assert one_off.next_start(datetime(2026, 11, 1, tzinfo=NEW_YORK)).hour == 18
+    assert one_off.next_start(datetime(2026, 11, 4, tzinfo=NEW_YORK)) is None
+
+
+def test_same_time_meetings_join_together_and_early():
+    now = datetime(2026, 10, 19, 19, 50, tzinfo=NEW_YORK)
+    meetings = [Meeting("a", "ua", NEW_YORK, time_of_day="20:00", early_minutes=2),
+                Meeting("b", "ub", NEW_YORK, time_of_day="20:00", early_minutes=2),
+                Meeting("c", "uc", NEW_YORK, time_of_day="21:00")]
+    scheduler, creator, clock = make_scheduler(meetings, now)
+    assert scheduler.plan() == []
+
+    assert scheduler.run_due() == []
+    clock['now'] = datetime(2026, 10, 19, 19, 58, tzinfo=NEW_YORK).timestamp()
+    assert [meeting.key for meeting, _, _ in scheduler.run_due()] == ["a", "b"]
+    assert creator.calls == [["ua", "ub"]]
+
+    # Tomorrow's a/b and today's c are queued next
+    upcoming = [(join_at.astimezone(NEW_YORK).strftime('%d %H:%M'), meeting.key)
+                for join_at, meeting, _ in scheduler.upcoming()]
+    assert upcoming == [('19 21:00', 'c'), ('20 19:58', 'a'), ('20 19:58', 'b')]
+
+
+def test_catch_up_after_restart():
+    meeting = Meeting("class", "u1", NEW_YORK, time_of_day="20:00")
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, "state.json")
+
+        scheduler, creator, _ = make_scheduler([meeting], datetime(2026, 10, 19, 20, 0, tzinfo=NEW_YORK), state_path)
+        scheduler.plan()
+        scheduler.run_due()
+        assert creator.calls == [["u1"]]
+
+        # Restarted 10 minutes after the next day's start: joins late, once
+        scheduler, creator, _ = make_scheduler([meeting], datetime(2026, 10, 20, 20, 10, tzinfo=NEW_YORK), state_path)
+        assert [start.day for _, start in scheduler.plan()] == [20]
+        scheduler.run_due()
+        scheduler.run_due()
+        assert creator.calls == [["u1"]]
+
+        # Restarted again shortly after: already joined, nothing to catch up
+        scheduler, creator, _ = make_scheduler([meeting], datetime(2026, 10, 20, 20, 15, tzinfo=NEW_YORK), state_path)
+        assert scheduler.plan() == []
+
+        # Restarted long after the start: outside the catch-up window
+        scheduler, creator, _ = make_scheduler([meeting], datetime(2026, 10, 21, 21, 0, tzinfo=NEW_YORK), state_path)
+        assert scheduler.plan() == []
+
+
+def test_default_timezone_follows_dst():
+    # The default timezone must be the machine's IANA zone, not today's fixed UTC offset
+    original_tz, original_url = os.environ.get('TZ'), scheduler_module.MEETING_URL
+    os.environ['TZ'] = 'America/New_York'
+    scheduler_module.MEETING_URL = "https://zoom.us/j/123"
+    try:
+        assert local_timezone() == NEW_YORK
+        with tempfile.TemporaryDirectory() as tmp:
+            meeting, = scheduler_module.load_meetings(os.path.join(tmp, "missing.json"))
+    finally:
+        scheduler_module.MEETING_URL = original_url
+        if original_tz is None:
+            del os.environ['TZ']
+        else:
+            os.environ['TZ'] = original_tz
+
+    if not scheduler_module.SCHEDULE_TIMEZONE:
+        assert meeting.timezone == NEW_YORK
+
+    # A daily 20:00 meeting stays at 20:00 local after DST ends (EST, UTC-5)
+    daily = Meeting("class", "https://zoom.us/j/123", NEW_YORK, time_of_day="20:00")
+    start = daily.next_start(datetime(2026, 11, 10, 12, tzinfo=NEW_YORK))
+    assert start.hour == 20 and start.utcoffset().total_seconds() == -5 * 3600
+
+
+def test_invalid_schedule_entries_name_the_meeting():
+    cases = [
+        ({'name': "No time", 'url': "https://zoom.us/j/1"}, "No time"),
+        ({'name': "No url", 'time': "20:00"}, "No url"),
+        ({'url': "https://zoom.us/j/1", 'time': "25:00"}, "#2"),
+        ({'name': "Bad day", 'url': "https://zoom.us/j/1", 'time': "20:00", 'days': ["mon", "someday"]}, "Bad day"),
+        ({'name': "Bad zone", 'url': "https://zoom.us/j/1", 'time': "20:00", 'timezone': "Mars/Olympus"}, "Bad zone"),
+        ({'name': "Bad at", 'url': "https://zoom.us/j/1", 'at': "tomorrow"}, "Bad at"),
+    ]
+    valid = {'name': "Fine", 'url': "https://zoom.us/j/0", 'time': "20:00", 'timezone': "America/New_York"}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "schedule.json")
+        for entry, expected in cases:
+            with open(path, 'w') as f:
+                json.dump({'meetings': [valid, entry]}, f)
+            try:
+                scheduler_module.load_meetings(path)
+            except ValueError as e:
+                assert expected in str(e), str(e)
+            else:
+                raise AssertionError(f"{entry} should be rejected")
+
+        with open(path, 'w') as f:
+            json.dump({'meetings': [valid]}, f)
+        meeting, = scheduler_module.load_meetings(path)
+        assert meeting.key == "Fine" and meeting.time_of_day == (20, 0)
+
+
+if __name__ == '__main__':
+    for test in [test_recurrence_and_timezones, test_same_time_meetings_join_together_and_early,
+                 test_catch_up_after_restart, test_default_timezone_follows_dst,
+                 test_invalid_schedule_entries_name_the_meeting]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """
 Test script to demonstrate social URL extraction from chat messages
+
+Run with --benchmark to compare the single-pass extractor against the original
+one-regex-per-platform implementation on a large synthetic chat.
 """
 
 import re
+import sys
 import json
+import random
+import time
 from datetime import datetime
+from social_urls import extract_social_urls, extract_social_urls_bulk
 
 
-def extract_social_urls(text):
+def legacy_extract_social_urls(text):
     """
-    Extract social media URLs from text
+    Original implementation (8 separate findall scans), kept as the reference
+    for the precompiled extractor
     Returns list of (platform, url) tuples
     """
     social_patterns = {
@@ -41,6 +49,80 @@ def extract_social_urls(text):
     return unique_urls
 
 
+def generate_chat(num_messages, seed=42):
+    """
+    Generate a synthetic webinar chat with a mix of plain text and URLs
+    """
+    rng = random.Random(seed)
+    words = ['great', 'session', 'thanks', 'question', 'about', 'the', 'bot', 'how', 'does', 'it', 'work', 'kurt']
+    urls = [
+        'https://linkedin.com/in/{name}', 'https://www.linkedin.com/in/{name}/',
+        'https://x.com/{name}', 'https://twitter.com/{name}', 'https://github.com/{name}/repo',
+        'https://www.youtube.com/watch?v={name}', 'https://tiktok.com/@{name}',
+        'https://facebook.com/{name}', 'https://instagram.com/{name}', 'https://{name}.dev/blog/post.html',
+        'http://example.com/{name}', 'HTTPS://WWW.LINKEDIN.COM/in/{name}'
+    ]
+    messages = []
+    for i in range(num_messages):
+        parts = [rng.choice(words) for _ in range(rng.randint(3, 25))]
+        for _ in range(rng.choice([0, 0, 0, 1, 1, 2])):
+            parts.insert(rng.randint(0, len(parts)), rng.choice(urls).format(name=f"user{rng.randint(1, 500)}"))
+        messages.append(' '.join(parts))
+    return messages
+
+
+def test_matches_legacy_extractor():
+    """
+    The precompiled extractor must return exactly what the original did,
+    including platform precedence, ordering and de-duplication
+    """
+    edge_cases = [
+        '',
+        'no urls here',
+        'https://linkedin.com/in/kurt.niemi',  # LinkedIn and Website disagree on the URL
+        'https://www.youtube.com/watch?v=abc https://www.youtube.com/watch?v=abc',
+        'https://linkedin.com/in/a https://x.com/b https://linkedin.com/in/a',
+        'https://a.comhttps://b.com/x',  # Generic match swallows the next scheme's letters
+        'HTTP://GitHub.com/Kurt, https://github.com/kurt',
+    ]
+    messages = edge_cases + generate_chat(5000)
+
+    for message in messages:
+        assert extract_social_urls(message) == legacy_extract_social_urls(message), message
+
+    bulk = extract_social_urls_bulk(messages)
+    assert bulk == [legacy_extract_social_urls(message) for message in messages]
+
+
+def benchmark_large_chat(num_messages=20000, repeat=3):
+    """
+    Compare throughput of the original, single-pass and bulk extractors
+    """
+    messages = generate_chat(num_messages)
+    print(f"Benchmark: {num_messages} synthetic chat messages, best of {repeat}")
+    print("-" * 80)
+
+    def best_of(func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    timings = [
+        ('legacy (8 scans/message)', best_of(lambda: [legacy_extract_social_urls(m) for m in messages])),
+        ('single-pass', best_of(lambda: [extract_social_urls(m) for m in messages])),
+        ('bulk', best_of(lambda: extract_social_urls_bulk(messages))),
+    ]
+    baseline = timings[0][1]
+    for name, elapsed in timings:
+        print(f"   {name:<26} {elapsed * 1000:8.1f} ms  {num_messages / elapsed:12,.0f} msg/s  "
+              f"{baseline / elapsed:5.2f}x")
+    print()
+
+
 def test_message_scenarios():
     """
     Test different message scenarios
@@ -131,6 +213,11 @@ def test_message_scenarios():
 
 
 if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        test_matches_legacy_extractor()
+        benchmark_large_chat()
+        sys.exit(0)
+
     test_message_scenarios()
 
     print()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Test script for the chat state backends
+Runs the same checks against the in-process, SQLite-WAL and Redis-protocol
+backends. The Redis backend talks to a small stand-in RESP server started by
+this script, which also counts round trips so we can check that a chat event
+costs exactly one.
+"""
+
+import os
+import socketserver
+import tempfile
+import threading
+
+from meeting_buffers import ChatRecord
+from state_store import MemoryStateStore, RedisStateStore, SQLiteStateStore, create_state_store
+
+
+class MiniRespServer(socketserver.ThreadingTCPServer):
+    """
+    Just enough of the Redis protocol for RedisStateStore
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), MiniRespHandler)
+        self.lists = {}
+        self.sets = {}
+        self.zsets = {}
+        self.lock = threading.Lock()
+        self.round_trips = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def run(self, command, args):
+        lists, sets, zsets = self.lists, self.sets, self.zsets
+        if command == 'RPUSH':
+            lists.setdefault(args[0], []).extend(args[1:])
+            return len(lists[args[0]])
+        if command in ('LRANGE', 'LTRIM'):
+            items = lists.get(args[0], [])
+            start, stop = int(args[1]), int(args[2])
+            start = max(0, len(items) + start if start < 0 else start)
+            stop = len(items) + stop if stop < 0 else stop
+            selected = items[start:stop + 1]
+            if command == 'LRANGE':
+                return selected
+            lists[args[0]] = selected
+            return 'OK'
+        if command == 'LLEN':
+            return len(lists.get(args[0], []))
+        if command == 'SADD':
+            sets.setdefault(args[0], set()).update(args[1:])
+            return 1
+        if command == 'SREM':
+            sets.get(args[0], set()).difference_update(args[1:])
+            return 1
+        if command == 'SMEMBERS':
+            return sorted(sets.get(args[0], set()))
+        if command == 'ZADD':
+            zsets.setdefault(args[0], {})[args[2]] = float(args[1])
+            return 1
+        if command == 'ZREM':
+            return sum(zsets.get(args[0], {}).pop(member, None) is not None for member in args[1:])
+        if command in ('ZRANGEBYSCORE', 'ZREMRANGEBYSCORE'):
+            def bound(value):
+                value = value.decode()
+                if value.startswith('('):
+                    return float(value[1:]), True
+                return float(value), False
+            (low, low_open), (high, high_open) = bound(args[1]), bound(args[2])
+            zset = zsets.get(args[0], {})
+            matched = sorted((score, member) for member, score in zset.items()
+                             if (low < score if low_open else low <= score) and
+                             (score < high if high_open else score <= high))
+            if command == 'ZRANGEBYSCORE':
+                return [member for _, member in matched]
+            for _, member in matched:
+                del zset[member]
+            return len(matched)
+        if command == 'DEL':
+            return sum(lists.pop(key, None) is not None for key in args)
+        if command == 'EXPIRE':
+            return 1
+        return Exception(f"ERR unknown command '{command}'")
+
+
+def encode_reply(value):
+    if isinstance(value, Exception):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, int):
+        return b':%d\r\n' % value
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, list):
+        return b'*%d\r\n' % len(value) + b''.join(b'$%d\r\n%s\r\n' % (len(item), item) for item in value)
+    return b'$-1\r\n'
+
+
+def parse_commands(buffer):
+    """
+    Split complete RESP commands off the front of the buffer
+
+    Returns:
+        tuple: (list of commands, unconsumed bytes)
+    """
+    commands = []
+    while True:
+        try:
+            header_end = buffer.index(b'\r\n')
+            count = int(buffer[1:header_end])
+            pos = header_end + 2
+            args = []
+            for _ in range(count):
+                length_end = buffer.index(b'\r\n', pos)
+                length = int(buffer[pos + 1:length_end])
+                pos = length_end + 2
+                if len(buffer) < pos + length + 2:
+                    raise ValueError("incomplete")
+                args.append(buffer[pos:pos + length])
+                pos += length + 2
+        except ValueError:
+            return commands, buffer
+        commands.append(args)
+        buffer = buffer[pos:]
+
+
+class MiniRespHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        buffer = b''
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            commands, buffer = parse_commands(buffer + data)
+            if not commands:
+                continue
+            # Everything that arrived together is one pipelined batch: answer it in one write
+            with self.server.lock:
+                self.server.round_trips += 1
+                out = b''.join(encode_reply(self.server.run(args[0].decode().upper(), args[1:]))
+                               for args in commands)
+            self.request.sendall(out)
+
+
+def check_backend(store):
+    bot_id = "bot-1"
+    assert not store.has_meeting(bot_id)
+
+    for i in range(30):
+        store.append(bot_id, ChatRecord("Ann", f"public {i}"), add_to_context=True)
+    store.append(bot_id, ChatRecord("Bob", "secret", participant_id="2", is_dm=True))
+    context = store.append(bot_id, ChatRecord("Cy", "what do you think?"), add_to_context=True,
+                           fetch_context=True)
+
+    # Context: the last 20 public messages, oldest first, including the new one
+    assert [record.text for record in context] == [f"public {i}" for i in range(11, 30)] + ["what do you think?"]
+    assert [record.text for record in store.context(bot_id)] == [record.text for record in context]
+
+    records = list(store.records(bot_id))
+    assert len(records) == 32
+    assert records[30].is_dm and records[30].participant_id == "2"
+    assert records[0].participant == "Ann"
+
+    assert store.has_meeting(bot_id)
+    assert store.meeting_stats()[bot_id]['records'] == 32
+    assert store.meetings() == [bot_id]
+    store.drop(bot_id)
+    assert not store.has_meeting(bot_id)
+    assert list(store.records(bot_id)) == []
+    assert store.meetings() == []
+
+
+def test_memory_backend():
+    check_backend(MemoryStateStore(context_size=20))
+
+
+def test_sqlite_backend():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.db")
+        store = SQLiteStateStore(path, context_size=20)
+        check_backend(store)
+
+        # A second connection (as another worker process would open) sees the same state
+        store.append("bot-2", ChatRecord("Ann", "hello"), add_to_context=True)
+        other = SQLiteStateStore(path, context_size=20)
+        assert [record.text for record in other.context("bot-2")] == ["hello"]
+        other.close()
+        store.close()
+
+
+def test_sqlite_trims_context_flags_and_caps_log():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteStateStore(os.path.join(tmp, "state.db"), context_size=5, log_max_records=300)
+        store.TRIM_EVERY = 50
+        for i in range(1000):
+            store.append("bot-1", ChatRecord("Ann", f"public {i}"), add_to_context=True)
+
+        stats = store.meeting_stats()["bot-1"]
+        assert stats['context_records'] == 5  # Older rows unflagged, not just hidden by LIMIT
+        assert 300 <= stats['records'] <= 300 + store.TRIM_EVERY
+        records = list(store.records("bot-1"))
+        assert records[-1].text == "public 999" and records[0].text != "public 0"
+        assert [record.text for record in store.context("bot-1")] == [f"public {i}" for i in range(995, 1000)]
+        store.close()
+
+
+def test_sqlite_caps_interleaved_meetings():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = create_state_store("sqlite", log_max_records=100, ttl_seconds=60,
+                                   sqlite_path=os.path.join(tmp, "state.db"))
+        store.TRIM_EVERY = 16
+        for i in range(3000):
+            store.append("bot-a", ChatRecord("Ann", f"a {i}"))
+            store.append("bot-b", ChatRecord("Bob", f"b {i}"))  # Only ever lands on odd table-wide seqs
+
+        stats = store.meeting_stats()
+        for bot_id in ("bot-a", "bot-b"):
+            assert 100 <= stats[bot_id]['records'] <= 100 + store.TRIM_EVERY, stats
+        assert list(store.records("bot-b"))[-1].text == "b 2999"
+
+        store.drop("bot-b")
+        store.append("bot-b", ChatRecord("Bob", "new meeting"))
+        assert store.meeting_stats()["bot-b"]['records'] == 1
+        store.close()
+
+
+def test_redis_backend_one_round_trip():
+    server = MiniRespServer()
+    try:
+        store = RedisStateStore(server.url, context_size=20)
+        check_backend(store)
+
+        before = server.round_trips
+        store.append("bot-3", ChatRecord("Ann", "what do you think?"), add_to_context=True, fetch_context=True)
+        assert server.round_trips - before == 1
+        store.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_redis_abandoned_meetings_leave_the_index():
+    server = MiniRespServer()
+    clock = {'now': 1000.0}
+    try:
+        store = RedisStateStore(server.url, ttl_seconds=60, clock=lambda: clock['now'])
+        store.append("abandoned", ChatRecord("Ann", "bye"))
+        clock['now'] += 30
+        store.append("active", ChatRecord("Bob", "hi"))
+        assert store.meetings() == ["abandoned", "active"]
+
+        # Past the TTL the abandoned meeting is filtered out, and the next append trims it
+        clock['now'] += 45
+        assert store.meetings() == ["active"]
+        store.append("active", ChatRecord("Bob", "still here"))
+        assert list(server.zsets[store._meetings_key.encode()]) == [b"active"]
+        assert list(store.meeting_stats()) == ["active"]
+        store.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    for test in [test_memory_backend, test_sqlite_backend, test_sqlite_trims_context_flags_and_caps_log,
+                 test_sqlite_caps_interleaved_meetings,
+                 test_redis_backend_one_round_trip, test_redis_abandoned_meetings_leave_the_index]:
+        test()
+        print(f"✅ {test.__name__}")
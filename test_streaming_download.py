@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming, resumable transcript downloads
+Serves a fake transcript from a local HTTP server that supports Range requests
+and can cut the connection part-way, then checks resume, compression and the
+already-downloaded skip.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import recall_api
+from streaming_download import stream_download
+
+BODY = json.dumps({'words': [{'text': f"word{i}", 'start': i, 'end': i + 1} for i in range(40000)]}).encode()
+
+
+class TranscriptHandler(BaseHTTPRequestHandler):
+    cut_after = None  # Drop the connection after this many body bytes (first request only)
+    requests_seen = []
+
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        TranscriptHandler.requests_seen.append(range_header)
+        start = int(range_header.split('=')[1].rstrip('-')) if range_header else 0
+        body = BODY[start:]
+
+        self.send_response(206 if range_header else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+
+        if TranscriptHandler.cut_after is not None:
+            cut, TranscriptHandler.cut_after = TranscriptHandler.cut_after, None
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TranscriptHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/transcript.json"
+
+
+def get(url, headers):
+    return requests.get(url, headers=headers, stream=True, timeout=5)
+
+
+def test_interrupted_download_resumes_with_range():
+    server, url = start_server()
+    TranscriptHandler.requests_seen = []
+    TranscriptHandler.cut_after = 300000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'transcript.json')
+        result = stream_download(get, url, path, checkpoint_bytes=64 * 1024)
+        with open(path, 'rb') as f:
+            assert f.read() == BODY
+        assert result['resumed'] and result['bytes'] == len(BODY)
+        assert TranscriptHandler.requests_seen[0] is None
+        assert int(TranscriptHandler.requests_seen[1][6:-1]) > 0  # Resumed, not restarted
+        assert sorted(os.listdir(directory)) == ['transcript.json']
+    server.shutdown()
+
+
+def test_gzip_resume_produces_one_readable_stream():
+    server, url = start_server()
+    TranscriptHandler.cut_after = 500000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'transcript.json.gz')
+        result = stream_download(get, url, path, compression='gzip', checkpoint_bytes=128 * 1024)
+        with gzip.open(path, 'rb') as f:
+            assert f.read() == BODY
+        assert result['stored_bytes'] < len(BODY) / 3
+    server.shutdown()
+
+
+def test_already_downloaded_transcript_is_skipped():
+    server, url = start_server()
+    TranscriptHandler.requests_seen = []
+    original = recall_api.get_transcript
+    recall_api.get_transcript = lambda transcript_id: {'data': {'download_url': url}}
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            assert recall_api.download_transcript_file('t-1', 'transcript_r1.json', compression='gzip')
+            assert recall_api.download_transcript_file('t-1', 'transcript_r1.json', compression='gzip')
+            assert len(TranscriptHandler.requests_seen) == 1
+            with gzip.open('transcript_r1.json.gz', 'rb') as f:
+                assert f.read() == BODY
+    finally:
+        os.chdir(cwd)
+        recall_api.get_transcript = original
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    for test in [test_interrupted_download_resumes_with_range, test_gzip_resume_produces_one_readable_stream,
+                 test_already_downloaded_transcript_is_skipped]:
+        test()
+        print(f"✅ {test.__name__}")
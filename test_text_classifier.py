@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for the one-pass text classifier
+Proves the classifier agrees with the original per-list checks (self-harm,
+opinion, mention, interest keywords) on generated chat, including phrases that
+overlap or share prefixes.
+
+Run with --benchmark to compare the original checks against one classifier pass.
+"""
+
+import random
+import sys
+import time
+
+from prompts import INTEREST_KEYWORDS, OPINION_PHRASES, SELF_HARM_PHRASES
+from text_classifier import TextClassifier
+
+KURT_LINKEDIN_URL = "https://linkedin.com/in/kurtniemi"
+
+
+# Original implementations (from bot.py before the one-pass classifier)
+def legacy_detect_self_harm(message_text):
+    self_harm_patterns = [
+        'want to die', 'kill myself', 'end my life', 'suicide',
+        'hurt myself', 'harm myself', 'don\'t want to live',
+        'better off dead', 'end it all', 'take my own life'
+    ]
+    message_lower = message_text.lower()
+    return any(pattern in message_lower for pattern in self_harm_patterns)
+
+
+def legacy_is_opinion_request(message_text):
+    opinion_triggers = [
+        'what do you think', 'what are your thoughts', 'your opinion',
+        'what\'s your take', 'your thoughts', 'how do you feel',
+        'what would you say', 'do you agree', 'your perspective',
+        'kurtbot, analyze', 'kurtbot analysis'
+    ]
+    message_lower = message_text.lower()
+    return any(trigger in message_lower for trigger in opinion_triggers)
+
+
+def legacy_is_mention(message_text):
+    return ('kurt' in message_text.lower() or
+            '@kurtbot' in message_text.lower() or
+            KURT_LINKEDIN_URL.lower() in message_text.lower())
+
+
+def legacy_is_interest(message_text):
+    return any(keyword in message_text.lower() for keyword in INTEREST_KEYWORDS)
+
+
+def legacy_classify(message_text):
+    checks = [('self_harm', legacy_detect_self_harm), ('opinion', legacy_is_opinion_request),
+              ('mention', legacy_is_mention), ('interest', legacy_is_interest)]
+    return frozenset(name for name, check in checks if check(message_text))
+
+
+def make_classifier():
+    return TextClassifier({
+        'self_harm': SELF_HARM_PHRASES,
+        'opinion': OPINION_PHRASES,
+        'mention': ['kurt', '@kurtbot', KURT_LINKEDIN_URL],
+        'interest': INTEREST_KEYWORDS
+    })
+
+
+def generate_messages(count, seed=11):
+    """
+    Chat messages built from trigger phrases, fragments of them and filler, in mixed case
+    """
+    rng = random.Random(seed)
+    phrases = SELF_HARM_PHRASES + OPINION_PHRASES + INTEREST_KEYWORDS + ['kurt', '@kurtbot', KURT_LINKEDIN_URL]
+    filler = ['hey', 'the', 'roadmap', 'looks', 'great', 'lol', 'Kur', 'what do', 'your', 'end it',
+              'I', 'think', 'deploy', 'Friday', '🙂', 'é', 'KURTBOT', 'learning', 'robot']
+    messages = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            roll = rng.random()
+            if roll < 0.1:
+                parts.append(rng.choice(phrases))
+            elif roll < 0.2:
+                phrase = rng.choice(phrases)
+                parts.append(phrase[:rng.randint(1, len(phrase))])
+            else:
+                parts.append(rng.choice(filler))
+        text = rng.choice([' ', '', ', ']).join(parts)
+        messages.append(''.join(c.upper() if rng.random() < 0.2 else c for c in text))
+    return messages
+
+
+def test_matches_legacy_checks():
+    classifier = make_classifier()
+    cases = [
+        "kurtbot analysis please",          # opinion and mention at the same position
+        "I don't want to live like this",   # self-harm inside a longer sentence
+        "what's your take, KURT?",
+        "robots are fun",                   # 'bot' inside another word, like the substring checks
+        "https://linkedin.com/in/kurtniemi",
+        "",
+    ]
+    for message in cases + generate_messages(20000):
+        assert classifier.classify(message) == legacy_classify(message), message
+
+
+def benchmark_classifier(num_messages=20000, repeat=3):
+    """
+    Compare the four original checks against one classifier pass per message
+    """
+    messages = generate_messages(num_messages)
+    classifier = make_classifier()
+    print(f"Benchmark: {num_messages} synthetic chat messages, best of {repeat}")
+    print("-" * 80)
+
+    def best_of(func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    timings = [
+        ('legacy (4 checks)', best_of(lambda: [legacy_classify(m) for m in messages])),
+        ('one-pass classifier', best_of(lambda: [classifier.classify(m) for m in messages])),
+    ]
+    baseline = timings[0][1]
+    for name, elapsed in timings:
+        print(f"   {name:<22} {elapsed * 1000:8.1f} ms  {num_messages / elapsed:12,.0f} msg/s  "
+              f"{baseline / elapsed:5.2f}x")
+    print()
+
+
+if __name__ == '__main__':
+    test_matches_legacy_checks()
+    print("✅ Classifier agrees with the original checks")
+    if '--benchmark' in sys.argv:
+        benchmark_classifier()
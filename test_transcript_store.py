@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar transcript store
+Checks store queries against the same queries answered from the JSON, for both
+AssemblyAI and Recall.ai transcript formats.
+
+Run with --benchmark to compare loading and querying a large synthetic
+transcript from the store against json.load.
+"""
+
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from transcript_store import TranscriptStore, build_transcript_store, iter_words
+
+WORDS = ['so', 'the', 'roadmap', 'agent', 'latency', 'and', 'we', 'should', 'ship', 'it', 'café', 'okay']
+
+
+def generate_assemblyai_transcript(num_words=2000, speakers='ABCD', seed=7):
+    """
+    AssemblyAI-style transcript: words in ms plus per-sentence sentiment
+    """
+    rng = random.Random(seed)
+    words = []
+    sentences = []
+    now = 0
+    speaker = rng.choice(speakers)
+    for i in range(num_words):
+        if i % 12 == 0:
+            speaker = rng.choice(speakers)
+            sentences.append({'start': now, 'end': None, 'speaker': speaker,
+                              'sentiment': rng.choice(['POSITIVE', 'NEUTRAL', 'NEGATIVE'])})
+        duration = rng.randint(120, 600)
+        words.append({'text': rng.choice(WORDS), 'start': now, 'end': now + duration,
+                      'confidence': 0.9, 'speaker': speaker})
+        now += duration + rng.randint(0, 300)
+        sentences[-1]['end'] = now
+    return {'id': 't-1', 'text': ' '.join(w['text'] for w in words), 'words': words,
+            'utterances': [], 'sentiment_analysis_results': sentences}
+
+
+def json_words_by_speaker(transcript, speaker, start_ms, end_ms):
+    return [w['text'] for w in transcript['words']
+            if f"Speaker {w['speaker']}" == speaker and start_ms <= w['start'] < end_ms]
+
+
+def json_talk_time(transcript):
+    totals = {}
+    for w in transcript['words']:
+        key = f"Speaker {w['speaker']}"
+        totals[key] = totals.get(key, 0) + w['end'] - w['start']
+    return totals
+
+
+def write_json(directory, name, transcript, compress=False):
+    path = os.path.join(directory, name + ('.gz' if compress else ''))
+    with (gzip.open(path, 'wt') if compress else open(path, 'w')) as f:
+        json.dump(transcript, f)
+    return path
+
+
+def test_queries_match_json():
+    transcript = generate_assemblyai_transcript()
+    with tempfile.TemporaryDirectory() as directory:
+        store_path = build_transcript_store(write_json(directory, 'transcript_r1.json', transcript, compress=True))
+        assert store_path.endswith('transcript_r1.kts')
+
+        with TranscriptStore(store_path) as store:
+            assert len(store) == len(transcript['words'])
+            assert store.talk_time() == json_talk_time(transcript)
+            for speaker in ['Speaker A', 'Speaker C']:
+                for start_ms, end_ms in [(0, 10 ** 9), (60000, 180000), (500000, 500001)]:
+                    expected = json_words_by_speaker(transcript, speaker, start_ms, end_ms)
+                    assert [w[0] for w in store.words(speaker, start_ms, end_ms)] == expected
+                    assert store.text(speaker, start_ms, end_ms) == ' '.join(expected)
+            assert store.words('Speaker Z') == []
+
+            first = store.words(start_ms=0, end_ms=1)[0]
+            assert first[0] == transcript['words'][0]['text']
+            assert first[4] == transcript['sentiment_analysis_results'][0]['sentiment']
+
+
+def test_recall_format():
+    transcript = [
+        {'participant': {'id': 1, 'name': 'Kurt'}, 'words': [
+            {'text': 'Hello', 'start_timestamp': {'relative': 0.5}, 'end_timestamp': {'relative': 0.9}},
+            {'text': 'everyone', 'start_timestamp': {'relative': 1.0}, 'end_timestamp': {'relative': 1.6}}]},
+        {'participant': {'id': 2, 'name': 'Ana'}, 'words': [
+            {'text': 'Hi', 'start_timestamp': {'relative': 0.7}, 'end_timestamp': {'relative': 0.8}}]},
+    ]
+    assert len(list(iter_words(transcript))) == 3
+    with tempfile.TemporaryDirectory() as directory:
+        with TranscriptStore(build_transcript_store(write_json(directory, 't.json', transcript))) as store:
+            assert store.text() == 'Hello Hi everyone'
+            assert store.talk_time() == {'Kurt': 1000, 'Ana': 100}
+            assert store.talk_time(start_ms=900) == {'Kurt': 600, 'Ana': 0}
+            assert store.words('Ana') == [('Hi', 700, 800, 'Ana', None)]
+
+
+def benchmark_large_transcript(num_words=400000, repeat=3):
+    """
+    Open + query a multi-hour transcript: json.load vs the memory-mapped store
+    """
+    transcript = generate_assemblyai_transcript(num_words)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = write_json(directory, 'transcript_big.json', transcript)
+        start = time.perf_counter()
+        store_path = build_transcript_store(json_path)
+        build_seconds = time.perf_counter() - start
+        json_size, store_size = os.path.getsize(json_path), os.path.getsize(store_path)
+
+        print(f"Benchmark: {num_words:,} words, best of {repeat}")
+        print(f"   JSON {json_size / 1e6:.1f} MB, store {store_size / 1e6:.1f} MB, "
+              f"conversion {build_seconds * 1000:.0f} ms")
+        print("-" * 80)
+
+        def best_of(func):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best
+
+        def json_query():
+            with open(json_path) as f:
+                data = json.load(f)
+            json_words_by_speaker(data, 'Speaker B', 3600000, 3660000)
+            json_talk_time(data)
+
+        def store_query():
+            with TranscriptStore(store_path) as store:
+                store.words('Speaker B', 3600000, 3660000)
+                store.talk_time()
+
+        timings = [('json.load + scan', best_of(json_query)), ('mmap store', best_of(store_query))]
+        baseline = timings[0][1]
+        for name, elapsed in timings:
+            print(f"   {name:<20} {elapsed * 1000:10.2f} ms  {baseline / elapsed:8.1f}x")
+    print()
+
+
+if __name__ == '__main__':
+    test_queries_match_json()
+    test_recall_format()
+    print("✅ Transcript store queries match the JSON")
+    if '--benchmark' in sys.argv:
+        benchmark_large_transcript()
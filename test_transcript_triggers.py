@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the realtime transcript trigger engine
+Shows single-pass phrase matching, debounce windows folding repeated matches
+into one reply, and per-trigger / per-meeting cooldowns.
+"""
+
+import json
+import os
+import tempfile
+import time
+from delayed_jobs import DelayedJobScheduler
+from transcript_triggers import TriggerEngine, load_triggers
+
+TRIGGERS = [
+    {'name': 'help', 'phrases': ['help', 'can someone help'], 'response': "Happy to help, {speaker}!",
+     'cooldown': 60, 'debounce': 0.2},
+    {'name': 'course', 'phrases': ['maven course', 'sign up'], 'response': "Course link: ...",
+     'cooldown': 60, 'debounce': 0},
+]
+
+
+def make_engine(meeting_cooldown=0.0):
+    sent = []
+    engine = TriggerEngine(TRIGGERS, send=lambda bot_id, to, message: sent.append((bot_id, to, message)),
+                           scheduler=DelayedJobScheduler("test-triggers"), meeting_cooldown=meeting_cooldown)
+    return engine, sent
+
+
+def test_one_pass_matches_whole_phrases():
+    engine, _ = make_engine()
+    assert engine.match("Can someone HELP me sign up for the Maven course?") == ['help', 'course']
+    assert engine.match("that was helpful") == []
+    assert engine.match("") == []
+
+
+def test_debounce_folds_repeated_matches_into_one_reply():
+    engine, sent = make_engine()
+    assert engine.process('bot1', "help", "Ana") == ['help']
+    assert engine.process('bot1', "please help", "Ben") == []
+    assert engine.process('bot2', "help", "Cy") == ['help']  # Other meetings are independent
+    assert sent == []  # Nothing is sent on the webhook thread
+    time.sleep(0.4)
+    assert sorted(sent) == [('bot1', 'everyone', "Happy to help, Ana!"), ('bot2', 'everyone', "Happy to help, Cy!")]
+    assert engine.stats()['debounced'] == 1
+
+
+def test_cooldowns():
+    engine, sent = make_engine(meeting_cooldown=60)
+    engine.process('bot1', "how do I sign up", "Ana")
+    engine.process('bot1', "sign up please", "Ana")  # Trigger cooldown
+    engine.process('bot1', "help", "Ben")  # Meeting-wide cooldown
+    time.sleep(0.3)
+    assert sent == [('bot1', 'everyone', "Course link: ...")]
+    assert engine.stats()['cooled_down'] == 2
+
+    engine.forget('bot1')
+    engine.process('bot1', "sign up", "Ana")
+    assert len(sent) == 2
+
+
+def test_literal_braces_and_config_validation():
+    triggers = [{'name': 'code', 'phrases': ['json'], 'response': 'Use {"key": 1}, {speaker}! {unknown}',
+                 'debounce': 0},
+                {'name': 'broken', 'phrases': 'json', 'response': 'x'},
+                {'name': 'empty', 'phrases': ['x']}]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "triggers.json")
+        with open(path, 'w') as f:
+            json.dump(triggers, f)
+        loaded = load_triggers(path)
+    assert [trigger['name'] for trigger in loaded] == ['code']
+
+    sent = []
+    engine = TriggerEngine(loaded, send=lambda bot_id, to, message: sent.append(message),
+                           scheduler=DelayedJobScheduler("test-braces"))
+    engine.process('bot1', "paste the json", "Ana")
+    assert sent == ['Use {"key": 1}, Ana! {unknown}']
+
+
+if __name__ == '__main__':
+    for test in [test_one_pass_matches_whole_phrases, test_debounce_folds_repeated_matches_into_one_reply,
+                 test_cooldowns, test_literal_braces_and_config_validation]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for webhook deduplication
+Checks event identity keys, the TTL/size bounds of the seen-set, and that a
+failed event can be let through again.
+"""
+
+import time
+
+from webhook_dedupe import SeenSet, WebhookDeduplicator, event_identity
+
+
+def chat_event(message_id=None, text="joke", timestamp=1.0):
+    message = {'text': text, 'to': 'bot'}
+    if message_id:
+        message['id'] = message_id
+    return {
+        'event': 'participant_events.chat_message',
+        'data': {
+            'bot': {'id': 'bot-1'},
+            'participant_events': {'id': 'pe-123'},  # The meeting's artifact, the same for every message
+            'data': {'participant': {'id': 7, 'name': 'Ada'}, 'timestamp': {'relative': timestamp},
+                     'data': message}
+        }
+    }
+
+
+def test_event_identity():
+    assert event_identity(chat_event("m1")) == event_identity(chat_event("m1", text="edited"))
+    assert event_identity(chat_event("m1")) != event_identity(chat_event("m2"))
+
+    # Without a message ID the payload hash decides: same payload, same key
+    assert event_identity(chat_event()) == event_identity(chat_event())
+    assert event_identity(chat_event()) != event_identity(chat_event(timestamp=2.0))
+    assert "pe-123" not in event_identity(chat_event())
+
+
+def test_messages_sharing_participant_events_id():
+    # Every chat message in a meeting carries the same participant_events.id
+    dedupe = WebhookDeduplicator(ttl_seconds=60)
+    assert dedupe.check(chat_event(text="hey kurt", timestamp=1.0))
+    assert dedupe.check(chat_event(text="tell me a joke", timestamp=2.0))
+    assert dedupe.check(chat_event(text="tell me a joke", timestamp=2.0)) is None  # A real redelivery
+
+    done = {'event': 'transcript.done', 'data': {'transcript': {'id': 't1'}, 'attempt': 1}}
+    assert event_identity(done) == event_identity({**done, 'data': {**done['data'], 'attempt': 2}})
+    assert event_identity({'event': 'bot.done', 'bot_id': 'b1'}) == "bot.done:b1"
+
+
+def test_duplicates_dropped_and_counted():
+    dedupe = WebhookDeduplicator(ttl_seconds=60)
+    assert dedupe.check(chat_event("m1"))
+    assert dedupe.check(chat_event("m1")) is None
+    assert dedupe.check(chat_event("m1")) is None
+    assert dedupe.check(chat_event("m2"))
+
+    stats = dedupe.stats()
+    assert stats['suppressed'] == 2
+    assert stats['suppressed_by_event'] == {'participant_events.chat_message': 2}
+
+    # A failed event is released so Recall.ai's retry is processed
+    key = dedupe.check({'event': 'transcript.done', 'data': {'transcript': {'id': 't1'}}})
+    dedupe.release(key)
+    assert dedupe.check({'event': 'transcript.done', 'data': {'transcript': {'id': 't1'}}})
+
+    assert WebhookDeduplicator(enabled=False).check(chat_event("m1"))
+
+
+def test_seen_set_bounds():
+    seen = SeenSet(ttl_seconds=0.05, max_entries=100)
+    assert seen.add("a") and not seen.add("a")
+    time.sleep(0.06)
+    assert seen.add("a")
+
+    for i in range(250):
+        seen.add(f"key-{i}")
+    assert len(seen) == 100
+    assert seen.stats()['evicted'] == 151
+
+
+if __name__ == '__main__':
+    for test in [test_event_identity, test_messages_sharing_participant_events_id,
+                 test_duplicates_dropped_and_counted, test_seen_set_bounds]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,92 @@
+"""
+One-pass multi-pattern text classifier
+Answers "which phrase lists does this message hit?" for every category (safety,
+opinion, mention, interest, ...) with a single scan over one lowercased copy of
+the message, instead of lowercasing and looping over each list separately.
+
+All phrases are compiled into one regex shaped like a trie (shared prefixes are
+factored out, longer continuations are tried first) and wrapped in a lookahead,
+so the scan reports the longest phrase starting at every position, overlapping
+matches included. Every phrase that also starts at that position is a prefix of
+the reported one, so each phrase is tagged with its own categories plus those of
+all its prefixes. The result is exactly "category X matched if any of its phrases
+is a substring", the same answer an Aho-Corasick automaton gives, while the
+per-character work runs in the regex engine's C loop instead of Python.
+"""
+
+import re
+
+
+def _trie_regex(phrases):
+    """
+    Build a prefix-factored alternation matching the longest of `phrases`
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = True  # End of a phrase
+
+    def emit(node):
+        terminal = '' in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: prefer continuing to a longer phrase, fall back to this one
+        return f'(?:{body})?' if terminal else body
+
+    return emit(trie)
+
+
+class TextClassifier:
+    """
+    Precompiled matcher for several named phrase lists
+    """
+
+    def __init__(self, categories):
+        """
+        Args:
+            categories: {category name: iterable of phrases}; matching is
+                case-insensitive substring matching, like `phrase in text.lower()`
+        """
+        self.categories = tuple(categories)
+        phrase_categories = {}
+        for category, phrases in categories.items():
+            for phrase in phrases:
+                phrase = phrase.lower()
+                if phrase:
+                    phrase_categories.setdefault(phrase, set()).add(category)
+
+        # A phrase also implies the categories of every phrase that is its prefix
+        self._categories_by_phrase = {}
+        for phrase in phrase_categories:
+            implied = set()
+            for end in range(1, len(phrase) + 1):
+                implied |= phrase_categories.get(phrase[:end], set())
+            self._categories_by_phrase[phrase] = frozenset(implied)
+
+        # The character-class guard lets the scan skip positions no phrase can start at
+        # without entering the lookahead
+        first_chars = ''.join(sorted({re.escape(phrase[0]) for phrase in phrase_categories}))
+        self._pattern = re.compile(
+            f'(?=[{first_chars}])(?=({_trie_regex(phrase_categories)}))', re.DOTALL
+        ) if phrase_categories else None
+
+    def classify(self, text):
+        """
+        Returns:
+            frozenset: Names of every category with a phrase occurring in the text
+        """
+        if not text or self._pattern is None:
+            return frozenset()
+
+        found = set()
+        categories_by_phrase = self._categories_by_phrase
+        for phrase in set(self._pattern.findall(text.lower())):
+            found |= categories_by_phrase[phrase]
+        return frozenset(found)
+
+    def matches(self, text, category):
+        return category in self.classify(text)
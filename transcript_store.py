@@ -0,0 +1,333 @@
+"""
+Columnar transcript store
+Converts a downloaded word-level transcript (Recall.ai's participant/words list
+or AssemblyAI's raw JSON) into a compact binary file that can be memory-mapped
+and queried without parsing JSON.
+
+File layout (all integers little-endian):
+
+    header      magic "KTS1", header length, then a JSON header: speaker names,
+                per-speaker word count and talk time, and the byte offset of
+                every column below
+    starts      uint32 word start times (ms), sorted
+    ends        uint32 word end times (ms)
+    offsets     uint32 offsets of each word in the text blob (word count + 1)
+    by_speaker  uint32 word positions grouped by speaker (each group sorted by time)
+    speaker_ids uint16 speaker index per word
+    sentiment   int8 sentiment code per word (see SENTIMENT_CODES)
+    text        UTF-8 words, concatenated
+
+Queries such as "all words said by speaker X between t1 and t2" are a binary
+search over that speaker's group; "talk time per speaker" is read from the header.
+"""
+
+import bisect
+import gzip
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b'KTS1'
+STORE_SUFFIX = '.kts'
+SENTIMENT_CODES = {None: 0, 'POSITIVE': 1, 'NEUTRAL': 2, 'NEGATIVE': 3}
+SENTIMENT_NAMES = {code: name for name, code in SENTIMENT_CODES.items()}
+
+# (column name, array typecode) in file order
+COLUMNS = [
+    ('starts', 'I'),
+    ('ends', 'I'),
+    ('offsets', 'I'),
+    ('by_speaker', 'I'),
+    ('speaker_ids', 'H'),
+    ('sentiment', 'b'),
+]
+
+
+def open_transcript_json(path):
+    """
+    Load a transcript JSON file (plain, .gz or .zst)
+    """
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            return json.load(f)
+    if path.endswith('.zst'):
+        import zstandard
+
+        with open(path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True) as f:
+            return json.load(f)
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+
+def _seconds_to_ms(value):
+    if isinstance(value, dict):
+        value = value.get('relative')
+    return int(round((value or 0) * 1000))
+
+
+def iter_words(transcript):
+    """
+    Yield (text, start_ms, end_ms, speaker, sentiment) for every word of a transcript
+
+    Accepts Recall.ai's format (a list of {participant, words: [{text,
+    start_timestamp, end_timestamp}]}) and AssemblyAI's (a dict with "words":
+    [{text, start, end, speaker}] in ms, plus optional "sentiment_analysis_results").
+    """
+    if isinstance(transcript, list):
+        for segment in transcript:
+            participant = segment.get('participant') or {}
+            speaker = participant.get('name') or str(participant.get('id', 'Unknown'))
+            for word in segment.get('words', []):
+                yield (word.get('text', ''), _seconds_to_ms(word.get('start_timestamp')),
+                       _seconds_to_ms(word.get('end_timestamp')), speaker, None)
+        return
+
+    # Sentiment is reported per sentence: walk both time-sorted lists together
+    sentences = sorted(transcript.get('sentiment_analysis_results') or [], key=lambda s: s.get('start', 0))
+    sentence_index = 0
+    for word in transcript.get('words') or []:
+        start = int(word.get('start') or 0)
+        while sentence_index < len(sentences) and sentences[sentence_index].get('end', 0) <= start:
+            sentence_index += 1
+        sentiment = None
+        if sentence_index < len(sentences) and sentences[sentence_index].get('start', 0) <= start:
+            sentiment = sentences[sentence_index].get('sentiment')
+        speaker = word.get('speaker')
+        yield (word.get('text', ''), start, int(word.get('end') or start),
+               f"Speaker {speaker}" if speaker is not None else 'Unknown', sentiment)
+
+
+def build_transcript_store(json_path, store_path=None):
+    """
+    Convert a transcript JSON file into a columnar store file
+
+    Args:
+        json_path: Downloaded transcript (.json, .json.gz or .json.zst)
+        store_path: Output path (defaults to the JSON path with a .kts suffix)
+
+    Returns:
+        str: Path of the store file
+    """
+    if store_path is None:
+        base = json_path
+        for suffix in ('.gz', '.zst', '.json'):
+            if base.endswith(suffix):
+                base = base[:-len(suffix)]
+        store_path = base + STORE_SUFFIX
+
+    words = sorted(iter_words(open_transcript_json(json_path)), key=lambda word: word[1])
+    return write_store(words, store_path)
+
+
+def write_store(words, store_path):
+    """
+    Write (text, start_ms, end_ms, speaker, sentiment) tuples, sorted by start time
+
+    Returns:
+        str: Path of the store file
+    """
+    speaker_index = {}
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+    text_parts = []
+    offset = 0
+    columns['offsets'].append(0)
+
+    for text, start, end, speaker, sentiment in words:
+        index = speaker_index.setdefault(speaker, len(speaker_index))
+        encoded = text.encode('utf-8')
+        text_parts.append(encoded)
+        offset += len(encoded)
+        columns['starts'].append(start)
+        columns['ends'].append(max(start, end))
+        columns['speaker_ids'].append(index)
+        columns['sentiment'].append(SENTIMENT_CODES.get(sentiment, 0))
+        columns['offsets'].append(offset)
+
+    speakers = list(speaker_index)
+    groups = [[] for _ in speakers]
+    talk_time = [0] * len(speakers)
+    for position, index in enumerate(columns['speaker_ids']):
+        groups[index].append(position)
+        talk_time[index] += columns['ends'][position] - columns['starts'][position]
+    for group in groups:
+        columns['by_speaker'].extend(group)
+
+    duration = max(columns['ends'], default=0)
+    if sys.byteorder != 'little':
+        for column in columns.values():
+            column.byteswap()
+
+    header = {
+        'version': 1,
+        'word_count': len(columns['starts']),
+        'speakers': speakers,
+        'speaker_word_counts': [len(group) for group in groups],
+        'talk_time_ms': talk_time,
+        'duration_ms': duration,
+        'columns': {}
+    }
+
+    # Column offsets are relative to the end of the header (widest columns first, so all stay aligned)
+    body_offset = 0
+    layout = []
+    for name, typecode in COLUMNS:
+        size = len(columns[name]) * columns[name].itemsize
+        layout.append((name, body_offset, size))
+        body_offset += size
+    text_blob = b''.join(text_parts)
+
+    header['columns'] = {name: [offset, size] for name, offset, size in layout}
+    header['columns']['text'] = [body_offset, len(text_blob)]
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    padding = (-(len(MAGIC) + 4 + len(header_bytes))) % 8  # Keep columns aligned
+
+    temp_path = f"{store_path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header_bytes) + padding))
+        f.write(header_bytes + b' ' * padding)
+        for name, _ in COLUMNS:
+            columns[name].tofile(f)
+        f.write(text_blob)
+    os.replace(temp_path, store_path)
+    return store_path
+
+
+class TranscriptStore:
+    """
+    Read-only, memory-mapped view of a columnar transcript file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:4] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a transcript store")
+        header_length = struct.unpack_from('<I', self._mmap, 4)[0]
+        self.header = json.loads(bytes(self._mmap[8:8 + header_length]))
+        base = 8 + header_length
+
+        view = memoryview(self._mmap)
+        self._views = [view]
+        for name, typecode in COLUMNS:
+            offset, size = self.header['columns'][name]
+            column = view[base + offset:base + offset + size]
+            if sys.byteorder != 'little' and typecode != 'b':
+                swapped = array(typecode, column.tobytes())
+                swapped.byteswap()
+                setattr(self, name, swapped)
+            else:
+                cast = column.cast(typecode)
+                self._views.append(cast)
+                setattr(self, name, cast)
+        offset, size = self.header['columns']['text']
+        self.text_blob = view[base + offset:base + offset + size]
+        self._views.append(self.text_blob)
+
+        self.speakers = self.header['speakers']
+        self._speaker_index = {name: index for index, name in enumerate(self.speakers)}
+        group_start = 0
+        self._groups = []
+        for count in self.header['speaker_word_counts']:
+            self._groups.append((group_start, group_start + count))
+            group_start += count
+
+    def __len__(self):
+        return self.header['word_count']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._views = []
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def word(self, position):
+        """
+        Returns:
+            tuple: (text, start_ms, end_ms, speaker, sentiment) of one word
+        """
+        text = bytes(self.text_blob[self.offsets[position]:self.offsets[position + 1]]).decode('utf-8')
+        return (text, self.starts[position], self.ends[position],
+                self.speakers[self.speaker_ids[position]], SENTIMENT_NAMES.get(self.sentiment[position]))
+
+    def positions(self, speaker=None, start_ms=0, end_ms=None):
+        """
+        Positions of the words starting in [start_ms, end_ms), optionally for one speaker
+
+        Returns:
+            range or list: Word positions in time order
+        """
+        end_ms = 0xFFFFFFFF if end_ms is None else end_ms
+        if speaker is None:
+            first = bisect.bisect_left(self.starts, start_ms)
+            last = bisect.bisect_left(self.starts, end_ms, lo=first)
+            return range(first, last)
+
+        index = self._speaker_index.get(speaker)
+        if index is None:
+            return []
+        group_start, group_end = self._groups[index]
+        starts, by_speaker = self.starts, self.by_speaker
+        key = lambda position: starts[position]
+        first = bisect.bisect_left(by_speaker, start_ms, group_start, group_end, key=key)
+        last = bisect.bisect_left(by_speaker, end_ms, first, group_end, key=key)
+        return by_speaker[first:last].tolist()
+
+    def words(self, speaker=None, start_ms=0, end_ms=None):
+        """
+        All words (with timings) said by `speaker` (or anyone) between two times
+
+        Returns:
+            list: (text, start_ms, end_ms, speaker, sentiment) tuples in time order
+        """
+        return [self.word(position) for position in self.positions(speaker, start_ms, end_ms)]
+
+    def text(self, speaker=None, start_ms=0, end_ms=None):
+        """
+        Returns:
+            str: The words said in the range, joined with spaces
+        """
+        offsets, blob = self.offsets, self.text_blob
+        return ' '.join(
+            bytes(blob[offsets[position]:offsets[position + 1]]).decode('utf-8')
+            for position in self.positions(speaker, start_ms, end_ms)
+        )
+
+    def talk_time(self, start_ms=None, end_ms=None):
+        """
+        Total talk time per speaker (sum of word durations), for the whole
+        transcript or for words starting within a time range
+
+        Returns:
+            dict: {speaker: milliseconds}
+        """
+        if start_ms is None and end_ms is None:
+            return dict(zip(self.speakers, self.header['talk_time_ms']))
+
+        totals = [0] * len(self.speakers)
+        starts, ends, speaker_ids = self.starts, self.ends, self.speaker_ids
+        for position in self.positions(None, start_ms or 0, end_ms):
+            totals[speaker_ids[position]] += ends[position] - starts[position]
+        return dict(zip(self.speakers, totals))
+
+    def stats(self):
+        return {
+            'words': len(self),
+            'speakers': len(self.speakers),
+            'duration_ms': self.header['duration_ms'],
+            'bytes': os.path.getsize(self.path)
+        }
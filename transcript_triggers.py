@@ -0,0 +1,247 @@
+"""
+Realtime transcript triggers
+Watches final transcript segments for configurable phrases and answers in chat,
+without letting a chatty meeting turn the bot into a spammer.
+
+- All phrases of all triggers are compiled into one case-insensitive regex, so
+  each segment is scanned once no matter how many triggers are configured.
+- A match opens a debounce window: further matches of the same trigger in the
+  same meeting during the window are folded into one reply, sent when the
+  window closes (through the delayed-job scheduler, never on the webhook thread).
+- A trigger fires at most once per `cooldown` seconds per meeting, and any
+  trigger at most once per meeting-wide cooldown.
+
+Triggers are loaded from a JSON file (TRANSCRIPT_TRIGGERS_FILE), a list of:
+
+    {"name": "help", "phrases": ["help", "can someone help"],
+     "response": "I'm here to help! DM me for some fun! 🤖",
+     "to": "everyone", "cooldown": 120, "debounce": 3}
+
+"{speaker}" in a response is replaced by the name of the first matching speaker;
+any other braces are sent as written.
+"""
+
+import json
+import re
+import threading
+import time
+
+DEFAULT_TRIGGERS = [
+    {
+        'name': 'help',
+        'phrases': ['help'],
+        'response': "I'm here to help! DM me for some fun! 🤖",
+        'to': 'everyone',
+        'cooldown': 120,
+        'debounce': 3
+    }
+]
+
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w*)\}")
+
+
+def render_response(response, speaker):
+    """
+    Fill in a trigger response ("{speaker}" only; other braces are left as they are)
+    """
+    return response.replace('{speaker}', speaker)
+
+
+def validate_trigger(trigger):
+    """
+    Check one trigger definition
+
+    Raises:
+        ValueError: A required field is missing or has the wrong type
+    """
+    if not isinstance(trigger, dict):
+        raise ValueError("a trigger must be an object")
+    if not isinstance(trigger.get('name'), str) or not trigger['name']:
+        raise ValueError("missing 'name'")
+    phrases = trigger.get('phrases')
+    if not isinstance(phrases, list) or not phrases or not all(isinstance(p, str) and p for p in phrases):
+        raise ValueError(f"trigger '{trigger['name']}': 'phrases' must be a list of non-empty strings")
+    if not isinstance(trigger.get('response'), str) or not trigger['response']:
+        raise ValueError(f"trigger '{trigger['name']}': 'response' must be a non-empty string")
+
+    unknown = {name for name in _PLACEHOLDER_RE.findall(trigger['response']) if name != 'speaker'}
+    if unknown:
+        print(f"⚠️ Trigger '{trigger['name']}': only {{speaker}} is filled in; "
+              f"{', '.join('{' + name + '}' for name in sorted(unknown))} will be sent as written")
+
+
+def load_triggers(path=None):
+    """
+    Load trigger definitions from a JSON file (or the built-in "help" trigger)
+
+    Invalid triggers are skipped with a warning.
+
+    Returns:
+        list: Trigger dicts
+    """
+    if not path:
+        return DEFAULT_TRIGGERS
+    try:
+        with open(path) as f:
+            triggers = json.load(f)
+        if not isinstance(triggers, list):
+            raise ValueError("expected a list of triggers")
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not load transcript triggers from {path}: {e}; using defaults")
+        return DEFAULT_TRIGGERS
+
+    valid = []
+    for trigger in triggers:
+        try:
+            validate_trigger(trigger)
+        except ValueError as e:
+            print(f"⚠️ Skipping transcript trigger in {path}: {e}")
+            continue
+        valid.append(trigger)
+    print(f"✅ Loaded {len(valid)} transcript triggers from {path}")
+    return valid
+
+
+class TriggerEngine:
+    """
+    Matches transcript segments against all triggers in one pass and sends the
+    responses with per-meeting/per-trigger cooldowns and debounce windows
+    """
+
+    def __init__(self, triggers, send, scheduler, meeting_cooldown=30.0):
+        """
+        Args:
+            triggers: List of trigger dicts (see module docstring)
+            send: Non-blocking callable (bot_id, to, message)
+            scheduler: DelayedJobScheduler that runs debounced sends
+            meeting_cooldown: Minimum seconds between any two trigger replies in a meeting
+        """
+        self.triggers = {trigger['name']: trigger for trigger in triggers}
+        self.send = send
+        self.scheduler = scheduler
+        self.meeting_cooldown = meeting_cooldown
+
+        # Phrase (lowercased) -> trigger names; longest phrases first so the
+        # alternation prefers "can someone help" over "help"
+        self._phrase_triggers = {}
+        for trigger in triggers:
+            for phrase in trigger['phrases']:
+                self._phrase_triggers.setdefault(phrase.lower(), []).append(trigger['name'])
+        phrases = sorted(self._phrase_triggers, key=len, reverse=True)
+        self._pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(phrase) for phrase in phrases) + r')\b', re.IGNORECASE
+        ) if phrases else None
+
+        self._lock = threading.Lock()
+        self._last_fired = {}       # (bot_id, trigger name) -> monotonic time
+        self._meeting_fired = {}    # bot_id -> monotonic time
+        self._pending_matches = {}  # (bot_id, trigger name) -> [speakers]
+        self.segments = 0
+        self.matches = 0
+        self.fired = 0
+        self.debounced = 0
+        self.cooled_down = 0
+
+    def match(self, text):
+        """
+        Returns:
+            list: Names of the triggers whose phrases occur in the text (in trigger order)
+        """
+        if not text or self._pattern is None:
+            return []
+        names = set()
+        for found in self._pattern.finditer(text):
+            names.update(self._phrase_triggers[found.group(0).lower()])
+        return [name for name in self.triggers if name in names]
+
+    def _cooling_down(self, bot_id, name, now):
+        # Caller holds the lock
+        trigger = self.triggers[name]
+        last = self._last_fired.get((bot_id, name))
+        if last is not None and now - last < trigger.get('cooldown', 0):
+            return True
+        last = self._meeting_fired.get(bot_id)
+        return last is not None and now - last < self.meeting_cooldown
+
+    def process(self, bot_id, text, speaker=None):
+        """
+        Check one final transcript segment; matching triggers are queued, never sent inline
+
+        Returns:
+            list: Names of the triggers that were matched and not suppressed
+        """
+        names = self.match(text)
+        with self._lock:
+            self.segments += 1
+            if not names:
+                return []
+
+            now = time.monotonic()
+            accepted = []
+            for name in names:
+                self.matches += 1
+                key = (bot_id, name)
+                if key in self._pending_matches:
+                    # Already waiting in this trigger's debounce window
+                    self._pending_matches[key].append(speaker)
+                    self.debounced += 1
+                    continue
+                if self._cooling_down(bot_id, name, now):
+                    self.cooled_down += 1
+                    continue
+                self._pending_matches[key] = [speaker]
+                accepted.append(name)
+
+        for name in accepted:
+            debounce = self.triggers[name].get('debounce', 0)
+            if debounce > 0:
+                self.scheduler.schedule(f"trigger:{bot_id}:{name}", self._fire, bot_id, name,
+                                        delay=debounce, max_attempts=1, remember=False)
+            else:
+                self._fire(bot_id, name)
+        return accepted
+
+    def _fire(self, bot_id, name):
+        trigger = self.triggers[name]
+        now = time.monotonic()
+        with self._lock:
+            speakers = self._pending_matches.pop((bot_id, name), None)
+            if speakers is None:
+                return True
+            if self._cooling_down(bot_id, name, now):
+                self.cooled_down += 1
+                return True
+            self._last_fired[(bot_id, name)] = now
+            self._meeting_fired[bot_id] = now
+            self.fired += 1
+
+        message = render_response(trigger['response'], speakers[0] or 'there')
+        print(f"🔔 Trigger '{name}' fired for bot {bot_id} ({len(speakers)} matching segment(s))")
+        self.send(bot_id, trigger.get('to', 'everyone'), message)
+        return True
+
+    def forget(self, bot_id):
+        """
+        Drop a finished meeting's cooldown state and pending replies
+        """
+        with self._lock:
+            for key in [key for key in self._last_fired if key[0] == bot_id]:
+                del self._last_fired[key]
+            for key in [key for key in self._pending_matches if key[0] == bot_id]:
+                del self._pending_matches[key]
+                self.scheduler.cancel(f"trigger:{bot_id}:{key[1]}")
+            self._meeting_fired.pop(bot_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'triggers': len(self.triggers),
+                'phrases': len(self._phrase_triggers),
+                'segments': self.segments,
+                'matches': self.matches,
+                'fired': self.fired,
+                'debounced': self.debounced,
+                'cooled_down': self.cooled_down,
+                'pending': len(self._pending_matches)
+            }
@@ -0,0 +1,188 @@
+"""
+Webhook event deduplication
+Recall.ai redelivers a webhook when the first delivery times out, so the same
+chat message, bot.done or transcript.done can arrive several times. Each event
+is reduced to an identity key and checked against a bounded TTL seen-set before
+any work is done; repeats are acknowledged and dropped.
+
+Identity keys, most specific first:
+- chat messages: the message ID when the payload has one (not data.participant_events.id:
+  that is the meeting's participant-events artifact, shared by every message in it)
+- transcript.done / transcript.failed: the transcript ID
+- recording.done: the recording ID
+- bot.done / bot.call_ended: the event name and bot ID
+- anything else: a hash of the canonical JSON payload (a redelivery is byte-for-byte
+  the same event, while two genuine events differ in timestamps or content)
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+CHAT_EVENTS = ('participant_events.chat_message', 'chat.message')
+BOT_END_EVENTS = ('bot.done', 'bot.call_ended')
+TRANSCRIPT_EVENTS = ('transcript.done', 'transcript.failed')
+
+
+def _nested(data, *path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def event_identity(data):
+    """
+    Identity key for a webhook payload (see module docstring)
+
+    Returns:
+        str: Key that is equal for redeliveries of the same event
+    """
+    event = data.get('event')
+
+    if event in CHAT_EVENTS:
+        message_id = (_nested(data, 'data', 'data', 'data', 'id') or
+                      _nested(data, 'data', 'message', 'id'))
+        if message_id:
+            return f"{event}:{message_id}"
+    elif event in TRANSCRIPT_EVENTS:
+        transcript_id = _nested(data, 'data', 'transcript', 'id')
+        if transcript_id:
+            return f"{event}:{transcript_id}"
+    elif event == 'recording.done':
+        recording_id = _nested(data, 'data', 'recording', 'id')
+        if recording_id:
+            return f"{event}:{recording_id}"
+    elif event in BOT_END_EVENTS:
+        bot_id = _nested(data, 'data', 'bot', 'id') or data.get('bot_id')
+        if bot_id:
+            return f"{event}:{bot_id}"
+
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return f"{event}:#{hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()}"
+
+
+class SeenSet:
+    """
+    Thread-safe set of recently seen keys with a TTL and a hard size cap
+
+    Keys are stored as 16-byte digests in insertion order. Every entry has the same
+    TTL, so the oldest entry always expires first and expiry is a pop from the front.
+    """
+
+    def __init__(self, ttl_seconds=600, max_entries=100_000):
+        """
+        Args:
+            ttl_seconds: How long a key counts as seen
+            max_entries: Memory bound; the oldest keys are evicted early past it
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._expires = OrderedDict()  # digest -> monotonic expiry
+        self.added = 0
+        self.duplicates = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+    def _expire(self, now):
+        # Caller holds the lock
+        while self._expires:
+            digest, expires = next(iter(self._expires.items()))
+            if expires > now:
+                break
+            del self._expires[digest]
+
+    def add(self, key):
+        """
+        Mark a key as seen
+
+        Returns:
+            bool: True if the key is new, False if it was seen within the TTL
+        """
+        digest = self._digest(key)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if digest in self._expires:
+                self.duplicates += 1
+                return False
+            self._expires[digest] = now + self.ttl_seconds
+            self.added += 1
+            while len(self._expires) > self.max_entries:
+                self._expires.popitem(last=False)
+                self.evicted += 1
+            return True
+
+    def discard(self, key):
+        """
+        Forget a key (e.g. its processing failed and the redelivery should run)
+        """
+        with self._lock:
+            self._expires.pop(self._digest(key), None)
+
+    def __len__(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._expires)
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                'keys': len(self._expires),
+                'added': self.added,
+                'duplicates': self.duplicates,
+                'evicted': self.evicted,
+                'ttl_seconds': self.ttl_seconds
+            }
+
+
+class WebhookDeduplicator:
+    """
+    Drops redelivered webhook events and counts the suppressed duplicates per event
+    """
+
+    def __init__(self, ttl_seconds=600, max_entries=100_000, enabled=True):
+        self.enabled = enabled
+        self.seen = SeenSet(ttl_seconds, max_entries)
+        self._lock = threading.Lock()
+        self.suppressed = {}  # event -> duplicates dropped
+
+    def check(self, data):
+        """
+        Register an incoming event
+
+        Returns:
+            str: The event's identity key if it should be processed, or None for a duplicate
+        """
+        key = event_identity(data)
+        if not self.enabled or self.seen.add(key):
+            return key
+        with self._lock:
+            event = data.get('event')
+            self.suppressed[event] = self.suppressed.get(event, 0) + 1
+        return None
+
+    def release(self, key):
+        """
+        Let a redelivery of this event through again (its processing failed or was rejected)
+        """
+        if self.enabled and key:
+            self.seen.discard(key)
+
+    def stats(self):
+        with self._lock:
+            suppressed = dict(self.suppressed)
+        return {
+            'enabled': self.enabled,
+            **self.seen.stats(),
+            'suppressed': sum(suppressed.values()),
+            'suppressed_by_event': suppressed
+        }